@@ -1,7 +1,19 @@
 from .parameter_config import ParameterConfig
-from .email_manager import EmailAgent
-from .log_manager import LogManager
 
+# The log manager, the LogManager singleton, the email agent and the method markers are loaded on first access, so that importing the package stays fast
+_lazy_attributes = {"LogManager": ".log_manager", "LogReader": ".log_manager", "EmailAgent": ".email_manager",
+                    "skip": ".log_manager.class_instrumentation", "profile": ".log_manager.class_instrumentation"}
 
-logger = LogManager()  # Access to the LogManager singleton
 
+def __getattr__(name):
+    global logger
+    if name == "logger":
+        from .log_manager import LogManager
+        logger = LogManager()  # Access to the LogManager singleton
+        return logger
+    if name in _lazy_attributes:
+        import importlib
+        value = getattr(importlib.import_module(_lazy_attributes[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
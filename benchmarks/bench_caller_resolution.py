@@ -0,0 +1,55 @@
+"""
+Microbenchmark comparing caller resolution through inspect.stack() with the frame-walking CallerResolver.
+
+Usage:
+    python benchmarks/bench_caller_resolution.py [--calls N]
+"""
+import argparse
+import inspect
+import logging
+import tempfile
+import time
+
+import trackinglog
+from trackinglog.log_manager.caller_resolver import caller_resolver
+
+
+def calls_per_second(func, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return calls / (time.perf_counter() - start)
+
+
+def resolve_with_inspect() -> str:
+    return inspect.stack()[1].function
+
+
+def resolve_with_frames() -> str:
+    return caller_resolver.resolve()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        trackinglog.logger.setup(root_task_path=tmp)
+        log = trackinglog.logger.get_logger("bench_caller_resolution")
+
+        results = {
+            "inspect.stack()[1].function": calls_per_second(resolve_with_inspect, args.calls // 10),
+            "CallerResolver.resolve()": calls_per_second(resolve_with_frames, args.calls),
+            "log.info (enabled)": calls_per_second(lambda: log.info("message", 1), args.calls),
+        }
+        log.setLevel(logging.INFO)
+        results["log.debug (disabled)"] = calls_per_second(lambda: log.debug("message", 1), args.calls)
+
+        for name, rate in results.items():
+            print(f"{name:<32}{rate:>14,.0f} calls/s")
+        print(f"{'speedup (resolution only)':<32}{results['CallerResolver.resolve()'] / results['inspect.stack()[1].function']:>14,.1f}x")
+
+
+if __name__ == "__main__":
+    main()
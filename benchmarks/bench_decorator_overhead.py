@@ -0,0 +1,62 @@
+"""
+Benchmark of the per-call overhead of the get_log wrappers: the raw function, each wrapper variant, the metered wrapper of the
+metrics option, and the same wrappers with the instrumentation switched off.
+
+Usage:
+    python benchmarks/bench_decorator_overhead.py [--calls N]
+"""
+import argparse
+import tempfile
+import time
+
+import trackinglog
+
+
+def add(a, b, log=None):
+    return a + b
+
+
+def microseconds_per_call(func, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        func(1, 2)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200000)
+    args = parser.parse_args()
+
+    options = {
+        "enable_profiling=None": dict(enable_profiling=None),
+        "enable_profiling='aggregate'": dict(enable_profiling="aggregate"),
+        "enable_profiling='function'": dict(enable_profiling="function", profiling_metrics=("wall",)),
+        "enable_profiling='trace'": dict(enable_profiling="trace"),
+        "verbose=1, enable_profiling=None": dict(verbose=1, enable_profiling=None),
+        "sample_every=1000, 'function'": dict(enable_profiling="function", sample_every=1000, profiling_metrics=("wall",)),
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        trackinglog.logger.setup(root_task_path=tmp)
+        wrappers = {name: trackinglog.logger.get_log("bench_decorator_overhead", **kwargs)(add) for name, kwargs in options.items()}
+        trackinglog.logger.config.log_config.metrics = True
+        wrappers["metrics=True, enable_profiling=None"] = trackinglog.logger.get_log("bench_decorator_overhead", enable_profiling=None)(add)
+
+        results = {"raw function": (microseconds_per_call(add, args.calls), None)}
+        for name, wrapper in wrappers.items():
+            results[f"{name} [{wrapper._trackinglog_variant}]"] = (microseconds_per_call(wrapper, args.calls), None)
+        trackinglog.logger.disable_instrumentation()
+        try:
+            for name, wrapper in wrappers.items():
+                label = f"{name} [{wrapper._trackinglog_variant}]"
+                results[label] = (results[label][0], microseconds_per_call(wrapper, args.calls))
+        finally:
+            trackinglog.logger.enable_instrumentation()
+
+    print(f"{'':<48}{'enabled':>12}{'switched off':>16}")
+    for name, (enabled, disabled) in results.items():
+        print(f"{name:<48}{enabled:>9,.2f} us{'' if disabled is None else f'{disabled:,.2f} us':>16}")
+
+
+if __name__ == "__main__":
+    main()
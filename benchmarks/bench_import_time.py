@@ -0,0 +1,76 @@
+"""
+Benchmark of the package import time, measured with python -X importtime in fresh interpreters.
+Fails if a heavy optional dependency is imported by `import trackinglog` or by creating a logger,
+or if the median import time exceeds the budget.
+
+Usage:
+    python benchmarks/bench_import_time.py [--runs N] [--budget-ms MS]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, Tuple
+
+HEAVY_MODULES = ("pandas", "numpy", "psutil", "line_profiler", "zstandard")
+
+SCENARIOS = {
+    "import trackinglog": "import trackinglog",
+    "get_logger": ("import trackinglog; trackinglog.logger.setup(root_task_path={folder!r}); "
+                   "trackinglog.logger.get_logger('bench').info('started')"),
+}
+
+
+def import_times(code: str) -> Tuple[float, Dict[str, int]]:
+    """
+    Run code in a fresh interpreter.
+    Returns the time in ms of the top-level imports done from `import trackinglog` on, lazy imports included,
+    and the cumulative time in us of every imported module.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True)
+    modules: Dict[str, int] = {}
+    total = 0
+    started = False
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        top_level = not name[1:].startswith(" ")
+        name = name.strip()
+        modules[name] = int(cumulative)
+        started = started or name == "trackinglog" or name.startswith("trackinglog.")
+        if started and top_level:
+            total += int(cumulative)
+    return total / 1000, modules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=150.0)
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as folder:
+        for scenario, code in SCENARIOS.items():
+            code = code.format(folder=folder)
+            runs = [import_times(code) for _ in range(args.runs)]
+            median = statistics.median(total for total, _ in runs)
+            modules = runs[-1][1]
+            heavy = [name for name in modules if name.split(".")[0] in HEAVY_MODULES and "." not in name]
+            print(f"{scenario:<20}{median:>10,.1f} ms   heavy modules imported: {', '.join(heavy) or 'none'}")
+            if heavy:
+                failures.append(f"{scenario} imported {', '.join(heavy)}")
+            if median > args.budget_ms:
+                failures.append(f"{scenario} took {median:.1f} ms, over the {args.budget_ms:.0f} ms budget")
+
+    for failure in failures:
+        print("FAIL:", failure, file=sys.stderr)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
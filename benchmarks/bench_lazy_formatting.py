@@ -0,0 +1,51 @@
+"""
+Benchmark showing the cost of disabled debug calls that pass large DataFrames and dicts.
+
+Usage:
+    python benchmarks/bench_lazy_formatting.py [--calls N] [--rows N]
+"""
+import argparse
+import logging
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import trackinglog
+from trackinglog.log_manager import LogManager
+
+
+def microseconds_per_call(func, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    frame = pd.DataFrame(np.random.rand(args.rows, 20))
+    mapping = {f"key_{i}": i for i in range(1000)}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        trackinglog.logger.setup(root_task_path=tmp)
+        log = trackinglog.logger.get_logger("bench_lazy_formatting")
+        log.setLevel(logging.INFO)
+
+        results = {
+            "eager get_log_string(df, dict)": microseconds_per_call(lambda: LogManager.get_log_string(frame, mapping), args.calls),
+            "log.debug(df, dict) disabled": microseconds_per_call(lambda: log.debug(frame, mapping), args.calls),
+            "log.info(df, dict) enabled": microseconds_per_call(lambda: log.info(frame, mapping), args.calls),
+        }
+
+    for name, cost in results.items():
+        print(f"{name:<34}{cost:>12,.1f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark of the per-call overhead of the resource metrics used by "function" profiling.
+
+Usage:
+    python benchmarks/bench_resource_metrics.py [--calls N]
+"""
+import argparse
+import time
+
+import psutil
+
+from trackinglog.log_manager.resource_sampler import CallMeter
+
+
+def legacy_measurement() -> None:
+    """Per-call measurement as done before the resource sampler: a new psutil.Process and four psutil calls."""
+    process = psutil.Process()
+    cpu_before = process.cpu_percent(interval=None)
+    memory_before = process.memory_info().rss
+    start_time = time.time()
+    end_time = time.time()
+    cpu_after = process.cpu_percent(interval=None)
+    memory_after = process.memory_info().rss
+    return end_time - start_time, cpu_after - cpu_before, memory_after - memory_before
+
+
+def microseconds_per_call(func, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+
+    results = {"legacy psutil.Process() per call": microseconds_per_call(legacy_measurement, args.calls)}
+    for metrics in [("wall",), ("wall", "cpu"), ("wall", "cpu", "rss"), ("wall", "cpu", "maxrss"), ("wall", "cpu", "process")]:
+        meter = CallMeter(metrics)
+        results["metrics=" + ",".join(metrics)] = microseconds_per_call(lambda: meter.stop(meter.start()), args.calls)
+
+    for name, cost in results.items():
+        print(f"{name:<36}{cost:>10,.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
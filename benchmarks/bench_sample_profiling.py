@@ -0,0 +1,64 @@
+"""
+Benchmark of the slowdown of a CPU-bound decorated function under "sample" profiling, compared with "line" profiling,
+and of what the sampled stacks show.
+
+Usage:
+    python benchmarks/bench_sample_profiling.py [--calls N] [--size N] [--rounds N] [--interval SECONDS]
+
+The variants run in alternating rounds and the best round of each is reported, which keeps machine noise out of the comparison.
+"""
+import argparse
+import tempfile
+import time
+
+import trackinglog
+
+
+def checksum(values):
+    total = 0
+    for value in values:
+        total = (total * 31 + value) % 1000003
+    return total
+
+
+def workload(size, log=None):
+    values = [i * i for i in range(size)]
+    return checksum(values) + checksum(sorted(values, reverse=True))
+
+
+def seconds(func, calls: int, size: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        func(size)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--size", type=int, default=20000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--interval", type=float, default=0.01)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        trackinglog.logger.setup(root_task_path=tmp, log_config={"root_log_path": tmp, "sample_profile_interval": args.interval})
+        variants = {"raw function": workload}
+        for profiling in ["sample", "line"]:
+            variants[f'enable_profiling="{profiling}"'] = trackinglog.logger.get_log(f"bench_{profiling}", enable_profiling=profiling)(workload)
+        results = {name: float("inf") for name in variants}
+        for _ in range(args.rounds):
+            for name, func in variants.items():
+                results[name] = min(results[name], seconds(func, args.calls, args.size))
+        report = trackinglog.logger.sample_profile_report("bench_sample")
+        raw = results["raw function"]
+
+    for name, elapsed in results.items():
+        print(f"{name:<28}{elapsed * 1000:>10,.1f} ms{(elapsed / raw - 1) * 100:>+10.1f} %")
+    print("\nTop sampled stacks:")
+    for line in report.get("bench_sample", "").splitlines()[:5]:
+        print(f"  {line}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark of the dict, list and DataFrame rendering of log messages, against pandas to_string.
+Also checks that the summarizer output is identical to pandas for the benchmarked objects.
+
+Usage:
+    python benchmarks/bench_summarizer.py [--calls N] [--rows N]
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from trackinglog.log_manager.summarizer import summarizer
+
+OPTIONS = {"max_rows": 10, "max_cols": 10, "max_colwidth": 35, "show_dimensions": True}
+
+
+def pandas_dict(mapping: dict) -> str:
+    """The former rendering of dicts, through a key/value DataFrame."""
+    return pd.DataFrame([{"key": k, "value": v} for k, v in mapping.items()]).to_string(**OPTIONS)
+
+
+def measure(func, calls: int):
+    """Microseconds per call, and peak traced memory in KiB of one call."""
+    func()
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed / calls * 1e6, peak / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    frame = pd.DataFrame(np.random.rand(args.rows, 20))
+    mixed = pd.DataFrame({"name": [f"item_{i}" for i in range(args.rows)], "count": np.arange(args.rows), "ratio": np.random.rand(args.rows)})
+    mapping = {f"key_{i}": i * 0.5 for i in range(args.rows)}
+    items = list(range(args.rows))
+
+    assert summarizer.render_frame(frame) == frame.to_string(**OPTIONS)
+    assert summarizer.render_frame(mixed) == mixed.to_string(**OPTIONS)
+    assert summarizer.render_dict(mapping) == pandas_dict(mapping)
+
+    cases = {
+        "DataFrame float  pandas to_string": lambda: frame.to_string(**OPTIONS),
+        "DataFrame float  summarizer": lambda: summarizer.render_frame(frame),
+        "DataFrame mixed  pandas to_string": lambda: mixed.to_string(**OPTIONS),
+        "DataFrame mixed  summarizer": lambda: summarizer.render_frame(mixed),
+        "dict             pandas DataFrame": lambda: pandas_dict(mapping),
+        "dict             summarizer": lambda: summarizer.render_dict(mapping),
+        "list             str()": lambda: str(items),
+        "list             summarizer": lambda: summarizer.render_sequence(items),
+    }
+    print(f"{args.rows:,} rows, {args.calls} calls per case")
+    for name, func in cases.items():
+        cost, peak = measure(func, args.calls)
+        print(f"{name:<36}{cost:>12,.1f} us/call{peak:>12,.0f} KiB peak")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1 @@
-from .email_manager import EmailAgent
-
+from .email_manager import EmailAgent, SmtpTransport, FileTransport, build_message
@@ -1,64 +1,239 @@
+import datetime
+import itertools
 import os
-from os.path import join as pjoin
-from typing import Optional, Union, Callable
+import smtplib
+import threading
+import time
+from email.message import EmailMessage
+from email.utils import formatdate, make_msgid
+from typing import Callable, List, Optional, Tuple, Union
+
+from ..parameter_config.parameter_config import EmailCredential
+
+
+def build_message(sender: Optional[str], recipients: List[str], subject: str, body: str) -> EmailMessage:
+    """
+    Build a plain text email.
+    Parameters:
+        sender (str): From address.
+        recipients (List[str]): To addresses.
+        subject (str): Subject line.
+        body (str): Text body.
+    Returns:
+        EmailMessage: The message.
+    """
+    message = EmailMessage()
+    message["Subject"] = subject
+    if sender:
+        message["From"] = sender
+    if recipients:
+        message["To"] = ", ".join(recipients)
+    message["Date"] = formatdate(localtime=True)
+    message["Message-ID"] = make_msgid(domain="trackinglog")
+    message.set_content(body)
+    return message
+
+
+class SmtpTransport:
+    """
+    SMTP transport keeping a small pool of authenticated connections, reused across deliveries.
+    Connections idle for longer than idle_timeout are closed instead of being reused, and a connection that fails is discarded.
+    """
+    def __init__(self, host: str, port: int = 587, username: Optional[str] = None, password: Optional[str] = None, use_tls: bool = True,
+                 timeout: float = 30, pool_size: int = 2, idle_timeout: float = 60) -> None:
+        """
+        Initialize the transport. No connection is opened until the first delivery.
+        Parameters:
+            host (str): SMTP server host.
+            port (int): SMTP server port.
+            username (str, optional): Login username, no login if None.
+            password (str, optional): Login password.
+            use_tls (bool): Upgrade the connection with STARTTLS.
+            timeout (float): Socket timeout in seconds.
+            pool_size (int): Maximum number of idle connections kept open.
+            idle_timeout (float): Seconds after which an idle connection is closed instead of reused.
+        """
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self._idle: List[Tuple[smtplib.SMTP, float]] = []
+        self._lock = threading.Lock()
+
+    def send(self, message: EmailMessage) -> None:
+        """Deliver a message, raising on failure. The caller is responsible for retries."""
+        connection = self._acquire()
+        try:
+            connection.send_message(message)
+        except BaseException:
+            self._discard(connection)
+            raise
+        self._release(connection)
+
+    def close(self) -> None:
+        """Close the idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection, _ in idle:
+            self._discard(connection)
+
+    def _acquire(self) -> smtplib.SMTP:
+        now = time.monotonic()
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                connection, released = self._idle.pop()
+            if now - released < self.idle_timeout:
+                return connection
+            self._discard(connection)
+        return self._connect()
+
+    def _release(self, connection: smtplib.SMTP) -> None:
+        with self._lock:
+            if len(self._idle) < self.pool_size:
+                self._idle.append((connection, time.monotonic()))
+                return
+        self._discard(connection)
+
+    def _connect(self) -> smtplib.SMTP:
+        connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                connection.starttls()
+            if self.username:
+                connection.login(self.username, self.password or "")
+        except BaseException:
+            self._discard(connection)
+            raise
+        return connection
+
+    @staticmethod
+    def _discard(connection: smtplib.SMTP) -> None:
+        try:
+            connection.quit()
+        except Exception:
+            connection.close()
+
+
+class FileTransport:
+    """
+    Transport writing each message as an .eml file into a spool folder, for tests and hosts without an SMTP server.
+    Files are written under a temporary name and renamed, so readers of the folder never see partial messages.
+    """
+    def __init__(self, folder: str) -> None:
+        """
+        Initialize the transport.
+        Parameters:
+            folder (str): The spool folder, created on first delivery.
+        """
+        self.folder = folder
+        self._counter = itertools.count()
+
+    def send(self, message: EmailMessage) -> str:
+        """
+        Write a message into the spool folder.
+        Returns:
+            str: Path of the written file.
+        """
+        os.makedirs(self.folder, exist_ok=True)
+        time_stamp = datetime.datetime.now().strftime("%y%m%d_%H%M%S_%f")
+        path = os.path.join(self.folder, f"{time_stamp}_{os.getpid()}_{next(self._counter)}.eml")
+        with open(path + ".tmp", "wb") as f:
+            f.write(bytes(message))
+        os.replace(path + ".tmp", path)
+        return path
+
+    def close(self) -> None:
+        pass
+
 
 class EmailAgent:
-    # __slots__ = ['username', 'password', 'root_emails_folder', 'setup']
-
-    def __init__(self, data: Union[dict, Callable], default_emails_folder: str = 'emails') -> None:
-        self.username = None
-        self.password = None
-        self.root_emails_folder = None
-
-        if isinstance(data, dict):
-            self.setup(
-                email_root_folder=data.get('root_emails_folder', default_emails_folder),
-                username=data.get('username'),
-                password=data.get('password')
-            )
-        else:
-            # Assuming 'data' is an object with attributes 'username' and 'password'
-            assert hasattr(data, 'username') and hasattr(data, 'password') and hasattr(data, 'root_emails_folder'), "Invalid data type for email credential"
-            self.setup(
-                email_root_folder=default_emails_folder if data.root_emails_folder is None else data.root_emails_folder,
-                username=data.username,
-                password=data.password
-            )
-    
-    def setup(self, email_root_folder: str, username: Optional[str] = None, password: Optional[str] = None,) -> None:
+    """
+    Sends emails with the configured email credential, through an SMTP transport or a file spool in the emails folder.
+    """
+    def __init__(self, data: Union[dict, Callable, EmailCredential], default_emails_folder: str = 'emails') -> None:
+        """
+        Initialize the agent.
+        Parameters:
+            data (dict, object or EmailCredential): The email credential or its settings.
+            default_emails_folder (str): Emails folder used if the settings do not give one.
+        """
+        self.credential = data if isinstance(data, EmailCredential) else EmailCredential(data, default_emails_folder)
+        self._transport = None
+
+    def setup(self, email_root_folder: str, username: Optional[str] = None, password: Optional[str] = None, **kwargs) -> None:
         """
-        Setup the email credential.
+        Setup the email credential, see EmailCredential.setup.
         Parameters:
+            email_root_folder (str): The folder where emails are stored.
             username (str): The email username.
             password (str): The email password.
         """
-        self.root_emails_folder = email_root_folder
-        self.username = username if username is not None else self.username
-        self.password = password if password is not None else self.password
+        self.credential.setup(email_root_folder, username=username, password=password, **kwargs)
+        self.close()
 
     @property
-    def username(self) -> str:
-        return self.username
+    def username(self) -> Optional[str]:
+        return self.credential.username
 
     @property
-    def password(self) -> str:
-        return self.password
+    def password(self) -> Optional[str]:
+        return self.credential.password
 
     @property
     def root_emails_folder(self) -> str:
-        return self.root_emails_folder
+        return self.credential.root_emails_folder
 
     @username.setter
     def username(self, value: str) -> None:
-        self.username = value
+        self.credential.username = value
 
     @password.setter
     def password(self, value: str) -> None:
-        self.password = value
+        self.credential.password = value
 
     @root_emails_folder.setter
     def root_emails_folder(self, value: str) -> None:
-        self.root_emails_folder = value
+        self.credential.root_emails_folder = value
+
+    @property
+    def transport(self) -> Union[SmtpTransport, FileTransport]:
+        """The transport of the credential, created on first use."""
+        if self._transport is None:
+            credential = self.credential
+            if credential.transport == "smtp":
+                assert credential.smtp_host, "smtp_host must be set for the smtp email transport"
+                self._transport = SmtpTransport(credential.smtp_host, credential.smtp_port, credential.username, credential.password,
+                                                use_tls=credential.smtp_use_tls)
+            else:
+                self._transport = FileTransport(credential.root_emails_folder)
+        return self._transport
+
+    @transport.setter
+    def transport(self, value: Union[SmtpTransport, FileTransport]) -> None:
+        self._transport = value
+
+    def send(self, subject: str, body: str, recipients: Optional[List[str]] = None) -> None:
+        """
+        Send an email synchronously.
+        Parameters:
+            subject (str): Subject line.
+            body (str): Text body.
+            recipients (List[str], optional): To addresses, defaults to the configured recipients.
+        """
+        message = build_message(self.credential.sender, recipients if recipients is not None else self.credential.recipients, subject, body)
+        self.transport.send(message)
+
+    def close(self) -> None:
+        """Close the connections of the transport."""
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
 
     def __repr__(self) -> str:
-        return f"EmailCredential(username={self.username}, password=***hidden***)"
+        return f"EmailAgent(username={self.username}, password=***hidden***)"
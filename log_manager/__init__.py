@@ -1,2 +1,2 @@
 from .log_manager import LogManager
-
+from .log_reader import LogReader
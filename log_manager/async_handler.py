@@ -0,0 +1,195 @@
+import logging
+import sys
+import threading
+import os
+import weakref
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .rotation import LogRotator, write_rotating
+
+_handlers: "weakref.WeakSet[AsyncFileHandler]" = weakref.WeakSet()
+
+
+class AsyncFileHandler(logging.FileHandler):
+    """
+    Non-blocking file handler: records are formatted in the calling thread, put into a bounded queue
+    and written in batches by a single writer thread. Records emitted while the handler closes are written directly,
+    records emitted once it is closed are dropped and counted in dropped_count.
+    """
+    OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_debug")
+
+    def __init__(self, filename: str, mode: str = 'a', encoding: Optional[str] = None, queue_size: int = 10000,
+                 flush_interval: float = 0.5, flush_size: int = 256, overflow_policy: str = "block", rotator: Optional[LogRotator] = None) -> None:
+        """
+        Initialize the handler and start its writer thread.
+        Parameters:
+            filename (str): Path of the log file.
+            mode (str): File open mode.
+            encoding (str, optional): File encoding.
+            queue_size (int): Maximum number of records waiting to be written.
+            flush_interval (float): Maximum time in seconds a record waits in the queue before being written.
+            flush_size (int): Number of queued records that triggers an immediate write.
+            overflow_policy (str): What to do when the queue is full: "block", "drop_oldest" or "drop_debug".
+            rotator (LogRotator, optional): Rotation policy applied by the writer thread before each batch.
+        """
+        if overflow_policy not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"Invalid overflow policy: {overflow_policy}, expected one of {self.OVERFLOW_POLICIES}")
+        super().__init__(filename, mode=mode, encoding=encoding)
+        self.queue_size = max(1, int(queue_size))
+        self.flush_interval = flush_interval
+        self.flush_size = max(1, min(int(flush_size), self.queue_size))
+        self.overflow_policy = overflow_policy
+        self.rotator = rotator
+        self.dropped_count = 0
+        self.dropped_by_level: Dict[str, int] = {}
+        self._queue: Deque[Tuple[int, str]] = deque()
+        self._condition = threading.Condition(threading.Lock())
+        self._write_lock = threading.Lock()
+        self._closing = False
+        self._closed = False
+        self._start_writer()
+        _handlers.add(self)
+
+    def _start_writer(self) -> None:
+        self._writer = threading.Thread(target=self._writer_loop, name=f"trackinglog-writer-{os.path.basename(self.baseFilename)}", daemon=True)
+        self._writer.start()
+
+    def _reinit_after_fork(self) -> None:
+        """Reset the locks and restart the writer thread in a forked child. Queued records are left to the parent."""
+        self._condition = threading.Condition(threading.Lock())
+        self._write_lock = threading.Lock()
+        self._queue.clear()
+        if not self._closing:
+            self._start_writer()
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Current queue length and dropped-record counters."""
+        with self._condition:
+            return {"queued": len(self._queue), "dropped": self.dropped_count, "dropped_by_level": dict(self.dropped_by_level)}
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        """Filter and enqueue the record without holding the handler lock while formatting."""
+        rv = self.filter(record)
+        if rv:
+            self.emit(record)
+        return rv
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Format the record and put it into the queue, applying the overflow policy if the queue is full."""
+        try:
+            line = self.format(record) + self.terminator
+        except Exception:
+            self.handleError(record)
+            return
+
+        with self._condition:
+            if self._closing:
+                write_now = True
+            else:
+                write_now = False
+                while len(self._queue) >= self.queue_size:
+                    if self.overflow_policy == "drop_oldest":
+                        self._count_drop(self._queue.popleft()[0])
+                    elif self.overflow_policy == "drop_debug" and record.levelno <= logging.DEBUG:
+                        self._count_drop(record.levelno)
+                        return
+                    elif not (self.overflow_policy == "drop_debug" and self._drop_queued_debug()):
+                        self._condition.wait()
+                        if self._closing:
+                            write_now = True
+                            break
+                if not write_now:
+                    self._queue.append((record.levelno, line))
+                    if len(self._queue) >= self.flush_size:
+                        self._condition.notify_all()
+        if write_now:
+            with self._write_lock:
+                if not self._closed:
+                    self._write_lines([line])
+                    return
+            # The file is closed, writing would reopen it
+            with self._condition:
+                self._count_drop(record.levelno)
+
+    def flush(self) -> None:
+        """Write all queued records synchronously and flush the stream."""
+        if hasattr(self, "_queue"):
+            self._drain()
+        super().flush()
+
+    def close(self) -> None:
+        """Stop the writer thread after it has written every queued record, then close the file."""
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+        if self._writer.is_alive() and threading.current_thread() is not self._writer:
+            self._writer.join()
+        self._drain()
+        with self._write_lock:
+            self._closed = True
+        super().close()
+
+    def _count_drop(self, levelno: int) -> None:
+        self.dropped_count += 1
+        level_name = logging.getLevelName(levelno)
+        self.dropped_by_level[level_name] = self.dropped_by_level.get(level_name, 0) + 1
+
+    def _drop_queued_debug(self) -> bool:
+        """Evict the oldest queued DEBUG record. Must be called with the condition held."""
+        for index, (levelno, _) in enumerate(self._queue):
+            if levelno <= logging.DEBUG:
+                del self._queue[index]
+                self._count_drop(levelno)
+                return True
+        return False
+
+    def _writer_loop(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._closing or len(self._queue) >= self.flush_size, timeout=self.flush_interval)
+                closing = self._closing
+            self._drain()
+            if closing:
+                return
+
+    def _drain(self) -> None:
+        """Take every queued record and write it in a single batch."""
+        with self._write_lock:
+            with self._condition:
+                if not self._queue:
+                    return
+                lines = [line for _, line in self._queue]
+                self._queue.clear()
+                self._condition.notify_all()
+            self._write_lines(lines)
+
+    def _write_lines(self, lines: List[str]) -> None:
+        """Write a batch of formatted lines. Must be called with the write lock held."""
+        try:
+            write_rotating(lines, self.rotator, self._write, self._rotate, self.encoding)
+        except Exception as e:
+            sys.stderr.write(f"--- trackinglog: failed to write {len(lines)} records to {self.baseFilename}: {e}\n")
+
+
+    def _write(self, data: str) -> None:
+        if self.stream is None:
+            self.stream = self._open()
+        self.stream.write(data)
+        self.stream.flush()
+
+    def _rotate(self) -> None:
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+        self.rotator.rotate()
+
+
+def _reinit_handlers_after_fork() -> None:
+    for handler in list(_handlers):
+        handler._reinit_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_handlers_after_fork)
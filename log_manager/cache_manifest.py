@@ -0,0 +1,137 @@
+import os
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional, Set
+
+
+class CacheLogManifest:
+    """
+    Persistent manifest of the files of a cache log folder, stored in a small SQLite database inside the folder.
+    It records the creation time and size of every file, so cleanups do not stat the whole folder again:
+    one os.scandir pass only reconciles the names, and only files unknown to the manifest are stat'ed.
+    """
+    FILENAME = ".trackinglog_manifest.sqlite"
+
+    def __init__(self, folder: str) -> None:
+        """
+        Initialize the manifest of a folder.
+        Parameters:
+            folder (str): The cache log folder.
+        """
+        self.folder = folder
+        self.path = os.path.join(folder, self.FILENAME)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Connection to the manifest, committed and closed on exit. Several processes may share the manifest."""
+        os.makedirs(self.folder, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS files (name TEXT PRIMARY KEY, created REAL NOT NULL, size INTEGER)")
+                yield conn
+        finally:
+            conn.close()
+
+    def add(self, path: str) -> None:
+        """
+        Record a newly created log file. Its size is recorded at the first cleanup after it was created.
+        Parameters:
+            path (str): Path of the log file, inside the folder.
+        """
+        with self._lock, self._transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO files (name, created, size) VALUES (?, ?, NULL)", (os.path.basename(path), time.time()))
+
+    def clean(self, limit: Optional[int] = None, days: Optional[float] = None, size_limit: Optional[int] = None,
+              exclude: Iterable[str] = ()) -> List[str]:
+        """
+        Delete the files beyond the retention limits, newest files being kept first. Each file is deleted at most once.
+        Parameters:
+            limit (int, optional): Maximum number of files to retain.
+            days (float, optional): Maximum age of files to retain, in days.
+            size_limit (int, optional): Maximum total size in bytes of the retained files.
+            exclude (Iterable[str]): Paths never deleted, e.g. the log files currently written.
+        Returns:
+            List[str]: The deleted paths.
+        """
+        if not os.path.isdir(self.folder):
+            return []
+        excluded: Set[str] = {os.path.basename(path) for path in exclude}
+        with self._lock, self._transaction() as conn:
+            known = {name: (created, size) for name, created, size in conn.execute("SELECT name, created, size FROM files")}
+            present = set()
+            new_rows = []
+            with os.scandir(self.folder) as entries:
+                for entry in entries:
+                    if entry.name.startswith(self.FILENAME) or not entry.is_file(follow_symlinks=False):
+                        continue
+                    present.add(entry.name)
+                    if entry.name not in known:
+                        stat = entry.stat(follow_symlinks=False)
+                        known[entry.name] = (stat.st_mtime, stat.st_size)
+                        new_rows.append((entry.name, stat.st_mtime, stat.st_size))
+            missing = [name for name in known if name not in present]
+            for name in missing:
+                del known[name]
+            # Files recorded at creation get their size once they are no longer written
+            sized_rows = []
+            for name, (created, size) in known.items():
+                if size is None and name not in excluded:
+                    try:
+                        size = os.path.getsize(os.path.join(self.folder, name))
+                    except OSError:
+                        continue
+                    known[name] = (created, size)
+                    sized_rows.append((size, name))
+
+            cutoff = None if days is None else time.time() - days * 86400
+            to_delete = []
+            total_size = 0
+            retained = 0
+            for name, (created, size) in sorted(known.items(), key=lambda item: item[1][0], reverse=True):
+                if name in excluded:
+                    total_size += size or 0
+                    retained += 1
+                    continue
+                if (limit is not None and retained >= limit) or (cutoff is not None and created < cutoff) or \
+                        (size_limit is not None and total_size + (size or 0) > size_limit):
+                    to_delete.append(name)
+                    continue
+                total_size += size or 0
+                retained += 1
+
+            deleted = []
+            for name in to_delete:
+                path = os.path.join(self.folder, name)
+                try:
+                    os.remove(path)
+                    deleted.append(path)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    sys.stderr.write(f"--- trackinglog: failed to delete cache log {path}: {e}\n")
+                    continue
+                missing.append(name)
+            conn.executemany("INSERT OR REPLACE INTO files (name, created, size) VALUES (?, ?, ?)", new_rows)
+            conn.executemany("UPDATE files SET size = ? WHERE name = ?", sized_rows)
+            conn.executemany("DELETE FROM files WHERE name = ?", [(name,) for name in missing])
+        return deleted
+
+    def clean_in_background(self, *args, **kwargs) -> threading.Thread:
+        """
+        Run clean() on a daemon thread, with the same arguments.
+        Returns:
+            threading.Thread: The started thread.
+        """
+        def run() -> None:
+            try:
+                self.clean(*args, **kwargs)
+            except Exception as e:
+                sys.stderr.write(f"--- trackinglog: cache log cleanup failed: {e}\n")
+        thread = threading.Thread(target=run, name="trackinglog-cache-cleaner", daemon=True)
+        thread.start()
+        return thread
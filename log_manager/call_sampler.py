@@ -0,0 +1,89 @@
+import itertools
+import random
+import threading
+import time
+from typing import Optional, Tuple
+
+
+class CallSampler:
+    """
+    CallSampler decides which calls of a decorated function get their "<LOG_MANAGER>" messages written.
+    Calls can be sampled by probability or every Nth call, and the sampled calls are further limited by a token bucket.
+    """
+    def __init__(self, sample_rate: Optional[float] = None, sample_every: Optional[int] = None, rate_limit: Optional[float] = None,
+                 rate_burst: Optional[int] = None, summary_interval: float = 60.0) -> None:
+        """
+        Initialize the sampler.
+        Parameters:
+            sample_rate (float, optional): Probability in (0, 1] that a call is logged.
+            sample_every (int, optional): Log only every Nth call, starting with the first one.
+            rate_limit (float, optional): Maximum number of logged calls per second.
+            rate_burst (int, optional): Token bucket size, defaults to max(1, rate_limit).
+            summary_interval (float): Minimum number of seconds between two suppressed-call summaries.
+        """
+        if sample_rate is not None and not 0 < sample_rate <= 1:
+            raise ValueError(f"sample_rate must be in (0, 1], got {sample_rate}")
+        if sample_every is not None and sample_every < 1:
+            raise ValueError(f"sample_every must be a positive integer, got {sample_every}")
+        if rate_limit is not None and rate_limit <= 0:
+            raise ValueError(f"rate_limit must be positive, got {rate_limit}")
+        self.sample_rate = sample_rate
+        self.sample_every = sample_every
+        self.rate_limit = rate_limit
+        self.rate_burst = rate_burst if rate_burst is not None else max(1, int(rate_limit or 1))
+        self.summary_interval = summary_interval
+        self._calls = itertools.count()
+        self._lock = threading.Lock()
+        self._tokens = float(self.rate_burst)
+        self._last_refill = time.monotonic()
+        self._suppressed = 0
+        self._last_summary = time.monotonic()
+
+    def should_log(self) -> bool:
+        """
+        Decide whether the current call is logged, counting it as suppressed otherwise.
+        Returns:
+            bool: True if the call's messages should be written.
+        """
+        call_index = next(self._calls)
+        if self.sample_every is not None and call_index % self.sample_every:
+            sampled = False
+        elif self.sample_rate is not None and random.random() >= self.sample_rate:
+            sampled = False
+        elif self.rate_limit is not None:
+            sampled = self._take_token()
+        else:
+            sampled = True
+        if not sampled:
+            with self._lock:
+                self._suppressed += 1
+        return sampled
+
+    def take_summary(self, force: bool = False) -> Optional[Tuple[int, float]]:
+        """
+        Return and reset the suppressed-call count once the summary interval has elapsed.
+        Parameters:
+            force (bool): Return the summary regardless of the interval.
+        Returns:
+            Optional[Tuple[int, float]]: Number of suppressed calls and the covered time span in seconds, or None if there is nothing to report.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_summary < self.summary_interval:
+            return None
+        with self._lock:
+            if not force and now - self._last_summary < self.summary_interval:
+                return None
+            suppressed, elapsed = self._suppressed, now - self._last_summary
+            self._suppressed = 0
+            self._last_summary = now
+        return (suppressed, elapsed) if suppressed else None
+
+    def _take_token(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate_burst, self._tokens + (now - self._last_refill) * self.rate_limit)
+            self._last_refill = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
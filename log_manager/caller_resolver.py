@@ -0,0 +1,68 @@
+import sys
+from types import CodeType
+from typing import Callable, Dict, Set
+
+
+class CallerResolver:
+    """
+    CallerResolver finds the name of the function that issued a log call by walking frames with sys._getframe.
+    Frames that belong to registered wrappers are skipped and code-object to name lookups are cached.
+    """
+    def __init__(self, qualified: bool = False) -> None:
+        """
+        Initialize the resolver.
+        Parameters:
+            qualified (bool): If True, resolve to the qualified name (e.g. "MyClass.method") instead of the bare function name.
+        """
+        self.qualified = qualified
+        self._skip_codes: Set[CodeType] = set()
+        self._name_cache: Dict[CodeType, str] = {}
+
+    def register_wrapper(self, func: Callable) -> Callable:
+        """
+        Register a wrapper function whose frames should be skipped while resolving the caller.
+        Parameters:
+            func (Callable): The wrapper function.
+        Returns:
+            Callable: The same function, so this can be used as a decorator.
+        """
+        code = getattr(func, "__code__", None)
+        if code is not None:
+            self._skip_codes.add(code)
+        return func
+
+    def code_name(self, code: CodeType) -> str:
+        """
+        Return the (cached) display name of a code object.
+        Parameters:
+            code (CodeType): The code object of a frame.
+        Returns:
+            str: The function name or qualified name.
+        """
+        name = self._name_cache.get(code)
+        if name is None:
+            name = code.co_qualname if self.qualified else code.co_name
+            self._name_cache[code] = name
+        return name
+
+    def resolve(self, depth: int = 1) -> str:
+        """
+        Resolve the name of the calling function.
+        Parameters:
+            depth (int): Number of frames above the caller of this method to start from, 1 being the caller's caller.
+        Returns:
+            str: The name of the first frame that is not a registered wrapper.
+        """
+        try:
+            frame = sys._getframe(depth + 1)
+        except ValueError:
+            return "<module>"
+        skip_codes = self._skip_codes
+        while frame is not None and frame.f_code in skip_codes:
+            frame = frame.f_back
+        if frame is None:
+            return "<module>"
+        return self.code_name(frame.f_code)
+
+
+caller_resolver = CallerResolver()
@@ -0,0 +1,88 @@
+import threading
+from fnmatch import fnmatchcase
+from typing import Any, Callable, Optional, Sequence
+
+MARKER_ATTRIBUTE = "_trackinglog_marker"
+
+
+def _mark(obj: Any, marker: str) -> Any:
+    # Staticmethods and classmethods are marked on their function, so that the marker works above or below them
+    target = getattr(obj, "__func__", obj)
+    setattr(target, MARKER_ATTRIBUTE, marker)
+    return obj
+
+
+def skip(obj: Callable) -> Callable:
+    """Mark a method so that the get_log class decorator leaves it unwrapped, whatever the include patterns."""
+    return _mark(obj, "skip")
+
+
+def profile(obj: Callable) -> Callable:
+    """Mark a method so that the get_log class decorator wraps it, whatever the include and exclude patterns."""
+    return _mark(obj, "profile")
+
+
+def should_instrument(name: str, func: Callable, include: Optional[Sequence[str]], exclude: Sequence[str]) -> bool:
+    """
+    Decide whether a method of a decorated class is wrapped.
+    Markers come first, then dunder names are left out, then the exclude patterns, then the include patterns.
+    Parameters:
+        name (str): Attribute name of the method.
+        func (Callable): The function of the method.
+        include (Sequence[str], optional): fnmatch patterns of the wrapped names, None for all.
+        exclude (Sequence[str]): fnmatch patterns of the names left unwrapped.
+    Returns:
+        bool: Whether the method is wrapped.
+    """
+    marker = getattr(func, MARKER_ATTRIBUTE, None)
+    if marker is not None:
+        return marker == "profile"
+    if name.startswith("__"):
+        return False
+    if any(fnmatchcase(name, pattern) for pattern in exclude):
+        return False
+    return include is None or any(fnmatchcase(name, pattern) for pattern in include)
+
+
+class LazyInstrumentedMethod:
+    """
+    Placeholder of a method in the namespace of a decorated class. On first attribute access, the method is wrapped,
+    keeping its descriptor type (function, staticmethod or classmethod), and the placeholder is replaced by the wrapped method.
+    """
+    def __init__(self, owner: type, name: str, attribute: Any, instrument: Callable[[Callable], Callable]) -> None:
+        """
+        Initialize the placeholder.
+        Parameters:
+            owner (type): The class whose namespace holds the method.
+            name (str): Attribute name of the method.
+            attribute: The function, staticmethod or classmethod found in the class namespace.
+            instrument (Callable): Wraps a function.
+        """
+        self.owner = owner
+        self.name = name
+        self.attribute = attribute
+        self.instrument = instrument
+        self._lock = threading.Lock()
+        func = getattr(attribute, "__func__", attribute)
+        self.__doc__ = func.__doc__
+        self.__wrapped__ = func
+
+    def resolve(self) -> Any:
+        """Wrap the method and put it into the class namespace, once. Returns the attribute now in the class namespace."""
+        with self._lock:
+            current = self.owner.__dict__.get(self.name)
+            if current is not self:
+                return current
+            attribute = self.attribute
+            if isinstance(attribute, (staticmethod, classmethod)):
+                wrapped = type(attribute)(self.instrument(attribute.__func__))
+            else:
+                wrapped = self.instrument(attribute)
+            setattr(self.owner, self.name, wrapped)
+            return wrapped
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        return self.resolve().__get__(instance, owner)
+
+    def __repr__(self) -> str:
+        return f"<lazily instrumented {self.owner.__qualname__}.{self.name}>"
@@ -0,0 +1,167 @@
+import datetime
+import hashlib
+import os
+import threading
+import time
+import traceback
+from types import TracebackType
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Frames of the log manager itself (decorator wrappers, profiling helpers) are not part of a fingerprint nor of the logged traceback
+_LOG_MANAGER_DIR = os.path.dirname(os.path.abspath(__file__)) + os.sep
+
+Fingerprint = Tuple[Any, ...]
+
+
+def fingerprint(exc: BaseException) -> Fingerprint:
+    """
+    Key of an exception built from its type and the code locations of its traceback, without formatting any text.
+    Parameters:
+        exc (BaseException): The exception.
+    Returns:
+        tuple: (exception type, (code object, line number) of each frame outside the log manager, ...).
+    """
+    locations = []
+    tb: Optional[TracebackType] = exc.__traceback__
+    while tb is not None:
+        code = tb.tb_frame.f_code
+        if not code.co_filename.startswith(_LOG_MANAGER_DIR):
+            locations.append((code, tb.tb_lineno))
+        tb = tb.tb_next
+    return (type(exc), *locations)
+
+
+def format_exception(exc: BaseException) -> str:
+    """
+    Format the traceback of an exception and of its chained exceptions, without the frames of the log manager.
+    Parameters:
+        exc (BaseException): The exception.
+    Returns:
+        str: The formatted traceback.
+    """
+    formatted = traceback.TracebackException(type(exc), exc, exc.__traceback__)
+    pending, seen = [formatted], set()
+    while pending:
+        current = pending.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        current.stack[:] = [frame for frame in current.stack if not frame.filename.startswith(_LOG_MANAGER_DIR)]
+        pending.extend(chained for chained in (current.__cause__, current.__context__) if chained is not None)
+    return "".join(formatted.format()).rstrip("\n")
+
+
+class ErrorStats:
+    """Occurrences of one error signature in one logger."""
+    __slots__ = ['signature', 'logger', 'error_type', 'location', 'message', 'count', 'first_seen', 'last_seen', 'reported_count', 'reported_at']
+
+    def __init__(self, signature: str, logger: str, error_type: str, location: str) -> None:
+        self.signature = signature
+        self.logger = logger
+        self.error_type = error_type
+        self.location = location
+        self.message = ""
+        self.count = 0
+        self.first_seen = time.time()
+        self.last_seen = self.first_seen
+        self.reported_count = 0
+        self.reported_at = time.monotonic()
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "signature": self.signature, "logger": self.logger, "type": self.error_type, "location": self.location,
+            "message": self.message, "count": self.count,
+            "first_seen": datetime.datetime.fromtimestamp(self.first_seen).isoformat(timespec="seconds"),
+            "last_seen": datetime.datetime.fromtimestamp(self.last_seen).isoformat(timespec="seconds"),
+        }
+
+
+class ErrorRegistry:
+    """
+    Registry of the uncaught errors of decorated functions, keyed by logger and exception fingerprint.
+    The first occurrence of a signature is reported with its full traceback; repeats are only counted,
+    and reported as counts at most once per repeat interval.
+    """
+    def __init__(self) -> None:
+        self._stats: Dict[Tuple[str, Fingerprint], ErrorStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, logname: str, exc: BaseException, repeat_interval: float) -> Tuple[ErrorStats, str]:
+        """
+        Record an occurrence of an error.
+        Parameters:
+            logname (str): Name of the logger.
+            exc (BaseException): The exception.
+            repeat_interval (float): Minimum seconds between two reports of the repeats of a signature.
+        Returns:
+            Tuple[ErrorStats, str]: The statistics of the signature, and "first" for a first occurrence,
+                "repeat" if the repeats are due to be reported, or "" if the occurrence is only counted.
+        """
+        key = (logname, fingerprint(exc))
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = self._create(logname, key[1])
+            stats.count += 1
+            stats.last_seen = time.time()
+            stats.message = str(exc)[:500]
+            if stats.count == 1:
+                stats.reported_count = 1
+                return stats, "first"
+            if time.monotonic() - stats.reported_at >= repeat_interval:
+                stats.reported_at = time.monotonic()
+                return stats, "repeat"
+            return stats, ""
+
+    def take_unreported(self, stats: ErrorStats) -> int:
+        """Number of occurrences since the last report of a signature, marking them as reported."""
+        with self._lock:
+            unreported = stats.count - stats.reported_count
+            stats.reported_count = stats.count
+            return unreported
+
+    def flush(self, emit: Callable[[ErrorStats, int], None]) -> None:
+        """
+        Report the occurrences not reported yet of every signature.
+        Parameters:
+            emit (Callable): Called with the statistics and the number of unreported occurrences.
+        """
+        with self._lock:
+            items = list(self._stats.values())
+        for stats in items:
+            unreported = self.take_unreported(stats)
+            if unreported:
+                emit(stats, unreported)
+
+    def top(self, logname: Optional[str] = None, limit: Optional[int] = 10) -> List[Dict[str, Any]]:
+        """
+        The most frequent error signatures.
+        Parameters:
+            logname (str, optional): Only the errors of this logger.
+            limit (int, optional): Maximum number of signatures, None for all.
+        Returns:
+            List[Dict]: Summaries with "signature", "logger", "type", "location", "message", "count", "first_seen" and "last_seen", by decreasing count.
+        """
+        with self._lock:
+            items = [stats.summary() for stats in self._stats.values() if logname is None or stats.logger == logname]
+        items.sort(key=lambda item: item["count"], reverse=True)
+        return items if limit is None else items[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    @staticmethod
+    def _create(logname: str, key: Fingerprint) -> ErrorStats:
+        error_type = key[0].__qualname__
+        frames = [f"{code.co_filename}:{lineno}:{code.co_name}" for code, lineno in key[1:]]
+        signature = hashlib.blake2b("|".join([f"{key[0].__module__}.{error_type}"] + frames).encode(), digest_size=6).hexdigest()
+        if key[1:]:
+            code, lineno = key[-1]
+            location = f"{os.path.basename(code.co_filename)}:{lineno} in {code.co_name}"
+        else:
+            location = "<unknown>"
+        return ErrorStats(signature, logname, error_type, location)
+
+
+error_registry = ErrorRegistry()
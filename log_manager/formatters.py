@@ -0,0 +1,175 @@
+import dataclasses
+import reprlib
+import sys
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union
+
+from .summarizer import summarizer
+
+Formatter = Callable[..., str]
+TypeKey = Union[Type, str]
+
+DICT_SEPARATOR = "\n- - - - - - - - - - - - - - - - - - - \n"
+FRAME_SEPARATOR = "\n--------------------------------------\n"
+
+
+class FormatterRegistry:
+    """
+    Registry of the functions turning logged arguments into text, dispatched on the argument type.
+    The formatter of a type is the one registered for the nearest class of its MRO, and the lookup is cached per type.
+    Types of optional dependencies are registered by their qualified name, e.g. "numpy.ndarray", so they are never imported.
+    Arguments without a formatter are converted with str().
+    """
+    def __init__(self) -> None:
+        self._formatters: Dict[TypeKey, Formatter] = {}
+        self._predicates: List[Tuple[Callable[[Type], bool], Formatter]] = []
+        self._cache: Dict[Type, Optional[Formatter]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, cls: TypeKey, formatter: Formatter) -> None:
+        """
+        Register the formatter of a type and its subclasses, replacing any previous one.
+        Parameters:
+            cls (type or str): The type, or its qualified name "module.QualName" to avoid importing it.
+            formatter (Callable): Called as formatter(obj, **options) with the formatting options of the log call,
+                e.g. max_rows, max_cols, max_colwidth, max_items, max_bytes, and returning the text.
+        """
+        with self._lock:
+            self._formatters[cls] = formatter
+            self._cache = {}
+
+    def register_predicate(self, predicate: Callable[[Type], bool], formatter: Formatter) -> None:
+        """
+        Register the formatter of the types matching a predicate, used for the types without a formatter in their MRO.
+        Parameters:
+            predicate (Callable): Called with the type of the argument.
+            formatter (Callable): The formatter, see register().
+        """
+        with self._lock:
+            self._predicates.append((predicate, formatter))
+            self._cache = {}
+
+    def lookup(self, cls: Type) -> Optional[Formatter]:
+        """
+        Find the formatter of a type.
+        Parameters:
+            cls (type): The type of the logged argument.
+        Returns:
+            Callable or None: The formatter, None if the argument is converted with str().
+        """
+        try:
+            return self._cache[cls]
+        except KeyError:
+            pass
+        formatter = None
+        for base in cls.__mro__:
+            formatter = self._formatters.get(base) or self._formatters.get(f"{base.__module__}.{base.__qualname__}")
+            if formatter is not None:
+                break
+        else:
+            for predicate, candidate in self._predicates:
+                if predicate(cls):
+                    formatter = candidate
+                    break
+        self._cache[cls] = formatter
+        return formatter
+
+    def format(self, obj: Any, **options: Any) -> str:
+        """
+        Convert an argument into text.
+        Parameters:
+            obj (Any): The logged argument.
+            options: Formatting options of the log call.
+        Returns:
+            str: The text.
+        """
+        formatter = self.lookup(type(obj))
+        if formatter is None:
+            return str(obj)
+        return formatter(obj, **options)
+
+
+class _BoundedRepr(reprlib.Repr):
+    """reprlib.Repr that renders byte strings and NumPy arrays with the bounded formatters instead of their full repr."""
+    def repr_bytes(self, obj: bytes, level: int) -> str:
+        return format_bytes(obj, max_bytes=self.maxstring)
+
+    repr_bytearray = repr_bytes
+
+    def repr_ndarray(self, obj: Any, level: int) -> str:
+        return format_ndarray(obj, max_items=self.maxlist)
+
+
+def format_float(value: float, **options: Any) -> str:
+    return "{:.6f}".format(value).rstrip('0')
+
+
+def format_dict(data: dict, max_rows: int = 10, max_colwidth: int = 35, **options: Any) -> str:
+    return DICT_SEPARATOR + summarizer.render_dict(data, max_rows, max_colwidth) + DICT_SEPARATOR
+
+
+def format_sequence(items: Union[list, tuple], **options: Any) -> str:
+    # Subclasses with their own repr, e.g. named tuples, keep it
+    if type(items).__repr__ not in (list.__repr__, tuple.__repr__):
+        return str(items)
+    return summarizer.render_sequence(items)
+
+
+def format_frame(df: Any, max_rows: int = 10, max_cols: int = 10, max_colwidth: int = 35, **options: Any) -> str:
+    return FRAME_SEPARATOR + summarizer.render_frame(df, max_rows, max_cols, max_colwidth) + FRAME_SEPARATOR
+
+
+def format_series(series: Any, max_rows: int = 10, max_colwidth: int = 35, **options: Any) -> str:
+    """Render a Series like its repr, showing at most max_rows values."""
+    pandas = sys.modules["pandas"]
+    with pandas.option_context("display.max_colwidth", max_colwidth):
+        return series.to_string(max_rows=max_rows, min_rows=max_rows, length=len(series) > max_rows, name=True, dtype=True)
+
+
+def format_ndarray(array: Any, max_items: int = 100, **options: Any) -> str:
+    """Render an array like str(), summarizing arrays of more than max_items elements with their shape and dtype."""
+    numpy = sys.modules["numpy"]
+    if array.size <= max_items:
+        return str(array)
+    return numpy.array2string(array, threshold=max_items, edgeitems=3) + f" (shape={array.shape}, dtype={array.dtype})"
+
+
+def format_bytes(data: Union[bytes, bytearray], max_bytes: int = 64, **options: Any) -> str:
+    """Render a byte string like repr(), showing only its first max_bytes bytes."""
+    if len(data) <= max_bytes:
+        return repr(data)
+    return f"{bytes(data[:max_bytes])!r}... ({len(data)} bytes)"
+
+
+def is_dataclass_type(cls: Type) -> bool:
+    """Dataclasses rendered by their generated repr, i.e. without a custom __repr__ or __str__."""
+    # The generated __repr__ is wrapped against recursion
+    return dataclasses.is_dataclass(cls) and cls.__str__ is object.__str__ and hasattr(cls.__repr__, "__wrapped__")
+
+
+def format_dataclass(obj: Any, max_items: int = 100, max_colwidth: int = 35, **options: Any) -> str:
+    """Render a dataclass like its generated repr, each field value being rendered with a bounded repr."""
+    bounded = _BoundedRepr()
+    bounded.maxstring = bounded.maxother = max_colwidth
+    bounded.maxlist = bounded.maxtuple = bounded.maxset = bounded.maxdict = min(max_items, 10)
+    fields = [field for field in dataclasses.fields(obj) if field.repr]
+    parts = [f"{field.name}={bounded.repr(getattr(obj, field.name))}" for field in fields[:max_items]]
+    if len(fields) > max_items:
+        parts.append("...")
+    return f"{type(obj).__qualname__}({', '.join(parts)})"
+
+
+formatter_registry = FormatterRegistry()
+formatter_registry.register(float, format_float)
+formatter_registry.register(dict, format_dict)
+formatter_registry.register(list, format_sequence)
+formatter_registry.register(tuple, format_sequence)
+formatter_registry.register(bytes, format_bytes)
+formatter_registry.register(bytearray, format_bytes)
+# pandas 3 sets the __module__ of its public classes to "pandas", earlier versions to their defining module
+formatter_registry.register("pandas.DataFrame", format_frame)
+formatter_registry.register("pandas.Series", format_series)
+formatter_registry.register("pandas.core.frame.DataFrame", format_frame)
+formatter_registry.register("pandas.core.series.Series", format_series)
+formatter_registry.register("numpy.ndarray", format_ndarray)
+formatter_registry.register_predicate(is_dataclass_type, format_dataclass)
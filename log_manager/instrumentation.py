@@ -0,0 +1,12 @@
+class InstrumentationSwitch:
+    """
+    Process-wide switch of the get_log wrappers. While it is off, decorated functions call the wrapped function directly:
+    no call messages, profiling, print capture nor error logging; only the `log` keyword argument is still injected.
+    """
+    __slots__ = ['enabled']
+
+    def __init__(self) -> None:
+        self.enabled = True
+
+
+instrumentation = InstrumentationSwitch()
@@ -0,0 +1,49 @@
+import time
+from typing import Optional
+
+
+class IterationTimer:
+    """
+    Timing of the iteration of a generator or async generator.
+    The time between resuming the generator and its next suspension is counted as spent inside the generator,
+    the rest of the iteration as spent in the consumer.
+    """
+    __slots__ = ['items', 'inside', 'started', 'first_item', '_resumed']
+
+    def __init__(self) -> None:
+        self.items = 0
+        self.inside = 0.0
+        self.started: Optional[float] = None
+        self.first_item: Optional[float] = None
+        self._resumed = 0.0
+
+    def resume(self) -> None:
+        """Mark the generator being resumed."""
+        self._resumed = time.perf_counter()
+        if self.started is None:
+            self.started = self._resumed
+
+    def suspend(self, produced: bool) -> None:
+        """
+        Mark the generator being suspended.
+        Parameters:
+            produced (bool): Whether the generator yielded an item, as opposed to returning or raising.
+        """
+        now = time.perf_counter()
+        self.inside += now - self._resumed
+        if produced:
+            self.items += 1
+            if self.first_item is None:
+                self.first_item = now - self.started
+
+    @property
+    def total(self) -> float:
+        """Seconds from the first resumption until now."""
+        return 0.0 if self.started is None else time.perf_counter() - self.started
+
+    def format(self, name: str) -> str:
+        """Format the iteration stats as a log line."""
+        total = self.total
+        first_item = "no item" if self.first_item is None else f"first item after {self.first_item:.4f} sec"
+        return (f"Iteration: ** {name} ** yielded {self.items} items, {first_item}, total {total:.4f} sec, "
+                f"inside generator {self.inside:.4f} sec, in consumer {max(0.0, total - self.inside):.4f} sec")
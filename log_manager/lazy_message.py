@@ -0,0 +1,37 @@
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class LazyLogMessage:
+    """
+    Deferred log message that formats its arguments only when it is converted to a string.
+    logging calls str() on the record message when a handler emits it, so disabled or filtered records never pay for formatting.
+    """
+    __slots__ = ['_formatter', '_args', '_kwargs', '_text']
+
+    def __init__(self, formatter: Callable[..., str], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> None:
+        """
+        Initialize the deferred message.
+        Parameters:
+            formatter (Callable): Function turning the arguments into the log string, e.g. LogManager.get_log_string.
+            args (tuple): Arguments to be logged.
+            kwargs (dict): Keyword arguments controlling the formatting.
+        """
+        self._formatter = formatter
+        self._args = args
+        self._kwargs = kwargs
+        self._text: Optional[str] = None
+
+    @property
+    def formatted(self) -> bool:
+        """Whether the message has already been rendered."""
+        return self._text is not None
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = self._formatter(*self._args, **self._kwargs)
+            self._args = ()
+            self._kwargs = {}
+        return self._text
+
+    def __repr__(self) -> str:
+        return f"LazyLogMessage(formatted={self.formatted})"
@@ -0,0 +1,118 @@
+import atexit
+import io
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from .profile_stats import function_names
+
+
+class AccumulatingLineProfiler:
+    """
+    One LineProfiler per decorated function that accumulates line timings across calls and threads.
+    Tracing is enabled per thread on the outermost call and disabled when that thread leaves its last profiled call.
+    """
+    def __init__(self, func: Callable, emit: Callable[[str], None], interval: Optional[float] = None) -> None:
+        """
+        Initialize the profiler.
+        Parameters:
+            func (Callable): The function to profile.
+            emit (Callable): Function writing the formatted stats, e.g. to the logger.
+            interval (float, optional): Minimum seconds between two automatic emissions, None to emit only on demand and at exit.
+        """
+        from line_profiler import LineProfiler
+        self.profiler = LineProfiler()
+        self.profiler.add_function(func)
+        self.emit_func = emit
+        self.interval = interval
+        self.calls = 0
+        self._calls_since_emit = 0
+        self._last_emit = time.monotonic()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def enable(self) -> None:
+        depth = getattr(self._local, "depth", 0)
+        if depth == 0:
+            self.profiler.enable()
+        self._local.depth = depth + 1
+
+    def disable(self) -> None:
+        depth = self._local.depth - 1
+        self._local.depth = depth
+        if depth == 0:
+            self.profiler.disable()
+            with self._lock:
+                self.calls += 1
+                self._calls_since_emit += 1
+            if self.interval is not None and time.monotonic() - self._last_emit >= self.interval:
+                self.emit()
+
+    def format_stats(self) -> str:
+        """Format the accumulated stats as printed by LineProfiler.print_stats."""
+        stream = io.StringIO()
+        self.profiler.print_stats(stream=stream)
+        return stream.getvalue()
+
+    def emit(self, force: bool = False) -> None:
+        """
+        Write the accumulated stats through the emit function.
+        Parameters:
+            force (bool): Emit even if no call finished since the last emission.
+        """
+        with self._lock:
+            if not force and not self._calls_since_emit:
+                return
+            calls, self._calls_since_emit = self.calls, 0
+            self._last_emit = time.monotonic()
+        self.emit_func(f"LineProfiler Stats ({calls} calls):\n" + self.format_stats())
+
+
+class LineProfileRegistry:
+    """Registry of the accumulating line profilers keyed by logger name, module and function name."""
+    def __init__(self) -> None:
+        self._profilers: Dict[Tuple[str, str, str], AccumulatingLineProfiler] = {}
+        self._lock = threading.Lock()
+
+    def get_profiler(self, logname: str, func: Callable, emit: Callable[[str], None], interval: Optional[float] = None) -> AccumulatingLineProfiler:
+        """
+        Get or create the profiler of a function. New profilers emit their stats at exit.
+        Parameters:
+            logname (str): Name of the logger.
+            func (Callable): The function to profile.
+            emit (Callable): Function writing the formatted stats.
+            interval (float, optional): Minimum seconds between two automatic emissions.
+        Returns:
+            AccumulatingLineProfiler: The profiler of the function.
+        """
+        key = (logname, func.__module__, func.__qualname__)
+        with self._lock:
+            profiler = self._profilers.get(key)
+            if profiler is None:
+                profiler = self._profilers[key] = AccumulatingLineProfiler(func, emit, interval)
+                atexit.register(profiler.emit)
+        return profiler
+
+    def report(self, logname: Optional[str] = None, emit: bool = False) -> Dict[str, Dict[str, str]]:
+        """
+        Format the accumulated stats.
+        Parameters:
+            logname (str, optional): Only report the functions of this logger.
+            emit (bool): Also write the stats through each profiler's emit function.
+        Returns:
+            Dict: {logger name: {function name: formatted stats}}, the function name being prefixed with its module when it is not unique in the logger.
+        """
+        with self._lock:
+            items = sorted(self._profilers.items(), key=lambda item: item[0])
+        names = function_names(key for key, _ in items)
+        report: Dict[str, Dict[str, str]] = {}
+        for key, profiler in items:
+            if logname is not None and key[0] != logname:
+                continue
+            report.setdefault(key[0], {})[names[key]] = profiler.format_stats()
+            if emit:
+                profiler.emit(force=True)
+        return report
+
+
+line_profile_registry = LineProfileRegistry()
@@ -3,31 +3,57 @@ import os
 import types
 import atexit
 import datetime
-import inspect
 import time
-import traceback
-import psutil
-import sys
-import io
-import pandas as pd
-from typing import Optional, Union, Any, Type, Callable, Tuple, Dict
-from line_profiler import LineProfiler
-from functools import wraps, update_wrapper, singledispatch
-from contextlib import redirect_stdout
+import inspect
+import glob
+import re
+import threading
+from typing import TYPE_CHECKING, Optional, Union, Any, Type, Callable, Tuple, Dict, List, Sequence, Awaitable, AsyncGenerator, Generator, ContextManager, Iterator
+from functools import wraps, singledispatch
+from contextlib import nullcontext
 from ..parameter_config import ParameterConfig
-from ..email_manager import EmailAgent
+from .caller_resolver import caller_resolver
+from .lazy_message import LazyLogMessage
+from .async_handler import AsyncFileHandler
+from .call_sampler import CallSampler
+from .profile_stats import profile_registry
+from .resource_sampler import CallMeter, resource_sampler
+from .line_profiling import AccumulatingLineProfiler, line_profile_registry
+from .print_capture import PrintCapture
+from .iteration_timer import IterationTimer
+from .rotation import LogRotator, RotatingFileHandler, SegmentCompressor, rotated_segments
+from .structured import FILE_EXTENSIONS, JsonLinesFormatter, BinaryFileHandler
+from .log_reader import LogReader
+from .multiprocess import COLLECTOR_ENV, RUN_STAMP_ENV, run_stamp, log_collector, CollectorFileHandler, CollectorClientHandler, LockedFileHandler
+from .formatters import formatter_registry
+from .error_registry import ErrorStats, error_registry, format_exception
+from .instrumentation import instrumentation
+from .class_instrumentation import LazyInstrumentedMethod, should_instrument
+from .tracing import Span, tracer
+from .stack_sampler import stack_sampler
+from .memory_profiling import memory_tracker
+from .metrics import metrics_registry
+
+if TYPE_CHECKING:
+    from .cache_manifest import CacheLogManifest
+    from .notifier import NotificationDispatcher
 
 class LogManager:
     """
     LogManager is a singleton class for managing and creating loggers across the application.
     """
     _instance = None
+    _profile_report_path = None
+    _sample_profile_stamp = None
+    _opened_log_paths = set()
     
     def __new__(cls: Type['LogManager']) -> 'LogManager':
         """Create a new LogManager instance or return the existing one."""
         if not cls._instance:
             cls._instance = super(LogManager, cls).__new__(cls)
             cls._instance.config = ParameterConfig()
+            if hasattr(os, "register_at_fork"):
+                os.register_at_fork(after_in_child=cls._instance._after_fork_in_child)
         return cls._instance
         
     def __init__(self) -> None:
@@ -62,73 +88,70 @@ class LogManager:
         Returns:
             str: The formatted log string.
         """
-        modified_args = []
-        for arg in args:
-            if isinstance(arg, pd.DataFrame):
-                # Convert DataFrame to string with added lines
-                spliter="\n--------------------------------------\n"
-                df_str =  spliter + arg.to_string(max_rows=kwargs.get("max_rows", 10), max_cols=kwargs.get("max_cols", 10), max_colwidth=kwargs.get("max_colwidth", 35), show_dimensions=True) + spliter
-                modified_args.append(df_str)
-            elif isinstance(arg, dict):
-                spliter="\n- - - - - - - - - - - - - - - - - - - \n"
-                rows = []
-                for k, v in arg.items():
-                    rows.append({'key': k, 'value': v})
-
-                df_str = spliter + pd.DataFrame(rows).to_string(max_rows=kwargs.get("max_rows", 10), max_cols=kwargs.get("max_cols", 10), max_colwidth=kwargs.get("max_colwidth", 35), show_dimensions=True) + spliter
-                modified_args.append(df_str)
-            elif isinstance(arg, float):
-                modified_args.append("{:.6f}".format(arg).rstrip('0'))
-            else:
-                modified_args.append(str(arg))
+        # Each argument is rendered by the formatter registered for its type, see register_formatter
+        modified_args = [formatter_registry.format(arg, **kwargs) for arg in args]
 
         msg = ' '.join(modified_args)
         return msg
 
-    def cache_log_cleaner(self, cache_log_limit: Optional[int], cache_log_days: Optional[int]) -> None:
+    @staticmethod
+    def register_formatter(cls: Union[Type, str], formatter: Callable[..., str]) -> None:
+        """
+        Register how the arguments of a type and its subclasses are rendered in log messages, replacing any previous formatter.
+        Built-in formatters cover dicts, lists, tuples, floats, bytes, dataclasses, NumPy arrays, pandas DataFrames and Series.
+        Parameters:
+            cls (type or str): The type, or its qualified name "module.QualName" to avoid importing it.
+            formatter (Callable): Called as formatter(obj, **options) with the "_log_" options of the log call without
+                their prefix, e.g. max_rows, max_cols, max_colwidth, max_items or max_bytes, and returning the text.
+        """
+        formatter_registry.register(cls, formatter)
+
+    def cache_log_cleaner(self, cache_log_limit: Optional[int], cache_log_days: Optional[int], cache_log_size_limit: Optional[int] = None,
+                          background: bool = False) -> Union[List[str], threading.Thread]:
         """
-        Clean up old log files based on the given limits for file number and age.
+        Clean up old log files based on the given limits for file number, age and total size.
+        The files are tracked in a manifest inside the cache folder, so that only new files are stat'ed.
         Parameters:
             cache_log_limit (int): Maximum number of log files to retain.
             cache_log_days (int): Maximum age of log files to retain (in days).
+            cache_log_size_limit (int, optional): Maximum total size of the retained log files (in bytes).
+            background (bool): Run the cleanup on a background thread.
+        Returns:
+            List[str] or threading.Thread: The deleted paths, or the cleanup thread if run in the background.
         """
+        manifest = self._cache_manifest()
+        exclude = [handler.baseFilename for logger in self.logger_dict.values() for handler in logger.handlers if hasattr(handler, "baseFilename")]
+        if background:
+            return manifest.clean_in_background(cache_log_limit, cache_log_days, cache_log_size_limit, exclude=exclude)
+        return manifest.clean(cache_log_limit, cache_log_days, cache_log_size_limit, exclude=exclude)
+
+    def _cache_manifest(self) -> 'CacheLogManifest':
+        """Manifest of the cache log folder."""
+        from .cache_manifest import CacheLogManifest
         cache_log_dir = self.config.log_config.cache_log_path
-        
-        # Ensure the log directory exists
-        if not os.path.exists(cache_log_dir):
-            return
-        
-        files = [os.path.join(cache_log_dir, f) for f in os.listdir(cache_log_dir) if os.path.isfile(os.path.join(cache_log_dir, f))]
-        files_to_delete = []
-
-        # If cache_log_limit is set, sort by file name (assuming file names are indicative of their creation or modification sequence) and delete excess files
-        if cache_log_limit is not None:
-            files_sorted_by_name = sorted(files, key=lambda x: os.path.basename(x), reverse=True)
-            files_to_delete = files_sorted_by_name[cache_log_limit:]
-            
-        # If cache_log_days is set, delete files older than the specified number of days
-        if cache_log_days is not None:
-            cutoff_date = datetime.datetime.now() - datetime.timedelta(days=cache_log_days)
-            for file in files:
-                file_mod_time = datetime.datetime.fromtimestamp(os.path.getmtime(file))
-                if file_mod_time < cutoff_date:
-                    files_to_delete.append(file)
-
-        for file in files_to_delete:
-            os.remove(file)
-
-    def create_cache_log(self, cache_log_limit: Optional[int], cache_log_days: Optional[int]) -> None:
-        """
-        Set up cache logging by cleaning old logs and creating a new cache logger.
+        manifest = getattr(self, "_cache_log_manifest", None)
+        if manifest is None or manifest.folder != cache_log_dir:
+            manifest = self._cache_log_manifest = CacheLogManifest(cache_log_dir)
+        return manifest
+
+    def create_cache_log(self, cache_log_limit: Optional[int], cache_log_days: Optional[int], cache_log_size_limit: Optional[int] = None) -> None:
+        """
+        Set up cache logging by creating a new cache logger and cleaning old logs on a background thread.
         Parameters:
             cache_log_limit (int): Maximum number of cache log files to retain.
             cache_log_days (int): Maximum age of cache log files to retain (in days).
+            cache_log_size_limit (int, optional): Maximum total size of the cache log files (in bytes), defaults to the log config setting.
         """
-        self.cache_log_cleaner(cache_log_limit, cache_log_days)
         self.create_logger("__cache", folderpath=self.config.log_config.cache_log_path)
+        for handler in self.logger_dict["__cache"].handlers:
+            if hasattr(handler, "baseFilename"):
+                self._cache_manifest().add(handler.baseFilename)
+        if cache_log_size_limit is None:
+            cache_log_size_limit = self.config.log_config.cache_log_size_limit
+        self.cache_log_cleaner(cache_log_limit, cache_log_days, cache_log_size_limit, background=True)
         
     @setup_check
-    def create_logger(self, logname: str, filename: Optional[str] = None, folderpath: Optional[str] = None, log_level: int = logging.DEBUG, timestamp: bool = True, formart_align: bool = True) -> None:
+    def create_logger(self, logname: str, filename: Optional[str] = None, folderpath: Optional[str] = None, log_level: int = logging.DEBUG, timestamp: bool = True, formart_align: bool = True, async_io: Optional[bool] = None) -> None:
         """
         Create a new logger with specified configurations.
         Parameters:
@@ -138,6 +161,8 @@ class LogManager:
             log_level (int): Logging level.
             timestamp (bool): Whether to append timestamp to filename.
             formart_align (bool): Whether to align the format.
+            async_io (bool, optional): Write records through a background writer thread. Defaults to the log config setting.
+                Ignored in multiprocess mode, where the collector batches the writes.
         Returns:
             None: Logger is configured and stored in the logger dictionary.
         """
@@ -148,18 +173,57 @@ class LogManager:
         else:
             filename = os.path.splitext(filename)[0]
         
-        time_stamp=datetime.datetime.now().strftime("%y%m%d_%H%M%S")
+        log_config = self.config.log_config
+        if log_config.multiprocess == "collector" and not os.environ.get(COLLECTOR_ENV):
+            log_collector.start(self.config.lock_config.lock_folder_path)
+        elif log_config.multiprocess == "lock":
+            os.environ.setdefault(RUN_STAMP_ENV, run_stamp())
+        # Workers started by fork or spawn inherit the collector address and the run timestamp through the environment.
+        # Only processes configured with the same multiprocess mode use them, other child processes keep their own files.
+        collector_address = os.environ.get(COLLECTOR_ENV) if log_config.multiprocess == "collector" and not log_collector.running else None
+        shared = log_collector.running or bool(collector_address) or log_config.multiprocess == "lock"
+
+        time_stamp=run_stamp(inherit=log_config.multiprocess is not None)
+
+        if async_io is None:
+            async_io = log_config.async_io
+        extension = FILE_EXTENSIONS[log_config.log_format]
+        if log_config.log_format == "binary" and (shared or async_io):
+            raise ValueError("The binary log format is only written directly by each process, use log_format=\"jsonl\" with async_io or multiprocess")
 
         if timestamp:
-            filename = f"{filename}_{time_stamp}.log"
-        else:
-            filename = f"{filename}.log"
-        
-        full_log_path = os.path.join(folderpath, filename)
+            filename = f"{filename}_{time_stamp}"
+        full_log_path = os.path.join(folderpath, f"{filename}{extension}")
+        if timestamp and not shared and full_log_path not in self._opened_log_paths and os.path.exists(full_log_path):
+            # Another process started in the same second, keep the files apart
+            full_log_path = os.path.join(folderpath, f"{filename}_{os.getpid()}{extension}")
+        self._opened_log_paths.add(full_log_path)
         os.makedirs(folderpath, exist_ok=True)
         logger = logging.getLogger(logname)
-        handler = logging.FileHandler(full_log_path)
-        if formart_align:
+        rotator = None
+        if log_config.rotate_max_bytes is not None or log_config.rotate_interval is not None:
+            rotator = LogRotator(full_log_path, max_bytes=log_config.rotate_max_bytes, interval=log_config.rotate_interval, backup_count=log_config.rotate_backup_count,
+                                 max_age_days=log_config.rotate_max_age_days, compression=log_config.rotate_compression,
+                                 shared=log_config.multiprocess == "lock" and not log_collector.running and not collector_address)
+        if log_collector.running:
+            handler = CollectorFileHandler(full_log_path, rotator=rotator)
+        elif collector_address:
+            # The collector owns the file and its rotation
+            handler = CollectorClientHandler(full_log_path, collector_address)
+        elif log_config.multiprocess == "lock":
+            handler = LockedFileHandler(full_log_path, self.config.lock_config.lock_folder_path, rotator=rotator)
+        elif async_io:
+            handler = AsyncFileHandler(full_log_path, queue_size=log_config.async_queue_size, flush_interval=log_config.async_flush_interval,
+                                       flush_size=log_config.async_flush_size, overflow_policy=log_config.async_overflow_policy, rotator=rotator)
+        elif log_config.log_format == "binary":
+            handler = BinaryFileHandler(full_log_path, rotator=rotator)
+        elif rotator is not None:
+            handler = RotatingFileHandler(full_log_path, rotator)
+        else:
+            handler = logging.FileHandler(full_log_path)
+        if log_config.log_format != "text":
+            formatter = JsonLinesFormatter()
+        elif formart_align:
             formatter = logging.Formatter('%(asctime)s-%(levelname)-8s-%(caller_func_name)-10s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
         else:
             formatter = logging.Formatter('%(asctime)s-%(levelname)s-%(caller_func_name)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
@@ -174,33 +238,41 @@ class LogManager:
             other_kwargs = {key: value for key, value in kwargs.items() if not key.startswith('_log_') and key!="verbose"}
             return log_kwargs, other_kwargs
     
-        def print_and_log(log_method: Callable, default_verbose: bool = True) -> Callable:
+        def print_and_log(log_method: Callable, level: int, default_verbose: bool = True) -> Callable:
             @wraps(log_method)
             def wrapper(*args: Any, **kwargs: Any) -> Any:
                 log_kwargs, remaining_kwargs = split_kwargs(**kwargs)
-                system_msg=log_kwargs.get("system_msg", None)
-                func_name = inspect.stack()[1].function if system_msg is None else system_msg
-                msg = LogManager.get_log_string(*args, **log_kwargs)
-                log_method(msg, extra={'caller_func_name': func_name}, **remaining_kwargs)
+                # Formatting is deferred until a handler emits the record or the message is printed
+                msg = LazyLogMessage(LogManager.get_log_string, args, log_kwargs)
+                func_name = None
+                if logger.isEnabledFor(level):
+                    system_msg=log_kwargs.get("system_msg", None)
+                    func_name = caller_resolver.resolve() if system_msg is None else system_msg
+                    extra = {'caller_func_name': func_name}
+                    if "metrics" in log_kwargs:
+                        extra['metrics'] = log_kwargs["metrics"]
+                    log_method(msg, extra=extra, **remaining_kwargs)
                 if log_kwargs.get("verbose", default_verbose):
                     print(msg)
                 if log_kwargs.get("notify", False):
-                    # Place holder for email notification/kafka message sending
-                    pass 
-            return wrapper
+                    if func_name is None:
+                        func_name = log_kwargs.get("system_msg") or caller_resolver.resolve()
+                    # Queued for the background notification worker, the log call never waits for the delivery
+                    self._notification_dispatcher().notify(logname, level, func_name, str(msg), signature=log_kwargs.get("notify_signature"))
+            return caller_resolver.register_wrapper(wrapper)
 
         # Decorate existing logger methods
-        logging_methods = ['info', 'debug', 'warning', 'error', 'critical']
-        for method in logging_methods:
-            setattr(logger, f'p{method}', print_and_log(getattr(logger, method), default_verbose=True))
-            setattr(logger, method, print_and_log(getattr(logger, method), default_verbose=False))
+        logging_methods = {'info': logging.INFO, 'debug': logging.DEBUG, 'warning': logging.WARNING, 'error': logging.ERROR, 'critical': logging.CRITICAL}
+        for method, level in logging_methods.items():
+            setattr(logger, f'p{method}', print_and_log(getattr(logger, method), level, default_verbose=True))
+            setattr(logger, method, print_and_log(getattr(logger, method), level, default_verbose=False))
 
         self.logger_dict[logname] = logger
         
         atexit.register(LogManager.close_log, logger, handler) 
     
     @setup_check
-    def get_logger(self, logname: str, filename: Optional[str] = None, folderpath: Optional[str] = None, log_level: int = logging.DEBUG) -> logging.Logger:
+    def get_logger(self, logname: str, filename: Optional[str] = None, folderpath: Optional[str] = None, log_level: int = logging.DEBUG, async_io: Optional[bool] = None) -> logging.Logger:
         """
         Retrieve an existing logger or create a new one if it does not exist.
         Parameters:
@@ -208,15 +280,309 @@ class LogManager:
             filename (str, optional): Name of the log file.
             folderpath (str, optional): Path where the log file will be stored.
             log_level (int): Logging level.
+            async_io (bool, optional): Write records through a background writer thread. Defaults to the log config setting.
         Returns:
             logging.Logger: The requested logger.
         """
         if logname not in self.logger_dict:
-            self.create_logger(logname, filename, folderpath, log_level)
+            self.create_logger(logname, filename, folderpath, log_level, async_io=async_io)
         
         logger = self.logger_dict[logname]
         return logger
 
+    def get_async_stats(self, logname: str) -> Dict[str, Any]:
+        """
+        Get the queue length and dropped-record counters of a logger created with async_io.
+        Parameters:
+            logname (str): Name of the logger.
+        Returns:
+            Dict[str, Any]: Stats with keys "queued", "dropped" and "dropped_by_level", empty if the logger does not write asynchronously.
+        """
+        logger = self.logger_dict.get(logname)
+        if logger is None:
+            return {}
+        for handler in logger.handlers:
+            if isinstance(handler, AsyncFileHandler):
+                return handler.stats
+        return {}
+
+    def profile_report(self, logname: Optional[str] = None) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Get the aggregated profiling statistics of functions decorated with "function" or "aggregate" profiling.
+        Parameters:
+            logname (str, optional): Only report the functions of this logger.
+        Returns:
+            Dict: {logger name: {function name: {"count", "total", "mean", "min", "max", "p50", "p95", "p99"}}}, times in seconds.
+        """
+        return profile_registry.report(logname)
+
+    @setup_check
+    def dump_profile_report(self, path: Optional[str] = None, fmt: Optional[str] = None) -> str:
+        """
+        Write the aggregated profiling statistics to a file.
+        Parameters:
+            path (str, optional): Destination file, defaults to a per-process file in the root log folder.
+            fmt (str, optional): "json" or "csv", defaults to the log config setting.
+        Returns:
+            str: The written path.
+        """
+        fmt = fmt or self.config.log_config.profile_report_format
+        if path is None:
+            if self._profile_report_path is None:
+                time_stamp = datetime.datetime.now().strftime("%y%m%d_%H%M%S")
+                self._profile_report_path = os.path.join(self.config.log_config.root_log_path, f"profile_report_{time_stamp}_{os.getpid()}")
+            path = f"{self._profile_report_path}.{fmt}"
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        return profile_registry.dump(path, fmt)
+
+    def start_profile_reporting(self) -> None:
+        """Dump the profile report at exit, and periodically if profile_report_interval is configured. Only the first call has an effect."""
+        if getattr(self, "_profile_reporting", False):
+            return
+        self._profile_reporting = True
+        atexit.register(self.dump_profile_report)
+        interval = self.config.log_config.profile_report_interval
+        if interval:
+            profile_registry.start_periodic_dump(interval, self.dump_profile_report)
+
+    def line_profile_report(self, logname: Optional[str] = None, emit: bool = False) -> Dict[str, Dict[str, str]]:
+        """
+        Get the line stats accumulated by functions decorated with enable_profiling="line".
+        Parameters:
+            logname (str, optional): Only report the functions of this logger.
+            emit (bool): Also write the stats to the corresponding loggers.
+        Returns:
+            Dict: {logger name: {function name: formatted LineProfiler stats}}.
+        """
+        return line_profile_registry.report(logname, emit=emit)
+
+    def sample_profile_report(self, logname: Optional[str] = None) -> Dict[str, str]:
+        """
+        Get the stacks sampled in the calls of functions decorated with enable_profiling="sample".
+        Parameters:
+            logname (str, optional): Only report the stacks of this logger.
+        Returns:
+            Dict[str, str]: {logger name: collapsed stacks}, one "outer;...;inner count" line per stack, for flamegraph tools.
+        """
+        return stack_sampler.report(logname)
+
+    def dump_sample_profile(self) -> Dict[str, str]:
+        """
+        Write the collapsed-stack report of each logger to sample_profile_<logger>_<time>_<pid>.folded in the log folder, replacing the previous one.
+        Returns:
+            Dict[str, str]: {logger name: written path}.
+        """
+        if self._sample_profile_stamp is None:
+            self._sample_profile_stamp = f"{datetime.datetime.now().strftime('%y%m%d_%H%M%S')}_{os.getpid()}"
+        folder = self.config.log_config.root_log_path
+        os.makedirs(folder, exist_ok=True)
+        paths = {}
+        for logname, stacks in stack_sampler.report().items():
+            path = os.path.join(folder, f"sample_profile_{logname}_{self._sample_profile_stamp}.folded")
+            with open(f"{path}.tmp", "w") as f:
+                f.write(stacks)
+            os.replace(f"{path}.tmp", path)
+            paths[logname] = path
+        return paths
+
+    def start_sample_profiling(self) -> None:
+        """Write the sample profile at exit, and periodically if sample_profile_report_interval is configured. Only the first call has an effect."""
+        if getattr(self, "_sample_profiling", False):
+            return
+        self._sample_profiling = True
+        atexit.register(self.dump_sample_profile)
+        interval = self.config.log_config.sample_profile_report_interval
+        if interval:
+            stack_sampler.start_periodic_dump(interval, self.dump_sample_profile)
+
+    def memory_report(self, logname: Optional[str] = None) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Get the allocation statistics of the functions decorated with enable_profiling="memory".
+        Parameters:
+            logname (str, optional): Only report the functions of this logger.
+        Returns:
+            Dict: {logger name: {function name: {"calls", "peak_max", "peak_mean", "net_mean", "top_sites"}}}, sizes in bytes,
+                top_sites being [{"site": "file:line", "size", "count"}] by decreasing bytes allocated by the calls and still alive when they returned.
+        """
+        return memory_tracker.report(logname)
+
+    def start_memory_reporting(self) -> None:
+        """Log the allocation sites of each function at exit. Only the first call has an effect."""
+        if getattr(self, "_memory_reporting", False):
+            return
+        self._memory_reporting = True
+        atexit.register(self._log_memory_report)
+
+    def _log_memory_report(self) -> None:
+        for logname, functions in memory_tracker.report().items():
+            logger = self.logger_dict.get(logname)
+            if logger is None:
+                continue
+            for func_name, summary in functions.items():
+                if not summary["calls"]:
+                    continue
+                lines = [f"Memory Stats: ** {func_name} ** {summary['calls']} traced calls, peak max {summary['peak_max'] / 2**20:.2f} MB, "
+                         f"peak mean {summary['peak_mean'] / 2**20:.2f} MB, net mean {summary['net_mean'] / 2**20:+.2f} MB"]
+                lines += [f"{site['size'] / 2**10:>12,.1f} KiB {site['count']:>9,} blocks  {site['site']}" for site in summary["top_sites"]]
+                logger.info("\n".join(lines), _log_system_msg="<LOG_MANAGER>")
+
+    @staticmethod
+    def collect_metrics() -> Dict[str, Dict[str, Any]]:
+        """
+        Get the current values of the metrics registry, fed by the decorated functions when the metrics option is set.
+        Returns:
+            Dict: {metric name: {"type", "help", "samples": {labels: value}}}, labels being a tuple of (name, value) pairs, and the
+                value of a histogram series being {"buckets": [(upper bound, cumulative count)], "sum", "count"}.
+        """
+        return metrics_registry.collect()
+
+    @staticmethod
+    def metrics_text() -> str:
+        """Get the current values of the metrics registry in the OpenMetrics text format."""
+        return metrics_registry.exposition()
+
+    def start_metrics_export(self) -> None:
+        """Start the exporters configured by metrics_textfile and metrics_http_port. Only the first call has an effect."""
+        if getattr(self, "_metrics_export", False):
+            return
+        self._metrics_export = True
+        log_config = self.config.log_config
+        if log_config.metrics_textfile:
+            metrics_registry.start_textfile_export(log_config.metrics_textfile, log_config.metrics_export_interval)
+        if log_config.metrics_http_port is not None:
+            metrics_registry.start_http_server(log_config.metrics_http_port)
+
+    def _notification_dispatcher(self) -> 'NotificationDispatcher':
+        """The notification dispatcher, configured with the email credential on first use."""
+        from .notifier import notification_dispatcher
+        if notification_dispatcher.credential is not self.config.email_credential:
+            notification_dispatcher.configure(self.config.email_credential)
+        return notification_dispatcher
+
+    def set_notification_transport(self, transport: Any) -> None:
+        """
+        Deliver the notifications through a custom transport instead of the one of the email credential.
+        Parameters:
+            transport: An object with send(EmailMessage) and close() methods, e.g. an SmtpTransport or FileTransport.
+        """
+        from .notifier import notification_dispatcher
+        notification_dispatcher.configure(self.config.email_credential, transport=transport)
+
+    def flush_notifications(self, timeout: Optional[float] = 10) -> bool:
+        """
+        Send the pending notifications and the digests of the open dedup windows now.
+        Parameters:
+            timeout (float, optional): Maximum time to wait for the delivery, in seconds.
+        Returns:
+            bool: Whether the delivery finished within the timeout.
+        """
+        return self._notification_dispatcher().flush(timeout)
+
+    @staticmethod
+    def disable_instrumentation() -> None:
+        """
+        Switch off the wrappers of all functions and classes decorated with get_log, at runtime and process-wide.
+        Decorated functions then call the wrapped function directly, only injecting the `log` keyword argument:
+        no call messages, profiling, print capture nor error logging until enable_instrumentation() is called.
+        """
+        instrumentation.enabled = False
+
+    @staticmethod
+    def enable_instrumentation() -> None:
+        """Switch the wrappers of decorated functions back on, see disable_instrumentation."""
+        instrumentation.enabled = True
+
+    @property
+    def instrumentation_enabled(self) -> bool:
+        return instrumentation.enabled
+
+    @staticmethod
+    def flush_traces() -> Optional[str]:
+        """
+        Export the spans of enable_profiling="trace" finished so far, also done every trace_flush_interval seconds and at exit.
+        Returns:
+            Optional[str]: Path of the trace file, None if no span was exported yet.
+        """
+        return tracer.flush()
+
+    def error_report(self, logname: Optional[str] = None, top: Optional[int] = 10) -> List[Dict[str, Any]]:
+        """
+        Get the most frequent uncaught errors of decorated functions, grouped by signature (exception type and code locations).
+        Parameters:
+            logname (str, optional): Only report the errors of this logger.
+            top (int, optional): Maximum number of signatures, None for all.
+        Returns:
+            List[Dict]: {"signature", "logger", "type", "location", "message", "count", "first_seen", "last_seen"} by decreasing count.
+        """
+        return error_registry.top(logname, top)
+
+    def start_error_reporting(self) -> None:
+        """Log the error repeats not reported yet at exit. Only the first call has an effect."""
+        if getattr(self, "_error_reporting", False):
+            return
+        self._error_reporting = True
+        atexit.register(error_registry.flush, self._log_error_repeats)
+
+    def _log_error_repeats(self, stats: ErrorStats, count: int) -> None:
+        """Log the number of repeats of an error signature since its last report."""
+        logger = self.logger_dict.get(stats.logger)
+        if logger is not None:
+            logger.error(f"Uncatched Error repeated {count} more time(s) ({stats.count} in total): {stats.error_type} at {stats.location}: {stats.message} [{stats.signature}]",
+                         _log_system_msg="<LOG_MANAGER>")
+
+    def get_resource_samples(self) -> List[Dict[str, float]]:
+        """
+        Get the process-wide samples recorded by the background resource sampler, used by the "process" profiling metric.
+        Returns:
+            List[Dict[str, float]]: Samples with keys "time", "cpu_percent" and "rss" (bytes), oldest first.
+        """
+        return list(resource_sampler.samples)
+
+    def query_logs(self, logname: str, start: Optional[Union[float, datetime.datetime]] = None, end: Optional[Union[float, datetime.datetime]] = None,
+                   level: Optional[Union[int, str]] = None, folderpath: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Read the records of a logger from its structured log files, using their sidecar indexes.
+        Parameters:
+            logname (str): Name of the logger.
+            start (float or datetime, optional): Only records at or after this time.
+            end (float or datetime, optional): Only records before this time.
+            level (int or str, optional): Minimum level, e.g. "ERROR".
+            folderpath (str, optional): Folder of the log files, defaults to the root log folder.
+        Returns:
+            Iterator[Dict[str, Any]]: Records of the "jsonl" and "binary" log files and of their rotated segments, see LogReader.query.
+        """
+        folderpath = folderpath or self.config.log_config.root_log_path
+        extensions = (FILE_EXTENSIONS["jsonl"], FILE_EXTENSIONS["binary"])
+        # <logname>[_<run stamp>[_<pid>]][.<rotation stamp>[_<n>]]<extension>[.gz|.zst], so that e.g. "api" does not match "api_v2"
+        file_name = re.compile(rf"{re.escape(logname)}(_\d{{6}}_\d{{6}}(_\d+)?)?(\.\d{{6}}_\d{{6}}_\d{{6}}(_\d+)?)?"
+                               rf"({'|'.join(map(re.escape, extensions))})({'|'.join(map(re.escape, SegmentCompressor.EXTENSIONS.values()))})?")
+        paths = set()
+        for path in glob.glob(os.path.join(glob.escape(folderpath), f"{glob.escape(logname)}*")):
+            if file_name.fullmatch(os.path.basename(path)):
+                paths.add(os.path.abspath(path))
+        logger = self.logger_dict.get(logname)
+        for handler in logger.handlers if logger is not None else []:
+            if os.path.splitext(getattr(handler, "baseFilename", ""))[1] in extensions:
+                paths.add(handler.baseFilename)
+                paths.update(map(os.path.abspath, rotated_segments(handler.baseFilename)))
+        for path in sorted(paths, key=os.path.getmtime):
+            yield from LogReader(path).query(start=start, end=end, level=level, logger=logname)
+
+    def _after_fork_in_child(self) -> None:
+        """Route the loggers inherited by a forked worker to the collector of the parent process, if one is running."""
+        self._sample_profile_stamp = None  # the sample profile of the child starts from zero, in files of its own
+        collector_address = os.environ.get(COLLECTOR_ENV)
+        if not collector_address or log_collector.running or self.config.log_config.multiprocess != "collector":
+            return
+        for logger in self.logger_dict.values():
+            for handler in list(logger.handlers):
+                if isinstance(handler, (logging.FileHandler, CollectorFileHandler)):
+                    client = CollectorClientHandler(handler.baseFilename, collector_address)
+                    client.setFormatter(handler.formatter)
+                    client.setLevel(handler.level)
+                    logger.addHandler(client)
+                    LogManager.close_log(logger, handler)
+
     @staticmethod
     def close_log(logger: logging.Logger, file_handler: logging.Handler) -> None:
         """
@@ -234,7 +600,10 @@ class LogManager:
         
 
     @setup_check    
-    def get_log(self, logname: str, filename: Optional[str] = None, folderpath: Optional[str] = None, log_level: int = logging.DEBUG, verbose: int = 0, enable_profiling: Optional[str] = "function", print2log: bool = False) -> Callable:
+    def get_log(self, logname: str, filename: Optional[str] = None, folderpath: Optional[str] = None, log_level: int = logging.DEBUG, verbose: int = 0, enable_profiling: Optional[str] = "function", print2log: bool = False, async_io: Optional[bool] = None,
+                sample_rate: Optional[float] = None, sample_every: Optional[int] = None, rate_limit: Optional[float] = None, sample_summary_interval: float = 60.0,
+                profiling_metrics: Optional[Sequence[str]] = None, line_profile_interval: Optional[float] = None,
+                print_buffer_size: int = 8192, include: Optional[Union[str, Sequence[str]]] = None, exclude: Optional[Union[str, Sequence[str]]] = None) -> Callable:
         """
         Get a logger configured for function profiling, error handling, and optional output capture.
         Parameters:
@@ -243,150 +612,610 @@ class LogManager:
             folderpath (str, optional): Path to store log files.
             log_level (int): Log level to use.
             verbose (int): Verbosity level for log output.
-            enable_profiling (str): Profiling type ("function", "line", or None).
-            print2log (bool): If True, print outputs are captured and logged.
+            enable_profiling (str): Profiling type ("function", "aggregate", "line", "trace", or None). "function" and "aggregate" both feed
+                the statistics of profile_report(), "aggregate" without writing per-call lines. "trace" records a span per call, nested
+                under the span of the calling decorated function, exported to a trace file in the log folder (see trace_format).
+                "sample" samples the call stacks of the running decorated calls from a background thread, a low-overhead
+                alternative to "line" whose collapsed-stack reports are written per logger (see sample_profile_report).
+                "memory" traces the allocations of the calls with tracemalloc: peak and net bytes per call, and the top sites of the
+                bytes allocated by the calls and still alive when they return, logged at exit (see memory_report).
+            print2log (bool): If True, print outputs are captured and logged line by line. Capture is per thread and per asyncio task.
+            Coroutine functions, async generator functions and async methods are wrapped natively: profiling covers the awaited work.
+            async_io (bool, optional): Write records through a background writer thread. Defaults to the log config setting.
+            sample_rate (float, optional): Probability that a call writes its "Called"/"Returned" and profiling messages.
+            sample_every (int, optional): Only every Nth call writes its messages.
+            rate_limit (float, optional): Maximum number of calls per second that write their messages.
+            sample_summary_interval (float): Minimum seconds between summaries of the calls that were not logged.
+            Errors are always logged regardless of the sampling settings, and the durations of the calls not logged still feed profile_report().
+            profiling_metrics (Sequence[str], optional): Metrics measured by "function" profiling, a subset of
+                ("wall", "cpu", "rss", "maxrss", "process"). Defaults to ("wall", "cpu", "rss").
+            line_profile_interval (float, optional): With "line" profiling, minimum seconds between two writes of the accumulated
+                line stats. By default they are written only at exit or through line_profile_report(emit=True).
+            print_buffer_size (int): With print2log, maximum number of characters of an unfinished printed line kept before it is logged.
+            include (str or Sequence[str], optional): For classes, fnmatch patterns of the names of the methods to wrap. Defaults to all
+                the methods defined in the class body except dunder methods. Use () to wrap only the methods marked with trackinglog.profile.
+            exclude (str or Sequence[str], optional): For classes, fnmatch patterns of the names of the methods not to wrap.
+            Methods marked with trackinglog.skip are never wrapped, methods marked with trackinglog.profile are always wrapped.
+            Inherited methods are wrapped by the decoration of the class defining them, and each method is wrapped on its first access.
+            With the metrics log config option, functions and coroutine functions also count their calls and uncaught errors and observe
+            their duration in the metrics registry, labelled by logger and function (see collect_metrics and metrics_text).
         Returns:
             Callable: A decorator to apply logging and profiling to functions or methods.
         """
-        logger = self.get_logger(logname, filename=filename, folderpath=folderpath, log_level=log_level)
+        logger = self.get_logger(logname, filename=filename, folderpath=folderpath, log_level=log_level, async_io=async_io)
+        include_patterns = [include] if isinstance(include, str) else include
+        exclude_patterns = [exclude] if isinstance(exclude, str) else (exclude or ())
+        if enable_profiling in ["function", "func", "aggregate"]:
+            self.start_profile_reporting()
+        elif enable_profiling == "trace":
+            log_config = self.config.log_config
+            tracer.configure(log_config.root_log_path, log_config.trace_format, log_config.trace_buffer_size, log_config.trace_flush_interval)
+        elif enable_profiling == "sample":
+            stack_sampler.interval = self.config.log_config.sample_profile_interval
+            self.start_sample_profiling()
+        elif enable_profiling == "memory":
+            memory_tracker.sample_ratio = self.config.log_config.memory_sample_ratio
+            memory_tracker.top_sites = self.config.log_config.memory_top_sites
+            self.start_memory_reporting()
+        meter_calls = self.config.log_config.metrics
+        if meter_calls:
+            self.start_metrics_export()
+        call_meter = CallMeter(profiling_metrics, sample_interval=self.config.log_config.resource_sample_interval) if enable_profiling in ["function", "func"] else None
+
+        def create_sampler(name: str) -> Optional[CallSampler]:
+            """Create the per-function sampler, or None when sampling is not configured."""
+            if sample_rate is None and sample_every is None and rate_limit is None:
+                return None
+            sampler = CallSampler(sample_rate=sample_rate, sample_every=sample_every, rate_limit=rate_limit, summary_interval=sample_summary_interval)
+            atexit.register(log_sampling_summary, name, sampler, True)
+            return sampler
+
+        def log_sampling_summary(name: str, sampler: CallSampler, force: bool = False) -> None:
+            """Log how many calls were not logged since the last summary."""
+            summary = sampler.take_summary(force=force)
+            if summary is not None:
+                suppressed, elapsed = summary
+                logger.info(f"Sampling: ** {name} ** {suppressed} calls not logged in the last {elapsed:.0f} sec", _log_system_msg="<LOG_MANAGER>")
+
+        def create_line_profiler(func: Callable) -> Optional[AccumulatingLineProfiler]:
+            """Get the accumulating line profiler of a function, or None when line profiling is not enabled."""
+            if enable_profiling != "line":
+                return None
+            emit = lambda stats: logger.info(stats, _log_system_msg="<LOG_MANAGER>")
+            return line_profile_registry.get_profiler(logname, func, emit, interval=line_profile_interval)
 
-        def trace_error_msg(self) -> str:
+        def start_profiling(func: Callable, profiling_type: Optional[str]) -> Any:
             """
-            Extracts and formats the traceback of the last exception.
-            Returns:
-                str: A formatted string of the traceback excluding entries that are part of the LogManager itself.
+            Take the starting readings of "function" and "aggregate" profiling, begin the span of "trace" profiling,
+            mark a "sample" profiled call as running, or start tracing the allocations of a "memory" profiled call.
             """
-            traceback_str = traceback.format_exc()
-            lines = traceback_str.split('\n')
-            filtered_lines = [line for i, line in enumerate(lines) if "log_manager" not in line \
-                    and (i == 0 or "log_manager" not in lines[i - 1])]
-            return '\n'.join(filtered_lines)
-        
-        class CapturePrints:
-            """Context manager to capture print statements and optionally redirect them to logs."""
-            def __init__(self) -> None:
-                self._original_stdout = None
-                self._stringio = None
-                self.exception = None
-
-            def __enter__(self) -> io.StringIO:
-                self._original_stdout = sys.stdout  # Keep track of the original stdout
-                self._stringio = io.StringIO()      # Create a StringIO buffer to capture output
-                sys.stdout = self._stringio         # Replace the standard output
-                return self._stringio
-
-            def __exit__(self, exc_type: Optional[Type[BaseException]], exc_value: Optional[BaseException], traceback_info: Optional[Any]) -> Optional[bool]:
-                sys.stdout = self._original_stdout  # Restore the original stdout
-                if exc_type is not None:
-                    # Capture the exception details
-                    self.exception = (exc_type, exc_value, traceback_info)
-                    return False  # Propagate the exception after logging it
+            if profiling_type in ["function", "func"]:
+                return call_meter.start()
+            elif profiling_type == "aggregate":
+                return time.perf_counter()
+            elif profiling_type == "trace":
+                return tracer.begin(logname, func.__qualname__)
+            elif profiling_type == "sample":
+                stack_sampler.enter()
                 return True
-            
-        def manage_profiling(func: Callable, args: tuple, kwargs: dict, profiling_type: Optional[str] = None, print2log: bool = False) -> Any:
+            elif profiling_type == "memory":
+                return memory_tracker.start()
+            return None
+
+        def finish_profiling(func: Callable, profiling_type: Optional[str], start: Any) -> None:
+            """Record and log the results of "function" and "aggregate" profiling."""
+            if profiling_type in ["function", "func"]:
+                measures = call_meter.stop(start)
+                time_taken = measures["wall"]
+                profile_registry.record(logname, func.__qualname__, time_taken, func.__module__)
+                logger.info(f"Time Taken: ** {func.__name__} ** took {time_taken//3600:.0f} hr {time_taken//60:.0f} min {time_taken % 60:.2f} sec", _log_system_msg="<LOG_MANAGER>", _log_metrics=measures)
+                resource_usage = CallMeter.format_usage(measures)
+                if resource_usage is not None:
+                    logger.info(resource_usage, _log_system_msg="<LOG_MANAGER>")
+            elif profiling_type == "aggregate":
+                profile_registry.record(logname, func.__qualname__, time.perf_counter() - start, func.__module__)
+            elif profiling_type == "trace":
+                tracer.end(start)
+            elif profiling_type == "sample":
+                stack_sampler.exit()
+            elif profiling_type == "memory":
+                measures = memory_tracker.stop(start, logname, func.__qualname__, module=func.__module__)
+                if measures is not None:
+                    peak, net = measures
+                    logger.info(f"Memory: ** {func.__name__} ** peak {peak / 2**20:.2f} MB, net {net / 2**20:+.2f} MB", _log_system_msg="<LOG_MANAGER>",
+                                _log_metrics={"peak_bytes": peak, "net_bytes": net})
+
+        def abort_profiling(profiling_type: Optional[str], start: Any) -> None:
+            """Finish the span, the sampling or the allocation tracing of a call that raised, other profiling types only record the calls that returned."""
+            if profiling_type == "trace" and start is not None:
+                tracer.end(start, error=True)
+            elif profiling_type == "sample" and start is not None:
+                stack_sampler.exit()
+            elif profiling_type == "memory":
+                memory_tracker.stop(start, logname, func_name="", record=False)
+
+        def capture_prints(func: Callable) -> ContextManager:
+            """Print capture context for a call, a no-op context unless print2log is set."""
+            if not print2log:
+                return nullcontext()
+            emit = lambda text: logger.info(text, _log_system_msg=func.__name__)
+            return PrintCapture(emit, buffer_size=print_buffer_size, echo=bool(verbose))
+
+        def manage_profiling(func: Callable, args: tuple, kwargs: dict, profiling_type: Optional[str] = None,
+                             line_profiler: Optional[AccumulatingLineProfiler] = None) -> Any:
             """Manage profiling and log capturing based on settings."""
+            start = start_profiling(func, profiling_type)
             if profiling_type == "line":
-                profiler = LineProfiler()
-                profiler.add_function(func)
-                profiler.enable()
-            elif profiling_type in ["function", "func"]:
-                start_time = time.time()
-                process = psutil.Process()
-                cpu_before = process.cpu_percent(interval=None)
-                memory_before = process.memory_info().rss
-            
-            if print2log:
-                with CapturePrints() as captured:
+                line_profiler.enable()
+            elif profiling_type == "trace":
+                token = tracer.activate(start)
+            try:
+                with capture_prints(func):
                     result = func(*args, **kwargs)
-                    captured_print = captured.getvalue()
-                    logger.pinfo(captured_print, verbose=verbose, _log_system_msg=func.__name__)
-            else:
-                result = func(*args, **kwargs)
+            except BaseException:
+                abort_profiling(profiling_type, start)
+                raise
+            finally:
+                if profiling_type == "line":
+                    line_profiler.disable()
+                elif profiling_type == "trace":
+                    tracer.deactivate(token)
+            finish_profiling(func, profiling_type, start)
+            return result
 
+        async def manage_profiling_async(func: Callable, args: tuple, kwargs: dict, profiling_type: Optional[str] = None,
+                                         line_profiler: Optional[AccumulatingLineProfiler] = None) -> Any:
+            """Coroutine version of manage_profiling, the profiling covers the awaited duration."""
+            start = start_profiling(func, profiling_type)
             if profiling_type == "line":
-                profiler.disable()
-                profiling_info = io.StringIO()
-                profiler.print_stats(stream=profiling_info)
-                profiling_info = profiling_info.getvalue()
-                logger.info("LineProfiler Stats:\n"+profiling_info, _log_system_msg="<LOG_MANAGER>")
-
-            elif profiling_type in ["function", "func"]:
-                cpu_after = process.cpu_percent(interval=None)
-                memory_after = process.memory_info().rss
-                end_time = time.time()
-                time_taken = end_time - start_time     
-                logger.info(f"Time Taken: ** {func.__name__} ** took {time_taken//3600:.0f} hr {time_taken//60:.0f} min {time_taken % 60:.2f} sec", _log_system_msg="<LOG_MANAGER>")
-                logger.info(f"Resource usage: CPU {cpu_after - cpu_before}%, Memory {((memory_after - memory_before) / (1024 * 1024)):.2f} MB", _log_system_msg="<LOG_MANAGER>")
+                line_profiler.enable()
+            elif profiling_type == "trace":
+                token = tracer.activate(start)
+            try:
+                with capture_prints(func):
+                    result = await func(*args, **kwargs)
+            except BaseException:
+                abort_profiling(profiling_type, start)
+                raise
+            finally:
+                if profiling_type == "line":
+                    line_profiler.disable()
+                elif profiling_type == "trace":
+                    tracer.deactivate(token)
+            finish_profiling(func, profiling_type, start)
             return result
 
-        @singledispatch
-        def decorator(obj: Any) -> Callable:
-            raise NotImplementedError("Unsupported type")
+        def profile_step(func: Callable, step: Callable, value: Any, timer: IterationTimer, profiling_type: Optional[str] = None,
+                         line_profiler: Optional[AccumulatingLineProfiler] = None, span: Optional[Span] = None) -> Any:
+            """Run one step of a generator with timing, line profiling, print capture and the span active only inside the generator."""
+            if profiling_type == "line":
+                line_profiler.enable()
+            elif profiling_type == "trace":
+                token = tracer.activate(span)
+            timer.resume()
+            produced = False
+            try:
+                with capture_prints(func):
+                    item = step(value)
+                produced = True
+                return item
+            finally:
+                timer.suspend(produced)
+                if profiling_type == "line":
+                    line_profiler.disable()
+                elif profiling_type == "trace":
+                    tracer.deactivate(token)
 
-        @decorator.register
-        def _(cls: type) -> type:
-            original_init = cls.__init__
+        async def profile_async_step(func: Callable, awaitable: Awaitable, timer: IterationTimer, profiling_type: Optional[str] = None,
+                                     line_profiler: Optional[AccumulatingLineProfiler] = None, span: Optional[Span] = None) -> Any:
+            """Await one step of an async generator with timing, line profiling, print capture and the span active only inside the generator."""
+            if profiling_type == "line":
+                line_profiler.enable()
+            elif profiling_type == "trace":
+                token = tracer.activate(span)
+            timer.resume()
+            produced = False
+            try:
+                with capture_prints(func):
+                    item = await awaitable
+                produced = True
+                return item
+            finally:
+                timer.suspend(produced)
+                if profiling_type == "line":
+                    line_profiler.disable()
+                elif profiling_type == "trace":
+                    tracer.deactivate(token)
 
-            @wraps(cls.__init__)
-            def wrapped_init(self, *args: Any, **kwargs: Any) -> None:
-                original_init(self, *args, **kwargs)
-                self.log = logger
-            
-            update_wrapper(wrapped_init, original_init)
-            cls.__init__ = wrapped_init
+        def finish_iteration(func: Callable, profiling_type: Optional[str], start: Any, timer: IterationTimer) -> None:
+            """Record the profiling of a finished generator and log its iteration stats."""
+            finish_profiling(func, profiling_type, start)
+            if profiling_type in ["function", "func"]:
+                logger.info(timer.format(func.__name__), _log_system_msg="<LOG_MANAGER>")
 
+        def on_call(sampler: Optional[CallSampler], called_msg: str) -> bool:
+            """Decide whether the call is sampled and log its start. Returns whether the call's messages are written."""
+            log_call = sampler is None or sampler.should_log()
+            if verbose and log_call:
+                logger.debug(called_msg, _log_system_msg="<LOG_MANAGER>")
+            return log_call
 
-            def attribute_profile_decorator(func: Callable, profiling_type: Optional[str], print2log: bool) -> Callable:
-                """Decorator that adds log method calls and adds profiling to functions."""
+        def call_profiling(log_call: bool) -> Optional[str]:
+            """Profiling type of a call. Calls whose messages are not written still feed the statistics of profile_report()."""
+            if log_call:
+                return enable_profiling
+            return "aggregate" if enable_profiling in ["function", "func", "aggregate"] else None
+
+        def on_return(sampler: Optional[CallSampler], name: str, returned_msg: str, log_call: bool) -> None:
+            if verbose and log_call:
+                logger.debug(returned_msg, _log_system_msg="<LOG_MANAGER>")
+            if sampler is not None:
+                log_sampling_summary(name, sampler)
+
+        def on_error(e: Exception) -> None:
+            """Log the traceback of the first occurrence of an error signature, and the repeats as counts at intervals."""
+            stats, report = error_registry.record(logname, e, self.config.log_config.error_repeat_interval)
+            if report == "first":
+                self.start_error_reporting()
+                logger.error(f"Uncatched Error: {e} [{stats.signature}]", _log_system_msg="<LOG_MANAGER>")
+                logger.error(format_exception(e), _log_system_msg="<LOG_MANAGER>")
+            elif report == "repeat":
+                self._log_error_repeats(stats, error_registry.take_unreported(stats))
+
+        def meter(func: Callable, wrapper: Callable) -> Callable:
+            """Count the calls and uncaught errors of a wrapped function and observe their duration in the metrics registry."""
+            labels = {"logger": logname, "function": func.__qualname__}
+            calls = metrics_registry.counter("trackinglog_calls", "Calls of the functions decorated with get_log.", labels)
+            errors = metrics_registry.counter("trackinglog_errors", "Uncaught errors raised by the functions decorated with get_log.", labels)
+            duration = metrics_registry.histogram("trackinglog_call_duration_seconds", "Wall time of the calls of the functions decorated with get_log.", labels)
+            switch = instrumentation
+
+            if inspect.iscoroutinefunction(func):
+                @wraps(func)
+                async def metered(*args: Any, **kwargs: Any) -> Any:
+                    if not switch.enabled:
+                        return await wrapper(*args, **kwargs)
+                    start = time.perf_counter()
+                    try:
+                        return await wrapper(*args, **kwargs)
+                    except Exception:
+                        errors.inc()
+                        raise
+                    finally:
+                        duration.observe(time.perf_counter() - start)
+                        calls.inc()
+            else:
+                @wraps(func)
+                def metered(*args: Any, **kwargs: Any) -> Any:
+                    if not switch.enabled:
+                        return wrapper(*args, **kwargs)
+                    start = time.perf_counter()
+                    try:
+                        return wrapper(*args, **kwargs)
+                    except Exception:
+                        errors.inc()
+                        raise
+                    finally:
+                        duration.observe(time.perf_counter() - start)
+                        calls.inc()
+            return metered
+
+        def instrument(func: Callable, name: str, called_msg: str, returned_msg: str, inject_log: bool) -> Callable:
+            """
+            Wrap a function, generator function, coroutine function or async generator function with call logging, profiling and error handling.
+            Generators are profiled over their whole iteration, from the first item requested until exhaustion or close.
+            Functions and coroutine functions get a wrapper specialized for the options when they are decorated: without verbosity,
+            sampling and print capture, the wrapper only does the configured profiling ("plain", "aggregate" or "timed" variants),
+            otherwise every call goes through the complete ("general") path.
+            Parameters:
+                func (Callable): The function to wrap.
+                name (str): Name used in sampling summaries.
+                called_msg (str): Message logged when the call starts.
+                returned_msg (str): Message logged when the call returns.
+                inject_log (bool): Pass the logger as the `log` keyword argument.
+            Returns:
+                Callable: The wrapper, of the same kind as func.
+            """
+            sampler = create_sampler(name)
+            line_profiler = create_line_profiler(func)
+            if enable_profiling == "sample":
+                stack_sampler.register(logname, func)
+            switch = instrumentation
+            if verbose or print2log or sampler is not None or enable_profiling == "line":
+                variant = "general"
+            elif enable_profiling is None:
+                variant = "plain"
+            elif enable_profiling == "aggregate":
+                variant = "aggregate"
+            elif enable_profiling == "trace":
+                variant = "traced"
+            elif enable_profiling == "sample":
+                variant = "sampled"
+            elif enable_profiling in ["function", "func"]:
+                variant = "timed"
+            else:
+                variant = "general"
+            qualname = func.__qualname__
+            module = func.__module__
+
+            if inspect.isgeneratorfunction(func):
+                variant = "general"
+
+                @wraps(func)
+                def wrapper(*args: Any, **kwargs: Any) -> Generator:
+                    if inject_log:
+                        kwargs['log'] = logger
+                    if not switch.enabled:
+                        return (yield from func(*args, **kwargs))
+                    log_call = on_call(sampler, called_msg)
+                    profiling_type = call_profiling(log_call)
+                    start = None
+                    try:
+                        gen = func(*args, **kwargs)
+                        timer = IterationTimer()
+                        start = start_profiling(func, profiling_type)
+                        step, value = gen.send, None
+                        while True:
+                            try:
+                                item = profile_step(func, step, value, timer, profiling_type, line_profiler, start)
+                            except StopIteration as stop:
+                                _result = stop.value
+                                break
+                            try:
+                                value = yield item
+                            except GeneratorExit:
+                                gen.close()
+                                _result = None
+                                break
+                            except BaseException as exc:
+                                step, value = gen.throw, exc
+                            else:
+                                step = gen.send
+                        finish_iteration(func, profiling_type, start, timer)
+                    except Exception as e:
+                        abort_profiling(profiling_type, start)
+                        on_error(e)
+                        raise
+                    on_return(sampler, name, returned_msg, log_call)
+                    return _result
+
+            elif inspect.isasyncgenfunction(func):
+                variant = "general"
+
+                @wraps(func)
+                async def wrapper(*args: Any, **kwargs: Any) -> AsyncGenerator:
+                    if inject_log:
+                        kwargs['log'] = logger
+                    if not switch.enabled:
+                        # There is no "yield from" for async generators, the values sent and the exceptions thrown are forwarded by hand
+                        agen = func(*args, **kwargs)
+                        pending = agen.asend(None)
+                        while True:
+                            try:
+                                item = await pending
+                            except StopAsyncIteration:
+                                return
+                            try:
+                                sent = yield item
+                            except GeneratorExit:
+                                await agen.aclose()
+                                return
+                            except BaseException as exc:
+                                pending = agen.athrow(exc)
+                            else:
+                                pending = agen.asend(sent)
+                    log_call = on_call(sampler, called_msg)
+                    profiling_type = call_profiling(log_call)
+                    start = None
+                    try:
+                        agen = func(*args, **kwargs)
+                        timer = IterationTimer()
+                        start = start_profiling(func, profiling_type)
+                        pending = agen.asend(None)
+                        while True:
+                            try:
+                                item = await profile_async_step(func, pending, timer, profiling_type, line_profiler, start)
+                            except StopAsyncIteration:
+                                break
+                            try:
+                                sent = yield item
+                            except GeneratorExit:
+                                await agen.aclose()
+                                break
+                            except BaseException as exc:
+                                pending = agen.athrow(exc)
+                            else:
+                                pending = agen.asend(sent)
+                        finish_iteration(func, profiling_type, start, timer)
+                    except Exception as e:
+                        abort_profiling(profiling_type, start)
+                        on_error(e)
+                        raise
+                    on_return(sampler, name, returned_msg, log_call)
+
+            elif inspect.iscoroutinefunction(func):
+                if variant == "plain":
+                    @wraps(func)
+                    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                        if inject_log:
+                            kwargs['log'] = logger
+                        if not switch.enabled:
+                            return await func(*args, **kwargs)
+                        try:
+                            return await func(*args, **kwargs)
+                        except Exception as e:
+                            on_error(e)
+                            raise
+
+                elif variant == "aggregate":
+                    @wraps(func)
+                    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                        if inject_log:
+                            kwargs['log'] = logger
+                        if not switch.enabled:
+                            return await func(*args, **kwargs)
+                        start = time.perf_counter()
+                        try:
+                            _result = await func(*args, **kwargs)
+                        except Exception as e:
+                            on_error(e)
+                            raise
+                        profile_registry.record(logname, qualname, time.perf_counter() - start, module)
+                        return _result
+
+                else:
+                    variant = "general"
+
+                    @wraps(func)
+                    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                        if inject_log:
+                            kwargs['log'] = logger
+                        if not switch.enabled:
+                            return await func(*args, **kwargs)
+                        log_call = on_call(sampler, called_msg)
+                        try:
+                            _result = await manage_profiling_async(func, args, kwargs, profiling_type=call_profiling(log_call), line_profiler=line_profiler)
+                        except Exception as e:
+                            on_error(e)
+                            raise
+                        on_return(sampler, name, returned_msg, log_call)
+                        return _result
+
+            elif variant == "plain":
                 @wraps(func)
                 def wrapper(*args: Any, **kwargs: Any) -> Any:
-                    if verbose:
-                        logger.debug(f"** {cls.__name__}.{func.__name__} ** Called", _log_system_msg="<LOG_MANAGER>")
+                    if inject_log:
+                        kwargs['log'] = logger
+                    if not switch.enabled:
+                        return func(*args, **kwargs)
+                    try:
+                        return func(*args, **kwargs)
+                    except Exception as e:
+                        on_error(e)
+                        raise
 
+            elif variant == "aggregate":
+                @wraps(func)
+                def wrapper(*args: Any, **kwargs: Any) -> Any:
+                    if inject_log:
+                        kwargs['log'] = logger
+                    if not switch.enabled:
+                        return func(*args, **kwargs)
+                    start = time.perf_counter()
                     try:
-                        _result = manage_profiling(func, args, kwargs, profiling_type=profiling_type, print2log=print2log)
+                        _result = func(*args, **kwargs)
                     except Exception as e:
-                        logger.error(f"Uncatched Error: {e}", _log_system_msg="<LOG_MANAGER>")
-                        logger.error(trace_error_msg(), _log_system_msg="<LOG_MANAGER>")
-                        profiler.disable()
-                        del profiler
+                        on_error(e)
                         raise
+                    profile_registry.record(logname, qualname, time.perf_counter() - start, module)
+                    return _result
 
-                    if verbose:
-                            logger.debug(f"** {cls.__name__}.{func.__name__} ** Returned", _log_system_msg="<LOG_MANAGER>")
-    
+            elif variant == "timed":
+                @wraps(func)
+                def wrapper(*args: Any, **kwargs: Any) -> Any:
+                    if inject_log:
+                        kwargs['log'] = logger
+                    if not switch.enabled:
+                        return func(*args, **kwargs)
+                    start = call_meter.start()
+                    try:
+                        _result = func(*args, **kwargs)
+                    except Exception as e:
+                        on_error(e)
+                        raise
+                    finish_profiling(func, enable_profiling, start)
+                    return _result
+
+            elif variant == "traced":
+                @wraps(func)
+                def wrapper(*args: Any, **kwargs: Any) -> Any:
+                    if inject_log:
+                        kwargs['log'] = logger
+                    if not switch.enabled:
+                        return func(*args, **kwargs)
+                    span = tracer.begin(logname, qualname)
+                    token = tracer.activate(span)
+                    try:
+                        return func(*args, **kwargs)
+                    except Exception as e:
+                        span.error = True
+                        on_error(e)
+                        raise
+                    finally:
+                        tracer.deactivate(token)
+                        tracer.end(span)
+
+            elif variant == "sampled":
+                @wraps(func)
+                def wrapper(*args: Any, **kwargs: Any) -> Any:
+                    if inject_log:
+                        kwargs['log'] = logger
+                    if not switch.enabled:
+                        return func(*args, **kwargs)
+                    stack_sampler.enter()
+                    try:
+                        return func(*args, **kwargs)
+                    except Exception as e:
+                        on_error(e)
+                        raise
+                    finally:
+                        stack_sampler.exit()
+
+            else:
+                @wraps(func)
+                def wrapper(*args: Any, **kwargs: Any) -> Any:
+                    if inject_log:
+                        kwargs['log'] = logger
+                    if not switch.enabled:
+                        return func(*args, **kwargs)
+                    log_call = on_call(sampler, called_msg)
+                    try:
+                        _result = manage_profiling(func, args, kwargs, profiling_type=call_profiling(log_call), line_profiler=line_profiler)
+                    except Exception as e:
+                        on_error(e)
+                        raise
+                    on_return(sampler, name, returned_msg, log_call)
                     return _result
-                return wrapper
+            if meter_calls and not (inspect.isgeneratorfunction(func) or inspect.isasyncgenfunction(func)):
+                wrapper = meter(func, wrapper)
+            wrapper._trackinglog_variant = variant
+            return wrapper
 
-            def profile_all_methods(cls: type, profiling_type: Optional[str], print2log: bool) -> None:
-                """Class decorator that applies the `attr_profiler_decorator` decorator to all callable methods of a class."""
-                for attr_name in dir(cls):
-                    attr = getattr(cls, attr_name)
-                    if callable(attr) and not attr_name.startswith("__"):
-                        setattr(cls, attr_name, attribute_profile_decorator(attr, profiling_type, print2log))
+        @singledispatch
+        def decorator(obj: Any) -> Callable:
+            raise NotImplementedError("Unsupported type")
 
-            profile_all_methods(cls, enable_profiling, print2log)
+        @decorator.register
+        def _(cls: type) -> type:
+            if any(isinstance(vars(base).get("log"), types.MemberDescriptorType) for base in cls.__mro__):
+                # "log" is a slot: set it after __init__, wrapping the undecorated __init__ so that subclasses do not stack wrappers
+                original_init = getattr(cls.__init__, "_trackinglog_original_init", cls.__init__)
+
+                @wraps(original_init)
+                def wrapped_init(self, *args: Any, **kwargs: Any) -> None:
+                    original_init(self, *args, **kwargs)
+                    self.log = logger
+
+                wrapped_init._trackinglog_original_init = original_init
+                cls.__init__ = wrapped_init
+            else:
+                cls.log = logger
+
+            def attribute_profile_decorator(func: Callable) -> Callable:
+                """Decorator that adds log method calls and adds profiling to functions."""
+                name = f"{cls.__name__}.{func.__name__}"
+                return instrument(func, name, f"** {name} ** Called", f"** {name} ** Returned", inject_log=False)
+
+            for attr_name, attr in list(vars(cls).items()):
+                func = attr.__func__ if isinstance(attr, (staticmethod, classmethod)) else attr
+                if isinstance(func, types.FunctionType) and should_instrument(attr_name, func, include_patterns, exclude_patterns):
+                    setattr(cls, attr_name, LazyInstrumentedMethod(cls, attr_name, attr, attribute_profile_decorator))
 
             return cls
 
         @decorator.register(types.FunctionType)
         def _(func: Callable) -> Callable:
-            @wraps(func)
-            def wrapper(*args: Any, **kwargs: Any) -> Any:
-                if verbose:
-                    logger.debug(f'Function ** {func.__name__} ** Called', _log_system_msg="<LOG_MANAGER>")
-                try:
-                    kwargs.pop('log', None)
-                    kwargs['log'] = logger
-                    _result = manage_profiling(func, args, kwargs, profiling_type=enable_profiling, print2log=print2log)
-                    if verbose:
-                        logger.debug(f'Function ** {func.__name__} ** Returned.', _log_system_msg="<LOG_MANAGER>")
-                    return _result
-                except Exception as e:
-                    logger.error(f"Uncatched Error: {e}", _log_system_msg="<LOG_MANAGER>")
-                    logger.error(trace_error_msg(), _log_system_msg="<LOG_MANAGER>")
-                    raise
-            return wrapper
+            return instrument(func, func.__name__, f'Function ** {func.__name__} ** Called', f'Function ** {func.__name__} ** Returned.', inject_log=True)
         
         return decorator
     
@@ -0,0 +1,192 @@
+import datetime
+import io
+import json
+import logging
+import math
+import os
+import struct
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from .structured import BINARY_HEADER
+
+TimeBound = Optional[Union[float, datetime.datetime]]
+
+
+class LogReader:
+    """
+    Reader of the structured log files written with log_format "jsonl" or "binary".
+    A sidecar index next to the file records the offset, timestamp and level of every record. It is extended incrementally
+    as the file grows, so queries by time and level only read the matching records. Records written through async_io or the
+    multiprocess collector are not in timestamp order, so the index also records the largest lag of a timestamp behind an earlier
+    one: time-bounded queries bisect the index widened by that lag, then filter the timestamps of the entries in between.
+    Rotated segments compressed with gzip or zstd are read as well, their index offsets being offsets in the decompressed data.
+    """
+    INDEX_HEADER = struct.Struct(">5sQQdd")  # magic, inode and indexed size of the log file, latest timestamp and largest lag behind it
+    INDEX_ENTRY = struct.Struct(">QdB")  # offset, timestamp, level number
+    INDEX_MAGIC = b"TLIX2"
+    INDEX_CHUNK = 4096  # index entries read at once by a query
+    COMPRESSED_EXTENSIONS = {"gzip": ".gz", "zstd": ".zst"}
+
+    def __init__(self, path: str) -> None:
+        """
+        Initialize the reader.
+        Parameters:
+            path (str): Path of a .jsonl or .tlb log file.
+        """
+        self.path = path
+        self.compression = next((name for name, ext in self.COMPRESSED_EXTENSIONS.items() if path.endswith(ext)), None)
+        self.binary = (path[:-len(self.COMPRESSED_EXTENSIONS[self.compression])] if self.compression else path).endswith(".tlb")
+        self.index_path = path + ".idx"
+
+    def update_index(self) -> List[Tuple[int, float, int]]:
+        """
+        Bring the sidecar index up to date with the log file, indexing only the records appended since the last update.
+        Returns:
+            List[Tuple[int, float, int]]: (offset, timestamp, level number) of every complete record.
+        """
+        count, _ = self._refresh_index()
+        with open(self.index_path, "rb") as f:
+            f.seek(self.INDEX_HEADER.size)
+            return list(self.INDEX_ENTRY.iter_unpack(f.read(count * self.INDEX_ENTRY.size)))
+
+    def _refresh_index(self) -> Tuple[int, float]:
+        """Bring the sidecar index up to date with the log file, returning its number of entries and the lag of its timestamps."""
+        stat = os.stat(self.path)
+        count = 0
+        indexed_size = 0
+        latest, lag = -math.inf, 0.0
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "rb") as f:
+                header = f.read(self.INDEX_HEADER.size)
+                if len(header) == self.INDEX_HEADER.size:
+                    magic, inode, size, indexed_latest, indexed_lag = self.INDEX_HEADER.unpack(header)
+                    # A rotated or truncated file is indexed again from the start, a compressed segment is only indexed whole
+                    if magic == self.INDEX_MAGIC and inode == stat.st_ino and (size == stat.st_size if self.compression else size <= stat.st_size):
+                        count = (os.fstat(f.fileno()).st_size - self.INDEX_HEADER.size) // self.INDEX_ENTRY.size
+                        indexed_size = size
+                        latest, lag = indexed_latest, indexed_lag
+        if indexed_size == stat.st_size and os.path.exists(self.index_path):
+            return count, lag
+
+        new_entries, end = self._scan(indexed_size)
+        for _, timestamp, _ in new_entries:
+            if timestamp > latest:
+                latest = timestamp
+            elif latest - timestamp > lag:
+                lag = latest - timestamp
+        if self.compression:
+            # The size recorded for a compressed segment is the size of the compressed file, which never grows
+            end = stat.st_size
+        mode = "r+b" if indexed_size else "wb"
+        with open(self.index_path, mode) as f:
+            f.write(self.INDEX_HEADER.pack(self.INDEX_MAGIC, stat.st_ino, end, latest, lag))
+            f.seek(self.INDEX_HEADER.size + count * self.INDEX_ENTRY.size)
+            f.write(b"".join(self.INDEX_ENTRY.pack(*entry) for entry in new_entries))
+            f.truncate()
+        return count + len(new_entries), lag
+
+    def query(self, start: TimeBound = None, end: TimeBound = None, level: Optional[Union[int, str]] = None,
+              logger: Optional[str] = None, caller: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Read the records matching the filters, in file order.
+        Parameters:
+            start (float or datetime, optional): Only records at or after this time.
+            end (float or datetime, optional): Only records before this time.
+            level (int or str, optional): Minimum level, e.g. "ERROR".
+            logger (str, optional): Only records of this logger.
+            caller (str, optional): Only records of this caller function.
+        Returns:
+            Iterator[Dict[str, Any]]: Records with the fields "timestamp", "time", "level", "logger", "caller", "message" and "metrics" if any.
+        """
+        start = self._to_timestamp(start)
+        end = self._to_timestamp(end)
+        min_level = logging.getLevelName(level.upper()) if isinstance(level, str) else level
+        count, lag = self._refresh_index()
+        with open(self.index_path, "rb") as index, self._open() as f:
+            # Entries before the first one found at or after start - lag are all earlier than start, see _bisect
+            first = 0 if start is None else self._bisect(index, 0, count, start - lag)
+            last = count if end is None else self._bisect(index, first, count, end + lag)
+            index.seek(self.INDEX_HEADER.size + first * self.INDEX_ENTRY.size)
+            for position in range(first, last, self.INDEX_CHUNK):
+                chunk = index.read(min(self.INDEX_CHUNK, last - position) * self.INDEX_ENTRY.size)
+                for offset, timestamp, levelno in self.INDEX_ENTRY.iter_unpack(chunk):
+                    if (min_level is not None and levelno < min_level) or (start is not None and timestamp < start) or \
+                            (end is not None and timestamp >= end):
+                        continue
+                    f.seek(offset)
+                    record = self._read_record(f, timestamp, levelno)
+                    if (logger is not None and record.get("logger") != logger) or (caller is not None and record.get("caller") != caller):
+                        continue
+                    yield record
+
+    def _bisect(self, index: Any, low: int, high: int, timestamp: float) -> int:
+        """
+        Position of the first index entry in [low, high) at or after timestamp, reading only the probed entries.
+        When the timestamps lag at most L behind an earlier one, the entries before the position found for t - L are all earlier
+        than t, and the entries from the position found for t + L are all at or after t, even though the timestamps are not sorted.
+        """
+        while low < high:
+            middle = (low + high) // 2
+            index.seek(self.INDEX_HEADER.size + middle * self.INDEX_ENTRY.size)
+            if self.INDEX_ENTRY.unpack(index.read(self.INDEX_ENTRY.size))[1] < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _open(self) -> Any:
+        """Open the log file for reading, decompressing a compressed segment."""
+        if self.compression == "gzip":
+            import gzip
+            return gzip.open(self.path, "rb")
+        if self.compression == "zstd":
+            try:
+                import zstandard
+            except ImportError:
+                raise ImportError("Reading zstd compressed log segments requires the zstandard package") from None
+            with open(self.path, "rb") as f:
+                # Rotated segments are bounded by rotate_max_bytes, and reading them whole allows seeking back
+                return io.BytesIO(zstandard.ZstdDecompressor().stream_reader(f).read())
+        return open(self.path, "rb")
+
+    def _scan(self, offset: int) -> Tuple[List[Tuple[int, float, int]], int]:
+        """Index the complete records from an offset, returning the entries and the end of the last complete record."""
+        entries: List[Tuple[int, float, int]] = []
+        with self._open() as f:
+            f.seek(offset)
+            if self.binary:
+                while True:
+                    header = f.read(BINARY_HEADER.size)
+                    if len(header) < BINARY_HEADER.size:
+                        break
+                    length, timestamp, levelno = BINARY_HEADER.unpack(header)
+                    if len(f.read(length)) < length:
+                        break
+                    entries.append((offset, timestamp, levelno))
+                    offset += BINARY_HEADER.size + length
+            else:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        fields = json.loads(line)
+                        levelno = logging.getLevelName(fields["level"])
+                        entries.append((offset, fields["timestamp"], levelno if isinstance(levelno, int) else 0))
+                    except (ValueError, KeyError):
+                        pass
+                    offset += len(line)
+        return entries, offset
+
+    def _read_record(self, f: Any, timestamp: float, levelno: int) -> Dict[str, Any]:
+        if not self.binary:
+            return json.loads(f.readline())
+        length = BINARY_HEADER.unpack(f.read(BINARY_HEADER.size))[0]
+        fields = json.loads(f.read(length))
+        return {"timestamp": timestamp, "time": datetime.datetime.fromtimestamp(timestamp).isoformat(timespec="milliseconds"),
+                "level": logging.getLevelName(levelno), **fields}
+
+    @staticmethod
+    def _to_timestamp(value: TimeBound) -> Optional[float]:
+        if isinstance(value, datetime.datetime):
+            return value.timestamp()
+        return value
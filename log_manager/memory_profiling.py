@@ -0,0 +1,198 @@
+import collections
+import fnmatch
+import os
+import random
+import threading
+import tracemalloc
+from typing import Any, Dict, List, Optional, Tuple
+
+from .profile_stats import function_names
+
+# Allocations of the log manager itself and of tracemalloc are not reported as allocation sites
+_TRACE_FILTERS = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, os.path.join(os.path.dirname(os.path.abspath(__file__)), "*"))]
+# Compile the filter patterns now, otherwise the regex cache filled while tracing shows up as allocations of the first traced call
+for _filter in _TRACE_FILTERS:
+    fnmatch.fnmatch(__file__, _filter.filename_pattern)
+
+
+class TracedCall:
+    """A running call traced by the memory tracker. Sizes are tracemalloc traced bytes."""
+    __slots__ = ['start_size', 'peak', 'baseline']
+
+    def __init__(self, start_size: int) -> None:
+        self.start_size = start_size
+        self.peak = start_size
+        # Traced bytes and blocks per site when the call started, None when its allocation sites are not collected
+        self.baseline: Optional[Dict[Tuple[str, int], Tuple[int, int]]] = None
+
+
+class MemoryStats:
+    """Memory statistics of the traced calls of one function, with the bytes allocated per site during its calls and still alive when they returned."""
+    __slots__ = ['calls', 'peak_max', 'peak_total', 'net_total', 'sites']
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.peak_max = 0
+        self.peak_total = 0
+        self.net_total = 0
+        self.sites: Dict[Tuple[str, int], List[int]] = collections.defaultdict(lambda: [0, 0])
+
+    def summary(self, top: int = 10) -> Dict[str, Any]:
+        """Return calls, peak_max, peak_mean and net_mean in bytes, and the top allocation sites by bytes still alive when the calls returned."""
+        if not self.calls:
+            return {"calls": 0}
+        sites = sorted(self.sites.items(), key=lambda item: item[1][0], reverse=True)[:top]
+        return {
+            "calls": self.calls,
+            "peak_max": self.peak_max,
+            "peak_mean": self.peak_total / self.calls,
+            "net_mean": self.net_total / self.calls,
+            "top_sites": [{"site": f"{filename}:{lineno}", "size": size, "count": count} for (filename, lineno), (size, count) in sites],
+        }
+
+
+class MemoryTracker:
+    """
+    tracemalloc sessions shared by the calls of the functions decorated with enable_profiling="memory".
+    Tracing starts with the first traced call and stops after the last one, so nested and concurrent calls share one session.
+    The peak and net bytes of a call only read the traced totals, so their cost does not depend on the size of the heap.
+    The peak of a call is kept exact across nested calls by folding the global peak into every running call before it is reset.
+    When tracemalloc was started by someone else its peak is never reset, and the peak of a call is the larger of its start and end sizes.
+    The allocation sites of a call are the sites of the bytes allocated during the call and still alive when it returns, from a snapshot
+    taken when it returns, diffed against a snapshot taken when it started unless tracing started with the call. Snapshots cost in
+    proportion to the number of live traced blocks, so nested calls of a session holding many allocations are slower to trace.
+    Memory is process-wide: allocations of other threads during a call are counted in it.
+    """
+    def __init__(self, sample_ratio: float = 1.0, top_sites: int = 10) -> None:
+        """
+        Initialize the tracker.
+        Parameters:
+            sample_ratio (float): Fraction of the calls that are traced.
+            top_sites (int): Number of allocation sites reported per function, 0 to not collect them.
+        """
+        self.sample_ratio = sample_ratio
+        self.top_sites = top_sites
+        self._running: List[TracedCall] = []
+        self._owns_tracing = False
+        self._stats: Dict[Tuple[str, str, str], MemoryStats] = {}
+        self._lock = threading.Lock()
+
+    def start(self) -> Optional[TracedCall]:
+        """
+        Start tracing a call, unless it is not sampled.
+        Returns:
+            Optional[TracedCall]: The traced call, None if the call is not traced.
+        """
+        if self.sample_ratio < 1 and random.random() >= self.sample_ratio:
+            return None
+        with self._lock:
+            starts_tracing = not tracemalloc.is_tracing()
+            if starts_tracing:
+                tracemalloc.start()
+                self._owns_tracing = True
+            call = TracedCall(self._fold_peak())
+            self._running.append(call)
+        if self.top_sites:
+            # Nothing is traced yet when tracing starts with the call; the snapshot is taken while the call is running, so tracing cannot stop meanwhile
+            call.baseline = {} if starts_tracing else self._site_sizes()
+        return call
+
+    def stop(self, call: Optional[TracedCall], logname: str, func_name: str, record: bool = True, module: str = "") -> Optional[Tuple[int, int]]:
+        """
+        Stop tracing a call and record it with its allocation sites. The last call of a session stops tracing.
+        Parameters:
+            call (TracedCall, optional): The value returned by start.
+            logname (str): Name of the logger.
+            func_name (str): Qualified name of the function.
+            record (bool): Record the call in the statistics, False for calls that raised.
+            module (str): Module of the function, which tells apart functions with the same qualified name.
+        Returns:
+            Optional[Tuple[int, int]]: Peak and net bytes of the call, None if it was not traced.
+        """
+        if call is None:
+            return None
+        sites = self._site_sizes() if record and call.baseline is not None else None
+        with self._lock:
+            current = self._fold_peak()
+            self._running.remove(call)
+            if not self._running and self._owns_tracing:
+                tracemalloc.stop()
+                self._owns_tracing = False
+        if not record:
+            return None
+        peak, net = call.peak - call.start_size, current - call.start_size
+        stats = self.get_stats(logname, func_name, module)
+        with self._lock:
+            stats.calls += 1
+            stats.peak_max = max(stats.peak_max, peak)
+            stats.peak_total += peak
+            stats.net_total += net
+            if sites is not None:
+                for site, (size, count) in sites.items():
+                    start_size, start_count = call.baseline.get(site, (0, 0))
+                    if size > start_size:
+                        totals = stats.sites[site]
+                        totals[0] += size - start_size
+                        totals[1] += max(count - start_count, 0)
+        return peak, net
+
+    @staticmethod
+    def _site_sizes() -> Optional[Dict[Tuple[str, int], Tuple[int, int]]]:
+        """Traced bytes and blocks per site (file, line), None if tracing was stopped by whoever started it."""
+        try:
+            snapshot = tracemalloc.take_snapshot()
+        except RuntimeError:
+            return None
+        statistics = snapshot.filter_traces(_TRACE_FILTERS).statistics("lineno")
+        return {(statistic.traceback[0].filename, statistic.traceback[0].lineno): (statistic.size, statistic.count) for statistic in statistics}
+
+    def get_stats(self, logname: str, func_name: str, module: str = "") -> MemoryStats:
+        key = (logname, module, func_name)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = MemoryStats()
+        return stats
+
+    def report(self, logname: Optional[str] = None) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Build a report of the traced calls.
+        Parameters:
+            logname (str, optional): Only report the functions of this logger.
+        Returns:
+            Dict: {logger name: {function name: summary}}, the function name being prefixed with its module when it is not unique in the logger.
+        """
+        with self._lock:
+            items = sorted(self._stats.items(), key=lambda item: item[0])
+            names = function_names(key for key, _ in items)
+            report: Dict[str, Dict[str, Dict[str, Any]]] = {}
+            for key, stats in items:
+                if logname is None or key[0] == logname:
+                    report.setdefault(key[0], {})[names[key]] = stats.summary(self.top_sites)
+        return report
+
+    def _fold_peak(self) -> int:
+        """Fold the peak reached since the last reset into the running calls and reset it. Returns the current traced size."""
+        current, peak = tracemalloc.get_traced_memory()
+        if not self._owns_tracing:
+            # The peak of a tracing started by someone else is theirs to reset, and may predate the running calls
+            peak = current
+        for call in self._running:
+            if peak > call.peak:
+                call.peak = peak
+        if self._owns_tracing:
+            tracemalloc.reset_peak()
+        return current
+
+    def _reinit_after_fork(self) -> None:
+        """Forget the calls running in the parent, the child stops the tracing started for them."""
+        self._lock = threading.Lock()
+        self._running = []
+        if self._owns_tracing:
+            tracemalloc.stop()
+            self._owns_tracing = False
+
+
+memory_tracker = MemoryTracker()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=memory_tracker._reinit_after_fork)
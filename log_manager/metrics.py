@@ -0,0 +1,343 @@
+import atexit
+import bisect
+import math
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+Labels = Tuple[Tuple[str, str], ...]
+SeriesKey = Tuple[str, Labels]
+
+
+class _Shard:
+    """Metric values of one thread. Only the owner thread writes into it, collections read copies of its dicts."""
+    __slots__ = ['thread', 'values', 'histograms']
+
+    def __init__(self) -> None:
+        self.thread = threading.current_thread()
+        self.values: Dict[SeriesKey, float] = {}
+        # Per series: one count per bucket, the +Inf bucket count, then the sum of the observed values
+        self.histograms: Dict[SeriesKey, List[float]] = {}
+
+
+class MetricFamily:
+    """Name, type, help text and, for histograms, bucket bounds of a metric."""
+    __slots__ = ['name', 'kind', 'help', 'buckets', 'callbacks']
+
+    def __init__(self, name: str, kind: str, help: str, buckets: Optional[Tuple[float, ...]] = None) -> None:
+        self.name = name
+        self.kind = kind
+        self.help = help
+        self.buckets = buckets
+        self.callbacks: Dict[Labels, Callable[[], float]] = {}
+
+
+class Counter:
+    """A monotonically increasing series, bound to its labels."""
+    __slots__ = ['_registry', '_local', '_key']
+
+    def __init__(self, registry: 'MetricsRegistry', key: SeriesKey) -> None:
+        self._registry = registry
+        self._local = registry._local
+        self._key = key
+
+    def inc(self, value: float = 1.0) -> None:
+        try:
+            values = self._local.shard.values
+        except AttributeError:
+            values = self._registry._shard().values
+        values[self._key] = values.get(self._key, 0.0) + value
+
+
+class Gauge(Counter):
+    """A series that goes up and down, bound to its labels."""
+    __slots__ = []
+
+    def dec(self, value: float = 1.0) -> None:
+        self.inc(-value)
+
+
+class Histogram:
+    """A distribution of observed values in cumulative buckets, bound to its labels."""
+    __slots__ = ['_registry', '_local', '_key', '_bounds']
+
+    def __init__(self, registry: 'MetricsRegistry', key: SeriesKey, bounds: Tuple[float, ...]) -> None:
+        self._registry = registry
+        self._local = registry._local
+        self._key = key
+        self._bounds = bounds
+
+    def observe(self, value: float) -> None:
+        try:
+            histograms = self._local.shard.histograms
+        except AttributeError:
+            histograms = self._registry._shard().histograms
+        counts = histograms.get(self._key)
+        if counts is None:
+            counts = histograms[self._key] = [0.0] * (len(self._bounds) + 2)
+        counts[bisect.bisect_left(self._bounds, value)] += 1
+        counts[-1] += value
+
+
+class MetricsRegistry:
+    """
+    Registry of counters, gauges and histograms with labels.
+    Updates go to a shard owned by the updating thread, so the hot path takes no lock; the shards are summed when the metrics are collected,
+    and the shards of finished threads are folded into one.
+    """
+    def __init__(self) -> None:
+        self._families: Dict[str, MetricFamily] = {}
+        self._shards: List[_Shard] = []
+        self._retired = _Shard()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._export_thread: Optional[threading.Thread] = None
+        self._export_path: Optional[str] = None
+        self._http_server: Any = None
+
+    def counter(self, name: str, help: str, labels: Optional[Dict[str, str]] = None) -> Counter:
+        """
+        Get a counter series.
+        Parameters:
+            name (str): Metric name, exposed with the "_total" suffix.
+            help (str): Description of the metric.
+            labels (Dict[str, str], optional): Label values of the series.
+        Returns:
+            Counter: The series, which can be kept and incremented directly.
+        """
+        return Counter(self, self._series(name, "counter", help, labels))
+
+    def gauge(self, name: str, help: str, labels: Optional[Dict[str, str]] = None) -> Gauge:
+        """Get a gauge series, see counter."""
+        return Gauge(self, self._series(name, "gauge", help, labels))
+
+    def gauge_function(self, name: str, help: str, func: Callable[[], float], labels: Optional[Dict[str, str]] = None) -> None:
+        """
+        Set a gauge series whose value is read from func when the metrics are collected.
+        Parameters:
+            name (str): Metric name.
+            help (str): Description of the metric.
+            func (Callable): Returns the current value.
+            labels (Dict[str, str], optional): Label values of the series.
+        """
+        _, label_items = self._series(name, "gauge", help, labels)
+        self._families[name].callbacks[label_items] = func
+
+    def histogram(self, name: str, help: str, labels: Optional[Dict[str, str]] = None, buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """
+        Get a histogram series.
+        Parameters:
+            name (str): Metric name.
+            help (str): Description of the metric.
+            labels (Dict[str, str], optional): Label values of the series.
+            buckets (Sequence[float]): Upper bounds of the buckets, the +Inf bucket is added. Fixed by the first series of the metric.
+        Returns:
+            Histogram: The series, which can be kept and observed into directly.
+        """
+        key = self._series(name, "histogram", help, labels, tuple(sorted(float(bound) for bound in buckets if bound != math.inf)))
+        return Histogram(self, key, self._families[name].buckets)
+
+    def collect(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Sum the shards into the current values of all the metrics.
+        Returns:
+            Dict: {metric name: {"type", "help", "samples": {labels: value}}}, labels being a tuple of (name, value) pairs,
+                and the value of a histogram series being {"buckets": [(upper bound, cumulative count)], "sum", "count"}.
+        """
+        with self._lock:
+            for shard in [shard for shard in self._shards if not shard.thread.is_alive()]:
+                self._merge(self._retired, shard.values, shard.histograms)
+                self._shards.remove(shard)
+            families = dict(self._families)
+            totals = _Shard()
+            self._merge(totals, self._retired.values, self._retired.histograms)
+            for shard in self._shards:
+                self._merge(totals, shard.values.copy(), shard.histograms.copy())
+        metrics: Dict[str, Dict[str, Any]] = {}
+        for name, family in sorted(families.items()):
+            samples: Dict[Labels, Any] = {}
+            for (series_name, label_items), value in totals.values.items():
+                if series_name == name:
+                    samples[label_items] = value
+            for label_items, func in list(family.callbacks.items()):
+                try:
+                    samples[label_items] = samples.get(label_items, 0.0) + float(func())
+                except Exception as e:
+                    sys.stderr.write(f"--- trackinglog: failed to read the gauge {name}: {e}\n")
+            for (series_name, label_items), counts in totals.histograms.items():
+                if series_name == name:
+                    cumulative, buckets = 0.0, []
+                    for bound, count in zip(family.buckets + (math.inf,), counts):
+                        cumulative += count
+                        buckets.append((bound, cumulative))
+                    samples[label_items] = {"buckets": buckets, "sum": counts[-1], "count": cumulative}
+            metrics[name] = {"type": family.kind, "help": family.help, "samples": dict(sorted(samples.items()))}
+        return metrics
+
+    def exposition(self) -> str:
+        """Format the current values in the OpenMetrics text format."""
+        lines = []
+        for name, metric in self.collect().items():
+            lines.append(f"# TYPE {name} {metric['type']}")
+            lines.append(f"# HELP {name} {_escape(metric['help'])}")
+            for label_items, value in metric["samples"].items():
+                if metric["type"] == "counter":
+                    lines.append(f"{name}_total{_format_labels(label_items)} {_format_value(value)}")
+                elif metric["type"] == "gauge":
+                    lines.append(f"{name}{_format_labels(label_items)} {_format_value(value)}")
+                else:
+                    for bound, count in value["buckets"]:
+                        lines.append(f"{name}_bucket{_format_labels(label_items + (('le', _format_value(bound)),))} {_format_value(count)}")
+                    lines.append(f"{name}_sum{_format_labels(label_items)} {_format_value(value['sum'])}")
+                    lines.append(f"{name}_count{_format_labels(label_items)} {_format_value(value['count'])}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str) -> str:
+        """
+        Write the metrics in the OpenMetrics format, replacing the file atomically, e.g. for the node_exporter textfile collector.
+        Parameters:
+            path (str): Destination file path.
+        Returns:
+            str: The written path.
+        """
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.exposition())
+        os.replace(tmp_path, path)
+        return path
+
+    def start_textfile_export(self, path: str, interval: float) -> None:
+        """
+        Write the metrics to path every interval seconds from a daemon thread, and at exit. Only the first call starts a thread.
+        Parameters:
+            path (str): Destination file path.
+            interval (float): Seconds between two writes.
+        """
+        with self._lock:
+            if self._export_thread is not None:
+                return
+            self._export_path = path
+            self._export_thread = threading.Thread(target=self._export_loop, args=(interval,), name="trackinglog-metrics-export", daemon=True)
+            self._export_thread.start()
+
+    def start_http_server(self, port: int, host: str = "127.0.0.1") -> Any:
+        """
+        Serve the metrics in the OpenMetrics format at http://host:port/metrics from a daemon thread. Only the first call starts a server.
+        Parameters:
+            port (int): Port to listen on, 0 for any free port.
+            host (str): Address to bind, the loopback interface by default.
+        Returns:
+            ThreadingHTTPServer: The server, its server_address gives the bound port.
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.exposition().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        with self._lock:
+            if self._http_server is None:
+                server = ThreadingHTTPServer((host, port), MetricsHandler)
+                server.daemon_threads = True
+                threading.Thread(target=server.serve_forever, name="trackinglog-metrics-http", daemon=True).start()
+                self._http_server = server
+            return self._http_server
+
+    def _series(self, name: str, kind: str, help: str, labels: Optional[Dict[str, str]], buckets: Optional[Tuple[float, ...]] = None) -> SeriesKey:
+        family = self._families.get(name)
+        if family is None:
+            with self._lock:
+                family = self._families.setdefault(name, MetricFamily(name, kind, help, buckets))
+        if family.kind != kind:
+            raise ValueError(f"Metric {name} is already registered as a {family.kind}")
+        return name, tuple(sorted((str(key), str(value)) for key, value in (labels or {}).items()))
+
+    def _shard(self) -> _Shard:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._shards.append(shard)
+            return shard
+
+    @staticmethod
+    def _merge(target: _Shard, values: Dict[SeriesKey, float], histograms: Dict[SeriesKey, List[float]]) -> None:
+        for key, value in values.items():
+            target.values[key] = target.values.get(key, 0.0) + value
+        for key, counts in histograms.items():
+            total = target.histograms.get(key)
+            if total is None:
+                target.histograms[key] = list(counts)
+            else:
+                for index, count in enumerate(list(counts)):
+                    total[index] += count
+
+    def _export_loop(self, interval: float) -> None:
+        while True:
+            time.sleep(interval)
+            self._export_safely()
+
+    def _export_safely(self) -> None:
+        if self._export_path is None:
+            return
+        try:
+            self.write_textfile(self._export_path)
+        except Exception as e:
+            sys.stderr.write(f"--- trackinglog: failed to write the metrics file: {e}\n")
+
+    def _reinit_after_fork(self) -> None:
+        """Start from empty values in a forked child, whose metrics are its own. Exports are started again by the child."""
+        self._lock = threading.Lock()
+        # The series keep a reference to the thread-local shards: drop the shard of the forking thread instead of replacing them
+        self._local.__dict__.clear()
+        self._shards = []
+        self._retired = _Shard()
+        self._export_thread = None
+        self._export_path = None
+        self._http_server = None
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(label_items: Labels) -> str:
+    if not label_items:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in label_items) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+metrics_registry = MetricsRegistry()
+atexit.register(metrics_registry._export_safely)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=metrics_registry._reinit_after_fork)
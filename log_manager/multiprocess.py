@@ -0,0 +1,345 @@
+import atexit
+import datetime
+import logging
+import os
+import queue
+import socket
+import struct
+import sys
+import tempfile
+import threading
+from typing import Dict, List, Optional, TextIO, Tuple
+
+from .rotation import LogRotator, encoded_size, write_rotating
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+COLLECTOR_ENV = "TRACKINGLOG_COLLECTOR"
+RUN_STAMP_ENV = "TRACKINGLOG_RUN_STAMP"
+
+_FRAME_HEADER = struct.Struct(">HI")
+
+
+def encode_frame(path: str, line: str) -> bytes:
+    """Encode a formatted log line and its target file path as a length-prefixed frame."""
+    path_bytes = path.encode("utf-8")
+    line_bytes = line.encode("utf-8")
+    return _FRAME_HEADER.pack(len(path_bytes), len(line_bytes)) + path_bytes + line_bytes
+
+
+def run_stamp(inherit: bool = True) -> str:
+    """
+    Timestamp shared by all the processes of a run, so that workers resolve the same log file names as the collector.
+    Parameters:
+        inherit (bool): Use the run timestamp inherited through the environment, False for processes without a multiprocess mode.
+    Returns:
+        str: The inherited run timestamp, or the current time if there is none or it is not inherited.
+    """
+    return (os.environ.get(RUN_STAMP_ENV) if inherit else None) or datetime.datetime.now().strftime("%y%m%d_%H%M%S")
+
+
+class LogCollector:
+    """
+    Collector owning the log files of every process of a run.
+    Worker processes send formatted lines over a Unix socket, the owning process submits them directly,
+    and a single writer thread appends them in batches to the per-logger files.
+    """
+    def __init__(self, flush_interval: float = 0.2, batch_size: int = 10000) -> None:
+        """
+        Initialize the collector, it only listens once started.
+        Parameters:
+            flush_interval (float): Maximum time in seconds a line waits before being written.
+            batch_size (int): Maximum number of lines written in one batch.
+        """
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.address: Optional[str] = None
+        self.owner_pid: Optional[int] = None
+        self._queue: "queue.SimpleQueue[Optional[Tuple[str, str]]]" = queue.SimpleQueue()
+        self._files: Dict[str, TextIO] = {}
+        self._rotators: Dict[str, LogRotator] = {}
+        self._server: Optional[socket.socket] = None
+        self._writer: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        """Whether the collector runs in the current process. It is not inherited by forked children."""
+        return self.owner_pid == os.getpid()
+
+    def start(self, socket_folder: Optional[str] = None) -> str:
+        """
+        Start listening and export the address to the environment, so that forked and spawned workers connect to it.
+        Parameters:
+            socket_folder (str, optional): Folder of the Unix socket, the temporary folder is used if not set or if the path would be too long.
+        Returns:
+            str: The socket address.
+        """
+        with self._lock:
+            if self.running:
+                return self.address
+            address = os.path.join(socket_folder or tempfile.gettempdir(), f"trackinglog_{os.getpid()}.sock")
+            if len(address) > 100:
+                address = os.path.join(tempfile.gettempdir(), f"trackinglog_{os.getpid()}.sock")
+            os.makedirs(os.path.dirname(address), exist_ok=True)
+            if os.path.exists(address):
+                os.remove(address)
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            server.bind(address)
+            os.chmod(address, 0o600)
+            server.listen()
+            self._server = server
+            self.address = address
+            self.owner_pid = os.getpid()
+            self._queue = queue.SimpleQueue()
+            self._files = {}
+            os.environ[COLLECTOR_ENV] = address
+            os.environ[RUN_STAMP_ENV] = run_stamp()
+            threading.Thread(target=self._accept_loop, args=(server,), name="trackinglog-collector-accept", daemon=True).start()
+            self._writer = threading.Thread(target=self._write_loop, name="trackinglog-collector-writer", daemon=True)
+            self._writer.start()
+            atexit.register(self.close)
+            return address
+
+    def set_rotator(self, path: str, rotator: LogRotator) -> None:
+        """
+        Rotate a collected file according to a policy, applied by the writer thread before each batch.
+        Parameters:
+            path (str): Absolute path of the log file.
+            rotator (LogRotator): The rotation policy.
+        """
+        self._rotators[path] = rotator
+
+    def submit(self, path: str, line: str) -> None:
+        """
+        Queue a formatted line for writing.
+        Parameters:
+            path (str): Absolute path of the log file.
+            line (str): Formatted line, including its terminator.
+        """
+        self._queue.put((path, line))
+
+    def close(self) -> None:
+        """Stop listening, write every queued line and close the files."""
+        with self._lock:
+            if not self.running:
+                return
+            self.owner_pid = None
+            try:
+                self._server.close()
+                os.remove(self.address)
+            except OSError:
+                pass
+            if os.environ.get(COLLECTOR_ENV) == self.address:
+                del os.environ[COLLECTOR_ENV]
+        self._queue.put(None)
+        self._writer.join()
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+
+    def _accept_loop(self, server: socket.socket) -> None:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._read_loop, args=(conn,), name="trackinglog-collector-reader", daemon=True).start()
+
+    def _read_loop(self, conn: socket.socket) -> None:
+        with conn, conn.makefile("rb") as stream:
+            while True:
+                header = stream.read(_FRAME_HEADER.size)
+                if len(header) < _FRAME_HEADER.size:
+                    return
+                path_len, line_len = _FRAME_HEADER.unpack(header)
+                payload = stream.read(path_len + line_len)
+                if len(payload) < path_len + line_len:
+                    return
+                self._queue.put((payload[:path_len].decode("utf-8"), payload[path_len:].decode("utf-8", errors="replace")))
+
+    def _write_loop(self) -> None:
+        closing = False
+        while not closing:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch: List[Tuple[str, str]] = []
+            while True:
+                if item is None:
+                    closing = True
+                else:
+                    batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: List[Tuple[str, str]]) -> None:
+        lines_by_path: Dict[str, List[str]] = {}
+        for path, line in batch:
+            lines_by_path.setdefault(path, []).append(line)
+        for path, lines in lines_by_path.items():
+            try:
+                write_rotating(lines, self._rotators.get(path), lambda data: self._write(path, data), lambda: self._rotate(path))
+            except Exception as e:
+                sys.stderr.write(f"--- trackinglog: collector failed to write {len(lines)} records to {path}: {e}\n")
+
+
+    def _write(self, path: str, data: str) -> None:
+        f = self._files.get(path)
+        if f is None:
+            f = self._files[path] = open(path, "a", encoding="utf-8")
+        f.write(data)
+        f.flush()
+
+    def _rotate(self, path: str) -> None:
+        f = self._files.pop(path, None)
+        if f is not None:
+            f.close()
+        self._rotators[path].rotate()
+
+
+log_collector = LogCollector()
+
+
+class CollectorFileHandler(logging.Handler):
+    """Handler of the collector's own process, submitting formatted lines to the collector without a socket."""
+    def __init__(self, filename: str, collector: LogCollector = log_collector, rotator: Optional[LogRotator] = None) -> None:
+        super().__init__()
+        self.baseFilename = os.path.abspath(filename)
+        self.collector = collector
+        if rotator is not None:
+            collector.set_rotator(self.baseFilename, rotator)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.collector.submit(self.baseFilename, self.format(record) + "\n")
+        except Exception:
+            self.handleError(record)
+
+
+class CollectorClientHandler(logging.Handler):
+    """
+    Handler of worker processes, sending formatted lines to the collector over its Unix socket.
+    If the collector cannot be reached, the line is appended to the file directly.
+    """
+    def __init__(self, filename: str, address: str) -> None:
+        super().__init__()
+        self.baseFilename = os.path.abspath(filename)
+        self.address = address
+        self._sock: Optional[socket.socket] = None
+        self._sock_pid: Optional[int] = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            line = self.format(record) + "\n"
+        except Exception:
+            self.handleError(record)
+            return
+        frame = encode_frame(self.baseFilename, line)
+        for _ in range(2):
+            try:
+                self._connection().sendall(frame)
+                return
+            except OSError:
+                self._disconnect()
+        try:
+            with open(self.baseFilename, "a", encoding="utf-8") as f:
+                f.write(line)
+        except Exception:
+            self.handleError(record)
+
+    def close(self) -> None:
+        self.acquire()
+        try:
+            self._disconnect()
+        finally:
+            self.release()
+        super().close()
+
+    def _connection(self) -> socket.socket:
+        if self._sock is None or self._sock_pid != os.getpid():
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(self.address)
+            self._sock, self._sock_pid = sock, os.getpid()
+        return self._sock
+
+    def _disconnect(self) -> None:
+        if self._sock is not None and self._sock_pid == os.getpid():
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+
+
+class LockedFileHandler(logging.FileHandler):
+    """
+    File handler for several processes sharing one log file without a collector.
+    Each record is written while holding an exclusive lock on a lock file in the lock folder.
+    """
+    def __init__(self, filename: str, lock_folder: str, mode: str = 'a', encoding: Optional[str] = None, rotator: Optional[LogRotator] = None) -> None:
+        """
+        Initialize the handler.
+        Parameters:
+            filename (str): Path of the log file.
+            lock_folder (str): Folder of the lock files.
+            mode (str): File open mode.
+            encoding (str, optional): File encoding.
+            rotator (LogRotator, optional): Rotation policy, applied while holding the lock.
+        """
+        super().__init__(filename, mode=mode, encoding=encoding)
+        self.rotator = rotator
+        os.makedirs(lock_folder, exist_ok=True)
+        self.lock_path = os.path.join(lock_folder, os.path.basename(self.baseFilename) + ".lock")
+        self._lock_file = open(self.lock_path, "a")
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if fcntl is None:
+            return super().emit(record)
+        # lockf locks belong to the process, so they also exclude forked children sharing the descriptor
+        fcntl.lockf(self._lock_file, fcntl.LOCK_EX)
+        try:
+            if self.rotator is None:
+                return super().emit(record)
+            try:
+                line = self.format(record) + self.terminator
+                self._rotate_if_needed(encoded_size(line, self.encoding))
+                if self.stream is None:
+                    self.stream = self._open()
+                self.stream.write(line)
+                self.flush()
+            except Exception:
+                self.handleError(record)
+        finally:
+            fcntl.lockf(self._lock_file, fcntl.LOCK_UN)
+
+    def _rotate_if_needed(self, pending: int) -> None:
+        """Follow a rotation done by another process, then rotate if the shared file is due for pending bytes. Must be called with the lock held."""
+        try:
+            current = os.stat(self.baseFilename)
+        except FileNotFoundError:
+            current = None
+        if self.stream is not None and (current is None or os.fstat(self.stream.fileno()).st_ino != current.st_ino):
+            self.stream.close()
+            self.stream = None
+            self.rotator.reset(0 if current is None else current.st_size)
+        elif current is not None:
+            self.rotator.size = current.st_size
+        if self.rotator.should_rotate(pending):
+            if self.stream is not None:
+                self.stream.close()
+                self.stream = None
+            self.rotator.rotate()
+
+    def close(self) -> None:
+        super().close()
+        self._lock_file.close()
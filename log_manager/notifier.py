@@ -0,0 +1,250 @@
+import atexit
+import collections
+import datetime
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from typing import Any, Deque, Dict, List, Optional
+
+_VOLATILE = re.compile(r"0x[0-9a-fA-F]+|\d+")
+
+
+class Alert:
+    """A notification waiting for delivery."""
+    __slots__ = ['signature', 'logger', 'level', 'caller', 'message', 'created']
+
+    def __init__(self, signature: str, logger: str, level: int, caller: Optional[str], message: str) -> None:
+        self.signature = signature
+        self.logger = logger
+        self.level = level
+        self.caller = caller
+        self.message = message
+        self.created = time.time()
+
+    def headline(self) -> str:
+        first_line = self.message.strip().split("\n", 1)[0]
+        return f"{logging.getLevelName(self.level)} {self.logger}.{self.caller}: {first_line[:120]}"
+
+
+class _Window:
+    """Deduplication window of a signature: alerts after the first one are counted and sampled until the window closes."""
+    __slots__ = ['end', 'suppressed', 'samples', 'last']
+
+    def __init__(self, end: float) -> None:
+        self.end = end
+        self.suppressed = 0
+        self.samples: List[Alert] = []
+        self.last: Optional[Alert] = None
+
+
+class NotificationDispatcher:
+    """
+    Delivers log notifications from a background worker, so that a log call never waits for the network.
+    The first alert of a signature is sent at once; repeats within the dedup window are counted and sent as one digest when the window closes.
+    All alerts ready at the same time are batched into one email. Failed deliveries are retried with exponential backoff.
+    """
+    def __init__(self, queue_size: int = 1000, max_samples: int = 3) -> None:
+        """
+        Initialize the dispatcher. The worker thread is started by the first notification.
+        Parameters:
+            queue_size (int): Maximum number of alerts waiting for the worker, further alerts are dropped and counted.
+            max_samples (int): Number of repeated alerts quoted in a digest.
+        """
+        self.queue_size = queue_size
+        self.max_samples = max_samples
+        self.window = 300.0
+        self.max_retries = 5
+        self.retry_backoff = 1.0
+        self.dropped = 0
+        self.delivered = 0
+        self._credential: Any = None
+        self._agent: Any = None
+        self._transport: Any = None
+        self._queue: Deque[Alert] = collections.deque()
+        self._windows: Dict[str, _Window] = {}
+        self._condition = threading.Condition(threading.Lock())
+        self._worker: Optional[threading.Thread] = None
+        self._closing = False
+        self._flushing = False
+        self._idle = threading.Event()
+        self._idle.set()
+
+    def configure(self, credential: Any, transport: Any = None) -> None:
+        """
+        Set the delivery settings.
+        Parameters:
+            credential (EmailCredential): The email credential, giving the transport, recipients, dedup window and retry policy.
+            transport (optional): A transport object with send(EmailMessage) and close() methods, replacing the credential transport
+                from now on, also after later calls without transport.
+        """
+        with self._condition:
+            agent, self._agent = self._agent, None
+            self._credential = credential
+            if transport is not None:
+                self._transport = transport
+            self.window = credential.notify_window
+            self.max_retries = credential.notify_max_retries
+            self.retry_backoff = credential.notify_retry_backoff
+        # Closing an SMTP agent talks to the server, log calls queueing alerts must not wait for it
+        if agent is not None:
+            agent.close()
+
+    @property
+    def credential(self) -> Any:
+        return self._credential
+
+    def notify(self, logger: str, level: int, caller: Optional[str], message: str, signature: Optional[str] = None) -> None:
+        """
+        Queue an alert without blocking.
+        Parameters:
+            logger (str): Name of the logger.
+            level (int): Level of the log call.
+            caller (str, optional): Name of the calling function.
+            message (str): The log message.
+            signature (str, optional): Deduplication key, defaults to the logger, level, caller and first message line with numbers masked.
+        """
+        if signature is None:
+            first_line = message.strip().split("\n", 1)[0]
+            signature = f"{logger}|{level}|{caller}|{_VOLATILE.sub('#', first_line)}"
+        with self._condition:
+            if len(self._queue) >= self.queue_size:
+                self.dropped += 1
+                return
+            self._queue.append(Alert(signature, logger, level, caller, message))
+            self._idle.clear()
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="trackinglog-notifier", daemon=True)
+                self._worker.start()
+            self._condition.notify()
+
+    def flush(self, timeout: Optional[float] = 10) -> bool:
+        """
+        Deliver the queued alerts and the digests of all open windows now, and wait for the delivery.
+        Parameters:
+            timeout (float, optional): Maximum time to wait in seconds.
+        Returns:
+            bool: Whether everything was delivered (or given up after the retries) within the timeout.
+        """
+        with self._condition:
+            if self._worker is None:
+                return True
+            # The worker closes the windows once it has taken the alerts queued so far, which may open new windows
+            self._flushing = True
+            self._idle.clear()
+            self._condition.notify()
+        return self._idle.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 10) -> None:
+        """Flush the pending alerts and stop the worker."""
+        self.flush(timeout)
+        with self._condition:
+            self._closing = True
+            self._condition.notify()
+            worker = self._worker
+        if worker is not None:
+            worker.join(timeout)
+        if self._agent is not None:
+            self._agent.close()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._queue and not self._closing and not self._flushing and not self._due(time.monotonic()):
+                    if not any(window.suppressed for window in self._windows.values()):
+                        self._idle.set()
+                    deadline = min((window.end for window in self._windows.values()), default=None)
+                    self._condition.wait(None if deadline is None else max(deadline - time.monotonic(), 0.01))
+                alerts = list(self._queue)
+                self._queue.clear()
+                closing = self._closing
+                flushing, self._flushing = self._flushing, False
+            now = time.monotonic()
+            batch: List[str] = []
+            for alert in alerts:
+                window = self._windows.get(alert.signature)
+                if window is not None and window.end > now:
+                    window.suppressed += 1
+                    window.last = alert
+                    if len(window.samples) < self.max_samples:
+                        window.samples.append(alert)
+                    continue
+                if window is not None and window.suppressed:
+                    batch.append(self._digest(alert.signature, window))
+                self._windows[alert.signature] = _Window(now + self.window)
+                batch.append(self._section(alert))
+            for signature, window in list(self._windows.items()):
+                if window.end <= now or closing or flushing:
+                    if window.suppressed:
+                        batch.append(self._digest(signature, window))
+                    del self._windows[signature]
+            if batch:
+                self._deliver(batch, alerts)
+            with self._condition:
+                if not self._queue and not self._flushing and not self._due(time.monotonic()):
+                    if closing:
+                        self._worker = None
+                        self._idle.set()
+                        return
+                    if not any(window.suppressed for window in self._windows.values()):
+                        self._idle.set()
+
+    def _due(self, now: float) -> bool:
+        return any(window.end <= now for window in self._windows.values())
+
+    @staticmethod
+    def _section(alert: Alert) -> str:
+        time_stamp = datetime.datetime.fromtimestamp(alert.created).strftime("%Y-%m-%d %H:%M:%S")
+        section = f"{time_stamp} {alert.headline()}"
+        if "\n" in alert.message.strip() or len(alert.message) > 120:
+            section += f"\n\n{alert.message}"
+        return section
+
+    def _digest(self, signature: str, window: _Window) -> str:
+        lines = [f"Repeated {window.suppressed} more time(s) within {self.window:g}s: {window.last.headline()}"]
+        for sample in window.samples:
+            lines.append(self._section(sample))
+        if window.last is not None and window.last not in window.samples:
+            lines.append(self._section(window.last))
+        return "\n\n".join(lines)
+
+    def _deliver(self, batch: List[str], alerts: List[Alert]) -> None:
+        """Send the batch as one email, retrying with exponential backoff."""
+        if self._credential is None:
+            return
+        subject = f"[trackinglog] {len(batch)} alert(s) from {os.path.basename(sys.argv[0]) or 'python'} (pid {os.getpid()})"
+        body = ("\n\n" + "-" * 70 + "\n\n").join(batch)
+        for attempt in range(self.max_retries + 1):
+            try:
+                if self._agent is None:
+                    from ..email_manager import EmailAgent
+                    self._agent = EmailAgent(self._credential)
+                    if self._transport is not None:
+                        self._agent.transport = self._transport
+                self._agent.send(subject, body)
+                self.delivered += 1
+                return
+            except Exception as e:
+                if attempt == self.max_retries:
+                    sys.stderr.write(f"--- trackinglog: notification delivery failed after {attempt + 1} attempts: {e}\n")
+                    return
+                time.sleep(min(self.retry_backoff * 2 ** attempt, 300))
+
+    def _reinit_after_fork(self) -> None:
+        """Reset the worker state in a forked child. Pending alerts are left to the parent."""
+        self._condition = threading.Condition(threading.Lock())
+        self._queue.clear()
+        self._windows = {}
+        self._worker = None
+        self._agent = None
+        self._flushing = False
+        self._idle = threading.Event()
+        self._idle.set()
+
+
+notification_dispatcher = NotificationDispatcher()
+atexit.register(notification_dispatcher.close)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=notification_dispatcher._reinit_after_fork)
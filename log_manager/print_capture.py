@@ -0,0 +1,109 @@
+import contextvars
+import sys
+import threading
+from typing import Any, Callable, List, Optional, TextIO, Type
+
+_active_capture: contextvars.ContextVar[Optional['PrintCapture']] = contextvars.ContextVar("trackinglog_active_capture", default=None)
+
+
+class StdoutProxy:
+    """
+    Replacement for sys.stdout that routes writes to the PrintCapture active in the current thread or asyncio task,
+    and to the original stream otherwise.
+    """
+    _install_lock = threading.Lock()
+
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+
+    @classmethod
+    def install(cls) -> 'StdoutProxy':
+        """
+        Install the proxy as sys.stdout, unless it already is.
+        Returns:
+            StdoutProxy: The installed proxy.
+        """
+        with cls._install_lock:
+            stdout = sys.stdout
+            if not isinstance(stdout, cls):
+                stdout = sys.stdout = cls(stdout)
+            return stdout
+
+    def write(self, text: str) -> int:
+        capture = _active_capture.get()
+        if capture is None:
+            return self.stream.write(text)
+        return capture.write(text)
+
+    def flush(self) -> None:
+        capture = _active_capture.get()
+        if capture is None:
+            self.stream.flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.stream, name)
+
+
+class PrintCapture:
+    """
+    Context manager capturing the prints of the current thread or asyncio task and streaming them to a log function.
+    Lines are emitted as soon as they are complete, and an unfinished line is emitted once it reaches buffer_size characters,
+    so memory stays bounded for long-running functions.
+    """
+    def __init__(self, emit: Callable[[str], None], buffer_size: int = 8192, echo: bool = False) -> None:
+        """
+        Initialize the capture.
+        Parameters:
+            emit (Callable): Function receiving the captured text, e.g. a logger method.
+            buffer_size (int): Maximum number of characters of an unfinished line kept before it is emitted.
+            echo (bool): Also write the captured text to the original stdout.
+        """
+        self.emit = emit
+        self.buffer_size = buffer_size
+        self.echo = echo
+        self._chunks: List[str] = []
+        self._size = 0
+        self._proxy: Optional[StdoutProxy] = None
+        self._token: Optional[contextvars.Token] = None
+
+    def __enter__(self) -> 'PrintCapture':
+        self._proxy = StdoutProxy.install()
+        self._token = _active_capture.set(self)
+        return self
+
+    def __exit__(self, exc_type: Optional[Type[BaseException]], exc_value: Optional[BaseException], traceback_info: Optional[Any]) -> bool:
+        _active_capture.reset(self._token)
+        self._emit_buffer(final=True)
+        return False
+
+    def write(self, text: str) -> int:
+        if self.echo:
+            self._proxy.stream.write(text)
+        self._chunks.append(text)
+        self._size += len(text)
+        if '\n' in text or self._size >= self.buffer_size:
+            self._emit_buffer()
+        return len(text)
+
+    def _emit_buffer(self, final: bool = False) -> None:
+        """Emit the buffered complete lines, or everything if final or if an unfinished line exceeds the buffer size."""
+        if not self._chunks:
+            return
+        text = ''.join(self._chunks)
+        cut = len(text) if final else text.rfind('\n') + 1
+        if cut == 0:
+            if len(text) < self.buffer_size:
+                return
+            cut = len(text)
+        self._chunks = [text[cut:]] if cut < len(text) else []
+        self._size = len(text) - cut
+        message = text[:cut]
+        if message.endswith('\n'):
+            message = message[:-1]
+        if message:
+            # Writes made while emitting, e.g. by a console handler, go to the original stream
+            token = _active_capture.set(None)
+            try:
+                self.emit(message)
+            finally:
+                _active_capture.reset(token)
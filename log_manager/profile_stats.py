@@ -0,0 +1,215 @@
+import collections
+import csv
+import json
+import math
+import os
+import sys
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+def function_names(keys: Iterable[Tuple[str, str, str]]) -> Dict[Tuple[str, str, str], str]:
+    """
+    Report names of functions keyed by (logger name, module, qualified name): the qualified name, prefixed with the module
+    when another function of the same logger has the same qualified name.
+    """
+    keys = list(keys)
+    counts = collections.Counter((logname, qualname) for logname, _, qualname in keys)
+    return {key: f"{key[1]}.{key[2]}" if counts[(key[0], key[2])] > 1 else key[2] for key in keys}
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram with a fixed relative precision, in the style of an HDR histogram.
+    Memory is bounded by the number of buckets needed to cover the recorded value range.
+    Percentiles are clamped to the smallest and largest recorded values, which the middle of their bucket may lie beyond.
+    """
+    __slots__ = ['precision', 'min_value', '_log_base', '_buckets', 'count', 'min', 'max']
+
+    def __init__(self, precision: float = 0.01, min_value: float = 1e-7) -> None:
+        """
+        Initialize the histogram.
+        Parameters:
+            precision (float): Relative error of the reported percentiles.
+            min_value (float): Smallest distinguishable value, smaller values are recorded in the first bucket.
+        """
+        self.precision = precision
+        self.min_value = min_value
+        self._log_base = math.log1p(precision)
+        self._buckets: Dict[int, int] = {}
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def record(self, value: float) -> None:
+        index = int(math.log(max(value, self.min_value) / self.min_value) / self._log_base)
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Estimate the q-th percentile.
+        Parameters:
+            q (float): Percentile between 0 and 100.
+        Returns:
+            Optional[float]: The estimated value, or None if nothing was recorded.
+        """
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q / 100 * self.count))
+        seen = 0
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            if seen >= rank:
+                return min(max(self.min_value * math.exp((index + 0.5) * self._log_base), self.min), self.max)
+        return None
+
+
+class ProfileStats:
+    """Running statistics of the call durations of one function."""
+    __slots__ = ['count', 'total', 'min', 'max', 'histogram', '_lock']
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.histogram = LatencyHistogram()
+        self._lock = threading.Lock()
+
+    def record(self, elapsed: float) -> None:
+        """
+        Add one call duration.
+        Parameters:
+            elapsed (float): Duration of the call in seconds.
+        """
+        with self._lock:
+            self.count += 1
+            self.total += elapsed
+            if elapsed < self.min:
+                self.min = elapsed
+            if elapsed > self.max:
+                self.max = elapsed
+            self.histogram.record(elapsed)
+
+    def summary(self) -> Dict[str, Any]:
+        """Return count, total, mean, min, max and p50/p95/p99 in seconds."""
+        with self._lock:
+            if not self.count:
+                return {"count": 0}
+            return {
+                "count": self.count,
+                "total": self.total,
+                "mean": self.total / self.count,
+                "min": self.min,
+                "max": self.max,
+                "p50": self.histogram.percentile(50),
+                "p95": self.histogram.percentile(95),
+                "p99": self.histogram.percentile(99),
+            }
+
+
+class ProfileRegistry:
+    """
+    In-memory registry of function profiling statistics keyed by logger name, module and function name.
+    """
+    CSV_FIELDS = ["logger", "function", "count", "total", "mean", "min", "max", "p50", "p95", "p99"]
+
+    def __init__(self) -> None:
+        self._stats: Dict[Tuple[str, str, str], ProfileStats] = {}
+        self._lock = threading.Lock()
+        self._dump_thread: Optional[threading.Thread] = None
+        self._dump_stop = threading.Event()
+
+    def get_stats(self, logname: str, func_name: str, module: str = "") -> ProfileStats:
+        """
+        Get or create the statistics of a function.
+        Parameters:
+            logname (str): Name of the logger.
+            func_name (str): Qualified name of the function.
+            module (str): Module of the function, which tells apart functions with the same qualified name.
+        Returns:
+            ProfileStats: The statistics object, which can be kept and recorded into directly.
+        """
+        key = (logname, module, func_name)
+        stats = self._stats.get(key)
+        if stats is None:
+            with self._lock:
+                stats = self._stats.setdefault(key, ProfileStats())
+        return stats
+
+    def record(self, logname: str, func_name: str, elapsed: float, module: str = "") -> None:
+        self.get_stats(logname, func_name, module).record(elapsed)
+
+    def report(self, logname: Optional[str] = None) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Build a report of the recorded statistics.
+        Parameters:
+            logname (str, optional): Only report the functions of this logger.
+        Returns:
+            Dict: {logger name: {function name: summary}}, the function name being prefixed with its module when it is not unique in the logger.
+        """
+        with self._lock:
+            items = sorted(self._stats.items(), key=lambda item: item[0])
+        names = function_names(key for key, _ in items)
+        report: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for key, stats in items:
+            if logname is not None and key[0] != logname:
+                continue
+            report.setdefault(key[0], {})[names[key]] = stats.summary()
+        return report
+
+    def report_rows(self, logname: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Flatten the report into one row per function, with the keys of CSV_FIELDS."""
+        return [{"logger": stats_logname, "function": func_name, **summary}
+                for stats_logname, functions in self.report(logname).items()
+                for func_name, summary in functions.items()]
+
+    def dump(self, path: str, fmt: str = "json") -> str:
+        """
+        Write the report to a file, replacing it atomically.
+        Parameters:
+            path (str): Destination file path.
+            fmt (str): "json" or "csv".
+        Returns:
+            str: The written path.
+        """
+        if fmt not in ("json", "csv"):
+            raise ValueError(f"Invalid profile report format: {fmt}, expected 'json' or 'csv'")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", newline="") as f:
+            if fmt == "json":
+                json.dump(self.report(), f, indent=2)
+            else:
+                writer = csv.DictWriter(f, fieldnames=self.CSV_FIELDS)
+                writer.writeheader()
+                writer.writerows(self.report_rows())
+        os.replace(tmp_path, path)
+        return path
+
+    def start_periodic_dump(self, interval: float, dump_func: Callable[[], Any]) -> None:
+        """
+        Call dump_func every interval seconds from a daemon thread. Only the first call starts a thread.
+        Parameters:
+            interval (float): Seconds between two dumps.
+            dump_func (Callable): Function writing the report.
+        """
+        with self._lock:
+            if self._dump_thread is not None:
+                return
+            self._dump_thread = threading.Thread(target=self._dump_loop, args=(interval, dump_func), name="trackinglog-profile-report", daemon=True)
+            self._dump_thread.start()
+
+    def _dump_loop(self, interval: float, dump_func: Callable[[], Any]) -> None:
+        while not self._dump_stop.wait(interval):
+            try:
+                dump_func()
+            except Exception as e:
+                sys.stderr.write(f"--- trackinglog: failed to write the profile report: {e}\n")
+
+
+profile_registry = ProfileRegistry()
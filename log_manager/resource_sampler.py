@@ -0,0 +1,175 @@
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import psutil
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+class ResourceSampler:
+    """
+    Process-wide resource sampler holding one cached psutil.Process handle.
+    A background thread can record process CPU and RSS at a fixed interval, so decorated calls only read the latest sample.
+    """
+    def __init__(self, max_samples: int = 3600) -> None:
+        """
+        Initialize the sampler.
+        Parameters:
+            max_samples (int): Number of background samples kept in memory.
+        """
+        self._process: Optional["psutil.Process"] = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.interval: Optional[float] = None
+        self.samples: Deque[Dict[str, float]] = deque(maxlen=max_samples)
+        self.latest: Dict[str, float] = {}
+
+    @property
+    def process(self) -> "psutil.Process":
+        """The cached handle of the current process, refreshed after a fork. psutil is imported on first use."""
+        process = self._process
+        if process is None or process.pid != os.getpid():
+            import psutil
+            process = self._process = psutil.Process()
+        return process
+
+    def rss(self) -> int:
+        """Current resident set size of the process in bytes."""
+        return self.process.memory_info().rss
+
+    def start(self, interval: float = 1.0) -> None:
+        """
+        Start the background sampling thread. Only the first call starts a thread.
+        Parameters:
+            interval (float): Seconds between two samples.
+        """
+        with self._lock:
+            if self._thread is not None:
+                return
+            self.interval = interval
+            self.process.cpu_percent(interval=None)
+            self._thread = threading.Thread(target=self._sample_loop, name="trackinglog-resource-sampler", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def sample(self) -> Dict[str, float]:
+        """Take one process-wide sample of CPU percentage and RSS."""
+        process = self.process
+        with process.oneshot():
+            sample = {"time": time.time(), "cpu_percent": process.cpu_percent(interval=None), "rss": float(process.memory_info().rss)}
+        self.samples.append(sample)
+        self.latest = sample
+        return sample
+
+    def _sample_loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                sys.stderr.write(f"--- trackinglog: resource sampling failed: {e}\n")
+                return
+
+
+resource_sampler = ResourceSampler()
+
+
+class CallMeter:
+    """
+    Measures the resource usage of a single call for a chosen set of metrics.
+    Metrics:
+        "wall": elapsed time from time.perf_counter_ns.
+        "cpu": CPU time of the calling thread from time.thread_time_ns.
+        "rss": RSS change through the cached process handle.
+        "maxrss": growth of the peak RSS from resource.getrusage, a single syscall without psutil.
+        "process": latest process-wide CPU and RSS sample of the background sampler, no per-call syscalls.
+    """
+    METRICS = ("wall", "cpu", "rss", "maxrss", "process")
+    DEFAULT_METRICS = ("wall", "cpu", "rss")
+
+    def __init__(self, metrics: Optional[Iterable[str]] = None, sampler: ResourceSampler = resource_sampler, sample_interval: float = 1.0) -> None:
+        """
+        Initialize the meter.
+        Parameters:
+            metrics (Iterable[str], optional): Metrics to measure, defaults to DEFAULT_METRICS. "wall" is always measured.
+            sampler (ResourceSampler): Sampler providing the process handle and background samples.
+            sample_interval (float): Background sampling interval used when the "process" metric is selected.
+        """
+        metrics = set(self.DEFAULT_METRICS if metrics is None else metrics)
+        unknown = metrics.difference(self.METRICS)
+        if unknown:
+            raise ValueError(f"Unknown profiling metrics: {sorted(unknown)}, expected a subset of {self.METRICS}")
+        if "maxrss" in metrics and resource is None:
+            metrics.discard("maxrss")
+        metrics.add("wall")
+        self.metrics = frozenset(metrics)
+        self.sampler = sampler
+        self._cpu = "cpu" in metrics
+        self._rss = "rss" in metrics
+        self._maxrss = "maxrss" in metrics
+        self._process = "process" in metrics
+        if self._process:
+            sampler.start(sample_interval)
+
+    def start(self) -> Tuple[int, int, int, int]:
+        """Take the starting readings of a call."""
+        return (time.perf_counter_ns(),
+                time.thread_time_ns() if self._cpu else 0,
+                self.sampler.rss() if self._rss else 0,
+                resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if self._maxrss else 0)
+
+    def stop(self, start: Tuple[int, int, int, int]) -> Dict[str, float]:
+        """
+        Take the final readings of a call.
+        Parameters:
+            start (tuple): The value returned by start().
+        Returns:
+            Dict[str, float]: "wall" and "cpu" in seconds, "rss" and "maxrss" in bytes, "process_cpu_percent" and "process_rss" from the latest sample.
+        """
+        wall_start, cpu_start, rss_start, maxrss_start = start
+        measures = {"wall": (time.perf_counter_ns() - wall_start) / 1e9}
+        if self._cpu:
+            measures["cpu"] = (time.thread_time_ns() - cpu_start) / 1e9
+        if self._rss:
+            measures["rss"] = float(self.sampler.rss() - rss_start)
+        if self._maxrss:
+            # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+            scale = 1 if sys.platform == "darwin" else 1024
+            measures["maxrss"] = float((resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - maxrss_start) * scale)
+        if self._process:
+            latest = self.sampler.latest
+            measures["process_cpu_percent"] = latest.get("cpu_percent", 0.0)
+            measures["process_rss"] = latest.get("rss", 0.0)
+        return measures
+
+    @staticmethod
+    def format_usage(measures: Dict[str, float]) -> Optional[str]:
+        """
+        Format the non-time measures as a "Resource usage" log line.
+        Parameters:
+            measures (dict): The value returned by stop().
+        Returns:
+            Optional[str]: The log line, or None if only the wall time was measured.
+        """
+        parts: List[str] = []
+        if "cpu" in measures:
+            parts.append(f"CPU {measures['cpu'] * 1000:.2f} ms")
+        if "rss" in measures:
+            parts.append(f"Memory {measures['rss'] / (1024 * 1024):.2f} MB")
+        if "maxrss" in measures:
+            parts.append(f"Peak memory +{measures['maxrss'] / (1024 * 1024):.2f} MB")
+        if "process_cpu_percent" in measures:
+            parts.append(f"Process CPU {measures['process_cpu_percent']:.1f}%, Process RSS {measures['process_rss'] / (1024 * 1024):.2f} MB")
+        if not parts:
+            return None
+        return "Resource usage: " + ", ".join(parts)
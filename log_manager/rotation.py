@@ -0,0 +1,316 @@
+import atexit
+import datetime
+import glob
+import logging
+import os
+import queue
+import shutil
+import sys
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+
+class SegmentCompressor:
+    """
+    Background worker compressing rotated log segments and deleting expired ones, so that writers never wait for it.
+    """
+    EXTENSIONS = {"gzip": ".gz", "zstd": ".zst"}
+
+    def __init__(self) -> None:
+        self._queue: "queue.SimpleQueue[Optional[Callable[[], None]]]" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, task: Callable[[], None]) -> None:
+        """
+        Run a task on the background thread, starting it on first use.
+        Parameters:
+            task (Callable): Function taking no argument.
+        """
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                # Each thread gets its own queue, so that stopping a thread cannot be consumed by its successor
+                self._queue = queue.SimpleQueue()
+                self._thread = threading.Thread(target=self._work_loop, args=(self._queue,), name="trackinglog-segment-compressor", daemon=True)
+                self._thread.start()
+            self._queue.put(task)
+
+    def join(self, timeout: Optional[float] = 30.0) -> None:
+        """Wait until the submitted tasks are done, at most timeout seconds."""
+        with self._lock:
+            thread, tasks = self._thread, self._queue
+            if thread is None or not thread.is_alive():
+                return
+            self._thread = None
+            tasks.put(None)
+        thread.join(timeout)
+
+    def _work_loop(self, tasks: "queue.SimpleQueue[Optional[Callable[[], None]]]") -> None:
+        while True:
+            task = tasks.get()
+            if task is None:
+                return
+            try:
+                task()
+            except Exception as e:
+                sys.stderr.write(f"--- trackinglog: log segment maintenance failed: {e}\n")
+
+    @classmethod
+    def compress(cls, path: str, compression: str) -> str:
+        """
+        Compress a file next to itself and remove the original.
+        Parameters:
+            path (str): The file to compress.
+            compression (str): "gzip" or "zstd".
+        Returns:
+            str: The compressed file path.
+        """
+        target = path + cls.EXTENSIONS[compression]
+        tmp_path = target + ".tmp"
+        with open(path, "rb") as src:
+            if compression == "zstd":
+                import zstandard
+                with open(tmp_path, "wb") as dst:
+                    zstandard.ZstdCompressor().copy_stream(src, dst)
+            else:
+                import gzip
+                with gzip.open(tmp_path, "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+        # Keep the rotation time as modification time, segments are ordered by it
+        shutil.copystat(path, tmp_path)
+        os.replace(tmp_path, target)
+        os.remove(path)
+        # The index of the uncompressed segment does not apply to the compressed one
+        try:
+            os.remove(path + ".idx")
+        except FileNotFoundError:
+            pass
+        return target
+
+
+def rotated_segments(path: str) -> List[str]:
+    """
+    List the rotated segments of a log file, compressed or not.
+    Parameters:
+        path (str): Path of the active log file.
+    Returns:
+        List[str]: Paths of the segments.
+    """
+    root, ext = os.path.splitext(path)
+    return [p for p in glob.glob(glob.escape(root) + ".*" + ext + "*") if not p.endswith((".tmp", ".idx"))]
+
+
+def encoded_size(text: str, encoding: Optional[str] = None) -> int:
+    """
+    Size in bytes of text once written to a file.
+    Parameters:
+        text (str): The text to write.
+        encoding (str, optional): Encoding of the file, UTF-8 by default.
+    Returns:
+        int: The number of bytes.
+    """
+    if text.isascii():
+        return len(text)
+    return len(text.encode(encoding or "utf-8", errors="replace"))
+
+
+def write_rotating(lines: List[str], rotator: Optional['LogRotator'], write: Callable[[str], None], rotate: Callable[[], None], encoding: Optional[str] = None) -> None:
+    """
+    Write a batch of formatted lines, rotating between two lines when the rotator is due, so that a large batch does not overshoot max_bytes.
+    Parameters:
+        lines (List[str]): The formatted lines.
+        rotator (LogRotator, optional): Rotation policy of the file, None to write the batch at once.
+        write (Callable[[str], None]): Write data to the active segment, opening it if needed.
+        rotate (Callable[[], None]): Close the active segment and rotate it.
+        encoding (str, optional): Encoding of the file, UTF-8 by default.
+    """
+    if rotator is None:
+        write(''.join(lines))
+        return
+    chunk: List[str] = []
+    chunk_size = 0
+    for line in lines:
+        size = encoded_size(line, encoding)
+        # The pending chunk counts as written, even while the active segment is still empty
+        overflows = bool(chunk) and rotator.max_bytes is not None and rotator.size + chunk_size + size > rotator.max_bytes
+        if overflows or rotator.should_rotate(chunk_size + size):
+            if chunk:
+                write(''.join(chunk))
+                rotator.written(chunk_size)
+                chunk, chunk_size = [], 0
+            if rotator.should_rotate(size):
+                rotate()
+        chunk.append(line)
+        chunk_size += size
+    if chunk:
+        write(''.join(chunk))
+        rotator.written(chunk_size)
+
+
+segment_compressor = SegmentCompressor()
+# Registered at import, before any handler, so that it runs after the handlers have been closed at exit
+atexit.register(segment_compressor.join)
+
+
+class LogRotator:
+    """
+    Rotation and retention policy of one log file.
+    The file is rotated once it would exceed max_bytes or once interval seconds have passed since its segment was opened.
+    Rotated segments are renamed with the rotation time, compressed on the background thread, and the oldest ones are removed
+    beyond backup_count segments or max_age_days. The retained segments are tracked in memory, the folder is only listed once,
+    except for a file shared by several processes, whose segments are listed again at each rotation.
+    Sizes are in bytes: the handlers pass the encoded size of what they write.
+    """
+    COMPRESSIONS = ("gzip", "zstd", "none")
+
+    def __init__(self, path: str, max_bytes: Optional[int] = None, interval: Optional[float] = None, backup_count: Optional[int] = None,
+                 max_age_days: Optional[float] = None, compression: str = "gzip", compressor: SegmentCompressor = segment_compressor, shared: bool = False) -> None:
+        """
+        Initialize the rotator.
+        Parameters:
+            path (str): Path of the active log file.
+            max_bytes (int, optional): Maximum size of a segment in bytes.
+            interval (float, optional): Maximum duration of a segment in seconds.
+            backup_count (int, optional): Maximum number of rotated segments kept.
+            max_age_days (float, optional): Maximum age of rotated segments kept, in days.
+            compression (str): "gzip", "zstd" or "none".
+            compressor (SegmentCompressor): Background worker doing the compression and the deletions.
+            shared (bool): The file is rotated by several processes, under a lock held by the caller.
+        """
+        if compression not in self.COMPRESSIONS:
+            raise ValueError(f"Invalid compression: {compression}, expected one of {self.COMPRESSIONS}")
+        if compression == "zstd":
+            try:
+                import zstandard
+            except ImportError:
+                raise ImportError("zstd compression of rotated logs requires the zstandard package") from None
+        self.path = os.path.abspath(path)
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.backup_count = backup_count
+        self.max_age = None if max_age_days is None else max_age_days * 86400
+        self.compression = compression
+        self.compressor = compressor
+        self.shared = shared
+        self.size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        self.opened_at = time.time()
+        self._root, self._ext = os.path.splitext(self.path)
+        # (rotation time, segment path before compression), oldest first
+        self._segments: Deque[Tuple[float, str]] = self._list_segments()
+
+    def _list_segments(self) -> Deque[Tuple[float, str]]:
+        """Segments found in the folder, oldest first, a segment being compressed counting once."""
+        segments: Dict[str, float] = {}
+        for path in rotated_segments(self.path):
+            try:
+                segments[self._segment_path(path)] = os.path.getmtime(path)
+            except FileNotFoundError:
+                pass
+        return deque(sorted((mtime, path) for path, mtime in segments.items()))
+
+    @staticmethod
+    def _segment_path(path: str) -> str:
+        """Path of a segment before compression."""
+        for ext in SegmentCompressor.EXTENSIONS.values():
+            if path.endswith(ext):
+                return path[:-len(ext)]
+        return path
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes is not None or self.interval is not None
+
+    def should_rotate(self, pending: int) -> bool:
+        """
+        Whether the segment must be rotated before writing more data.
+        Parameters:
+            pending (int): Number of bytes about to be written.
+        """
+        if self.max_bytes is not None and self.size > 0 and self.size + pending > self.max_bytes:
+            return True
+        return self.interval is not None and time.time() - self.opened_at >= self.interval
+
+    def written(self, count: int) -> None:
+        """Account for bytes written to the active segment."""
+        self.size += count
+
+    def reset(self, size: int = 0) -> None:
+        """Start accounting for a new active segment, e.g. after another process rotated the shared file."""
+        self.size = size
+        self.opened_at = time.time()
+
+    def rotate(self) -> Optional[str]:
+        """
+        Rename the active file to a new segment and hand its compression and the retention to the background thread.
+        The caller must have closed the active file and reopens it afterwards.
+        Returns:
+            Optional[str]: The segment path, None if there was nothing to rotate.
+        """
+        self.reset()
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return None
+        now = time.time()
+        stamp = datetime.datetime.fromtimestamp(now).strftime("%y%m%d_%H%M%S_%f")
+        segment = f"{self._root}.{stamp}{self._ext}"
+        index = 1
+        while os.path.exists(segment) or any(os.path.exists(segment + ext) for ext in SegmentCompressor.EXTENSIONS.values()):
+            segment = f"{self._root}.{stamp}_{index}{self._ext}"
+            index += 1
+        if self.shared:
+            # The other processes rotated the file as well, the retention applies to all the segments
+            self._segments = self._list_segments()
+        os.replace(self.path, segment)
+        self._segments.append((now, segment))
+        expired = self._expired(now)
+        self.compressor.submit(lambda: self._maintain(segment, expired))
+        return segment
+
+    def _expired(self, now: float) -> list:
+        """Pop the segments falling out of the retention policy."""
+        expired = []
+        while self._segments and self.backup_count is not None and len(self._segments) > self.backup_count:
+            expired.append(self._segments.popleft()[1])
+        while self._segments and self.max_age is not None and now - self._segments[0][0] > self.max_age:
+            expired.append(self._segments.popleft()[1])
+        return expired
+
+    def _maintain(self, segment: str, expired: list) -> None:
+        if self.compression != "none" and segment not in expired and os.path.exists(segment):
+            SegmentCompressor.compress(segment, self.compression)
+        for path in expired:
+            for candidate in [path, path + ".idx"] + [path + ext + suffix for ext in SegmentCompressor.EXTENSIONS.values() for suffix in ("", ".idx")]:
+                try:
+                    os.remove(candidate)
+                except FileNotFoundError:
+                    pass
+
+
+class RotatingFileHandler(logging.FileHandler):
+    """File handler rotating its file according to a LogRotator."""
+    def __init__(self, filename: str, rotator: LogRotator, mode: str = 'a', encoding: Optional[str] = None) -> None:
+        super().__init__(filename, mode=mode, encoding=encoding)
+        self.rotator = rotator
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            line = self.format(record) + self.terminator
+            size = encoded_size(line, self.encoding)
+            if self.rotator.should_rotate(size):
+                self.rotate()
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(line)
+            self.flush()
+            self.rotator.written(size)
+        except Exception:
+            self.handleError(record)
+
+    def rotate(self) -> None:
+        """Close the active file, rotate it and reopen a new one."""
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+        self.rotator.rotate()
+        self.stream = self._open()
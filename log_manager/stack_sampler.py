@@ -0,0 +1,160 @@
+import os
+import sys
+import threading
+import time
+from types import CodeType
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Frames of the log manager itself (decorator wrappers, profiling helpers) are left out of the sampled stacks
+_LOG_MANAGER_DIR = os.path.dirname(os.path.abspath(__file__)) + os.sep
+
+
+def frame_label(code: CodeType) -> str:
+    """Name of a frame in a collapsed stack: qualified function name, file and first line."""
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+
+class StackSampler:
+    """
+    Statistical profiler of the functions decorated with enable_profiling="sample".
+    While at least one sampled call is running, a background thread snapshots the stacks of all threads every interval seconds.
+    The stacks going through a sampled function are counted from the outermost sampled frame down, per logger of that frame.
+    The decorated calls only pay for an active-call counter, so the overhead stays low enough for production.
+    """
+    def __init__(self, interval: float = 0.01) -> None:
+        """
+        Initialize the sampler. The thread is started by the first sampled call.
+        Parameters:
+            interval (float): Seconds between two samples.
+        """
+        self.interval = interval
+        self.samples = 0
+        self._codes: Dict[CodeType, str] = {}
+        self._hidden: Dict[CodeType, bool] = {}
+        self._counts: Dict[str, Dict[Tuple[CodeType, ...], int]] = {}
+        self._active = 0
+        self._running = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._dump_thread: Optional[threading.Thread] = None
+
+    def register(self, logname: str, func: Callable) -> None:
+        """
+        Sample the stacks going through a function.
+        Parameters:
+            logname (str): Name of the logger the samples are reported to.
+            func (Callable): The decorated function.
+        """
+        self._codes[func.__code__] = logname
+
+    def enter(self) -> None:
+        """Mark a sampled call as running."""
+        with self._lock:
+            self._active += 1
+            if self._active == 1:
+                self._running.set()
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="trackinglog-stack-sampler", daemon=True)
+                    self._thread.start()
+
+    def exit(self) -> None:
+        """Mark a sampled call as finished."""
+        with self._lock:
+            self._active -= 1
+            if self._active == 0:
+                self._running.clear()
+
+    def report(self, logname: Optional[str] = None) -> Dict[str, str]:
+        """
+        Format the sample counts as collapsed stacks, one "outer;...;inner count" line per stack, for flamegraph tools.
+        Parameters:
+            logname (str, optional): Only report the stacks of this logger.
+        Returns:
+            Dict: {logger name: collapsed stacks}.
+        """
+        with self._lock:
+            counts = {name: dict(stacks) for name, stacks in self._counts.items() if logname is None or name == logname}
+        labels: Dict[CodeType, str] = {}
+        report = {}
+        for name, stacks in sorted(counts.items()):
+            lines = []
+            for stack, count in sorted(stacks.items(), key=lambda item: item[1], reverse=True):
+                path = ";".join(labels[code] if code in labels else labels.setdefault(code, frame_label(code)) for code in stack)
+                lines.append(f"{path} {count}\n")
+            report[name] = "".join(lines)
+        return report
+
+    def start_periodic_dump(self, interval: float, dump_func: Callable[[], Any]) -> None:
+        """
+        Call dump_func every interval seconds from a daemon thread. Only the first call starts a thread.
+        Parameters:
+            interval (float): Seconds between two dumps.
+            dump_func (Callable): Function writing the reports.
+        """
+        with self._lock:
+            if self._dump_thread is not None:
+                return
+            self._dump_thread = threading.Thread(target=self._dump_loop, args=(interval, dump_func), name="trackinglog-sample-report", daemon=True)
+            self._dump_thread.start()
+
+    def _dump_loop(self, interval: float, dump_func: Callable[[], Any]) -> None:
+        while True:
+            time.sleep(interval)
+            try:
+                dump_func()
+            except Exception as e:
+                sys.stderr.write(f"--- trackinglog: failed to write the sample profile: {e}\n")
+
+    def _run(self) -> None:
+        own_ident = threading.get_ident()
+        deadline = time.perf_counter()
+        while True:
+            self._running.wait()
+            self._sample_threads(own_ident)
+            # Sleep until the next deadline, so that the wait for the GIL after waking up does not lower the sampling rate
+            now = time.perf_counter()
+            deadline = max(deadline + self.interval, now)
+            time.sleep(deadline - now)
+
+    def _sample_threads(self, own_ident: int) -> None:
+        for ident, frame in sys._current_frames().items():
+            if ident != own_ident:
+                self._sample(frame)
+
+    def _sample(self, frame: Any) -> None:
+        """Count the stack of a thread from its outermost sampled frame down."""
+        codes, hidden = self._codes, self._hidden
+        stack = []
+        root = 0
+        while frame is not None:
+            code = frame.f_code
+            is_hidden = hidden.get(code)
+            if is_hidden is None:
+                is_hidden = hidden[code] = code.co_filename.startswith(_LOG_MANAGER_DIR)
+            if not is_hidden:
+                stack.append(code)
+                if code in codes:
+                    root = len(stack)
+            frame = frame.f_back
+        if not root:
+            return
+        key = tuple(reversed(stack[:root]))
+        with self._lock:
+            stacks = self._counts.setdefault(codes[key[0]], {})
+            stacks[key] = stacks.get(key, 0) + 1
+            self.samples += 1
+
+    def _reinit_after_fork(self) -> None:
+        """Restart from no running call in a forked child, the sampling thread is started again on the next sampled call."""
+        self._lock = threading.Lock()
+        self._running = threading.Event()
+        self._active = 0
+        self._thread = None
+        self._dump_thread = None
+        self._counts = {}
+
+
+stack_sampler = StackSampler()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=stack_sampler._reinit_after_fork)
@@ -0,0 +1,85 @@
+import datetime
+import json
+import logging
+import struct
+from typing import Any, Dict, Optional
+
+from .rotation import LogRotator
+
+LOG_FORMATS = ("text", "jsonl", "binary")
+FILE_EXTENSIONS = {"text": ".log", "jsonl": ".jsonl", "binary": ".tlb"}
+
+# Binary record header: payload length, timestamp, level number
+BINARY_HEADER = struct.Struct(">IdB")
+
+
+def record_fields(record: logging.LogRecord) -> Dict[str, Any]:
+    """
+    Structured fields of a record.
+    Parameters:
+        record (logging.LogRecord): The record to convert.
+    Returns:
+        Dict[str, Any]: "timestamp" (epoch seconds), "time", "level", "logger", "caller", "message", and "metrics" if the record has any.
+    """
+    fields = {
+        "timestamp": record.created,
+        "time": datetime.datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+        "level": record.levelname,
+        "logger": record.name,
+        "caller": getattr(record, "caller_func_name", record.funcName),
+        "message": record.getMessage(),
+    }
+    metrics = getattr(record, "metrics", None)
+    if metrics:
+        fields["metrics"] = metrics
+    if record.exc_info:
+        fields["message"] += "\n" + logging.Formatter().formatException(record.exc_info)
+    return fields
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formatter writing each record as one JSON object, multi-line messages included."""
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps(record_fields(record), ensure_ascii=False, default=str)
+
+
+def encode_binary_record(record: logging.LogRecord) -> bytes:
+    """
+    Encode a record as a length-prefixed binary frame.
+    The header holds the timestamp and level number, so that readers can filter and skip records without decoding the payload.
+    The payload is the UTF-8 JSON of the logger, caller, message and metrics fields.
+    """
+    fields = record_fields(record)
+    del fields["timestamp"], fields["time"], fields["level"]
+    payload = json.dumps(fields, ensure_ascii=False, default=str, separators=(",", ":")).encode("utf-8")
+    return BINARY_HEADER.pack(len(payload), record.created, record.levelno) + payload
+
+
+class BinaryFileHandler(logging.FileHandler):
+    """File handler writing records in the compact length-prefixed binary format."""
+    def __init__(self, filename: str, rotator: Optional[LogRotator] = None) -> None:
+        """
+        Initialize the handler.
+        Parameters:
+            filename (str): Path of the log file.
+            rotator (LogRotator, optional): Rotation policy of the file.
+        """
+        super().__init__(filename, mode="ab")
+        self.rotator = rotator
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            frame = encode_binary_record(record)
+            if self.rotator is not None and self.rotator.should_rotate(len(frame)):
+                if self.stream is not None:
+                    self.stream.close()
+                    self.stream = None
+                self.rotator.rotate()
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(frame)
+            self.stream.flush()
+            if self.rotator is not None:
+                self.rotator.written(len(frame))
+        except Exception:
+            self.handleError(record)
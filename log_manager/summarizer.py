@@ -0,0 +1,281 @@
+import itertools
+import math
+import re
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, List, Optional, Sequence, Tuple
+
+_FIXED_NUMBER = re.compile(r"^\s*[\+-]?[0-9]+\.[0-9]*$")
+
+
+class Summarizer:
+    """
+    Renders dicts, lists and DataFrames for log messages with bounded cost.
+    Only the head and tail rows and columns that are displayed are read, and the fixed-width tables are built directly,
+    following the layout of DataFrame.to_string with max_rows, max_cols, max_colwidth and show_dimensions.
+    Rendered DataFrames are cached as long as their displayed cells, shape and dtypes do not change.
+    Tables with other object cells than strings and numbers are rendered by pandas, which formats them its own way.
+    """
+    FLOAT_DIGITS = 6
+
+    def __init__(self, max_items: int = 100, max_item_width: int = 200, cache_size: int = 128) -> None:
+        """
+        Initialize the summarizer.
+        Parameters:
+            max_items (int): Number of list or tuple items above which only the head and tail items are rendered.
+            max_item_width (int): Maximum number of characters rendered per list or tuple item.
+            cache_size (int): Number of rendered DataFrames kept in the cache.
+        """
+        self.max_items = max_items
+        self.max_item_width = max_item_width
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[int, Tuple[Any, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def render_dict(self, data: dict, max_rows: int = 10, max_colwidth: int = 35) -> str:
+        """
+        Render a dict as a key/value table, reading only the displayed items.
+        The column types are inferred from the displayed keys and values.
+        """
+        if not data:
+            return "Empty DataFrame\nColumns: []\nIndex: []\n\n[0 rows x 0 columns]"
+        n_rows = len(data)
+        head, tail = self._split(n_rows, max_rows)
+        items = list(itertools.islice(data.items(), head))
+        if tail:
+            items += list(itertools.islice(reversed(data.items()), tail))[::-1]
+        keys, values = [key for key, _ in items], [value for _, value in items]
+        if self._inferred_by_pandas(keys) or self._inferred_by_pandas(values):
+            return self._pandas_dict(keys, values, n_rows, head, tail, max_colwidth)
+        index = [str(i) for i in range(head)] + [str(i) for i in range(n_rows - tail, n_rows)]
+        strcols = [self._format_column("key", keys, None, max_colwidth), self._format_column("value", values, None, max_colwidth)]
+        return self._table(index, strcols, n_rows, 2, truncated_rows=head if tail else None, truncated_cols=None)
+
+    @staticmethod
+    def _pandas_dict(keys: List[Any], values: List[Any], n_rows: int, head: int, tail: int, max_colwidth: int) -> str:
+        """Render the displayed items of a dict with pandas, a copy of the last head item standing for the hidden ones so that pandas truncates the table."""
+        import pandas
+
+        labels = list(range(head)) + list(range(n_rows - tail, n_rows))
+        if tail:
+            keys, values, labels = keys[:head] + keys[head - 1:], values[:head] + values[head - 1:], labels[:head] + [head] + labels[head:]
+        frame = pandas.DataFrame({"key": keys, "value": values}, index=labels)
+        text = frame.to_string(max_rows=head + tail if tail else None, max_colwidth=max_colwidth, show_dimensions=False)
+        return f"{text}\n\n[{n_rows} rows x 2 columns]"
+
+    def render_frame(self, df: Any, max_rows: int = 10, max_cols: int = 10, max_colwidth: int = 35) -> str:
+        """
+        Render a DataFrame like to_string(max_rows, max_cols, max_colwidth, show_dimensions=True), reading only the displayed cells.
+        Frames with a MultiIndex, named axes or columns of other dtypes than numbers, booleans and objects are rendered by pandas.
+        """
+        pandas = sys.modules["pandas"]
+        n_rows, n_cols = df.shape
+        if n_rows == 0 or n_cols == 0 or df.index.nlevels > 1 or df.columns.nlevels > 1 or df.index.name is not None or df.columns.name is not None:
+            return df.to_string(max_rows=max_rows, max_cols=max_cols, max_colwidth=max_colwidth, show_dimensions=True)
+        row_head, row_tail = self._split(n_rows, max_rows)
+        col_head, col_tail = self._split(n_cols, max_cols)
+        rows = list(range(row_head)) + list(range(n_rows - row_tail, n_rows))
+        cols = list(range(col_head)) + list(range(n_cols - col_tail, n_cols))
+        sample = df.iloc[rows].iloc[:, cols]
+        kinds = [self._dtype_kind(dtype, pandas) for dtype in sample.dtypes]
+        labels = self._format_labels(sample.columns, pandas)
+        index = self._format_labels(sample.index, pandas)
+        if None in kinds or labels is None or index is None:
+            return df.to_string(max_rows=max_rows, max_cols=max_cols, max_colwidth=max_colwidth, show_dimensions=True)
+        column_values = [column.tolist() for _, column in sample.items()]
+        if any(kind == "O" and not all(self._is_plain(value) for value in values) for kind, values in zip(kinds, column_values)):
+            return df.to_string(max_rows=max_rows, max_cols=max_cols, max_colwidth=max_colwidth, show_dimensions=True)
+        signature = (df.shape, kinds, labels, index, column_values, max_rows, max_cols, max_colwidth)
+
+        key = id(df)
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached is not None:
+            try:
+                if cached[0] == signature:
+                    return cached[1]
+            except Exception:  # Cells that cannot be compared, e.g. arrays
+                pass
+
+        strcols = [self._format_column(label, values, kind, max_colwidth) for label, values, kind in zip(labels, column_values, kinds)]
+        rendered = self._table(index, strcols, n_rows, n_cols,
+                               truncated_rows=row_head if row_tail else None, truncated_cols=col_head if col_tail else None)
+        with self._lock:
+            self._cache[key] = (signature, rendered)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return rendered
+
+    def render_sequence(self, items: Sequence) -> str:
+        """Render a list or tuple like str(), with only the head and tail items of long sequences and each item width bounded."""
+        n_items = len(items)
+        if n_items > self.max_items:
+            head = self.max_items // 2
+            parts = [self._item_repr(item) for item in items[:head]] + ["..."] + [self._item_repr(item) for item in items[n_items - head:]]
+            suffix = f" ({n_items} items)"
+        else:
+            parts = [self._item_repr(item) for item in items]
+            suffix = ""
+        if isinstance(items, tuple):
+            return "(" + ", ".join(parts) + ("," if n_items == 1 else "") + ")" + suffix
+        return "[" + ", ".join(parts) + "]" + suffix
+
+    def _item_repr(self, item: Any) -> str:
+        text = repr(item)
+        if len(text) > self.max_item_width:
+            text = text[:self.max_item_width - 3] + "..."
+        return text
+
+    @staticmethod
+    def _split(total: int, limit: Optional[int]) -> Tuple[int, int]:
+        """Number of head and tail entries displayed, the tail being 0 if nothing is truncated."""
+        if not limit or total <= limit:
+            return total, 0
+        return limit // 2, limit // 2
+
+    @staticmethod
+    def _dtype_kind(dtype: Any, pandas: Any) -> Optional[str]:
+        """Kind of a column dtype rendered by the summarizer: "f", "i", "b" or "O", None for other dtypes."""
+        if isinstance(dtype, sys.modules["numpy"].dtype) and dtype.kind in "fiub":
+            return "i" if dtype.kind == "u" else dtype.kind
+        if dtype == object or isinstance(dtype, pandas.StringDtype):
+            return "O"
+        return None
+
+    @classmethod
+    def _format_labels(cls, labels: Any, pandas: Any) -> Optional[List[str]]:
+        """Displayed labels of an integer or string index, None for other indexes."""
+        kind = cls._dtype_kind(labels.dtype, pandas)
+        if kind == "i":
+            # Left-justified to a common width, as pandas formats index values
+            texts = [f"{label: d}" for label in labels.tolist()]
+            width = max(len(text) for text in texts)
+            texts = [text.ljust(width) for text in texts]
+            lead = min(len(text) - len(text.lstrip(" ")) for text in texts)
+            return [text[lead:] for text in texts]
+        if kind == "O" and all(isinstance(label, str) for label in labels):
+            return [label.replace("\t", "\\t").replace("\r", "\\r").replace("\n", "\\n") for label in labels]
+        return None
+
+    @staticmethod
+    def _is_plain(value: Any) -> bool:
+        """Whether the summarizer renders an object cell like pandas: None, a string, a real number or a missing value marker."""
+        if value is None or isinstance(value, (str, int, float)):
+            return True
+        numpy = sys.modules.get("numpy")
+        if numpy is not None and isinstance(value, (numpy.bool_, numpy.integer, numpy.floating)):
+            return True
+        pandas = sys.modules.get("pandas")
+        return pandas is not None and (value is pandas.NA or value is pandas.NaT)
+
+    @classmethod
+    def _inferred_by_pandas(cls, values: List[Any]) -> bool:
+        """
+        Whether a dict column built from the values has to be rendered by pandas: pandas formats the other objects its own way,
+        e.g. the strings inside tuples without quotes, and infers the dtype of columns with missing values, e.g. pandas 3 infers
+        a string column from strings and None, shown as NaN.
+        """
+        if not all(cls._is_plain(value) for value in values):
+            return True
+        pandas = sys.modules.get("pandas")
+        if pandas is not None and any(value is pandas.NA or value is pandas.NaT for value in values):
+            return True
+        return any(value is None for value in values) and any(isinstance(value, str) for value in values)
+
+    @staticmethod
+    def _infer_kind(values: List[Any]) -> str:
+        """Kind of the column pandas would build from the values, None being missing."""
+        present = [value for value in values if value is not None]
+        if not present:
+            return "O"
+        # NumPy scalars count as the Python numbers they stand for, NumPy being imported if any is present
+        numpy = sys.modules.get("numpy")
+        bools, ints, floats = ((bool, numpy.bool_), (int, numpy.integer), (float, numpy.floating)) if numpy is not None else ((bool,), (int,), (float,))
+        if all(isinstance(value, bools) for value in present):
+            return "b" if len(present) == len(values) else "O"
+        if all(isinstance(value, ints + floats) and not isinstance(value, bools) for value in present):
+            if len(present) < len(values) or any(isinstance(value, floats) for value in present):
+                return "f"
+            return "i"
+        return "O"
+
+    def _format_column(self, label: str, values: List[Any], kind: Optional[str], max_colwidth: int) -> List[str]:
+        """Header and cells of a column, justified to a common width."""
+        if kind is None:
+            kind = self._infer_kind(values)
+        if kind == "f":
+            cells = self._format_floats([math.nan if value is None else float(value) for value in values])
+        elif kind == "i":
+            cells = [f"{value: d}" for value in values]
+        else:
+            cells = [self._format_object(value) for value in values]
+        # Numeric headers keep a space for the sign, like the cells
+        header = " " + label if kind in ("f", "i", "b") else label
+        width = min(max(len(header), max(len(cell) for cell in cells)), max_colwidth)
+        cells = [cell[:width - 3] + "..." if len(cell) > width else cell for cell in cells]
+        width = max(width, len(header))
+        return [header.rjust(width)] + [cell.rjust(width) for cell in cells]
+
+    def _format_object(self, value: Any) -> str:
+        if isinstance(value, float) and not math.isnan(value):
+            text = "{: .{}f}".format(value, self.FLOAT_DIGITS).rstrip("0")
+            return text + "0" if text.endswith(".") else text
+        if value is None:
+            return " None"
+        if isinstance(value, float):
+            return " NaN"
+        pandas = sys.modules.get("pandas")
+        if pandas is not None and value is pandas.NA:
+            return " <NA>"
+        if pandas is not None and value is pandas.NaT:
+            return " NaT"
+        return " " + str(value).replace("\t", "\\t").replace("\r", "\\r").replace("\n", "\\n")
+
+    def _format_floats(self, values: List[float]) -> List[str]:
+        """Format a float column with a common number of decimals, switching to scientific notation for very large or small values."""
+        digits = self.FLOAT_DIGITS
+        cells = self._trim_zeros(["NaN" if math.isnan(value) else "{: .{}f}".format(value, digits) for value in values])
+        finite = [abs(value) for value in values if not math.isnan(value)]
+        too_long = max(len(cell) for cell in cells) > digits + 6
+        has_large = any(value > 1e6 for value in finite)
+        has_small = any(0 < value < 10 ** -digits for value in finite)
+        if has_small or (too_long and has_large):
+            cells = ["NaN" if math.isnan(value) else "{: .{}e}".format(value, digits) for value in values]
+        return cells
+
+    @staticmethod
+    def _trim_zeros(cells: List[str]) -> List[str]:
+        """Remove the trailing zeros common to every fixed-point number, keeping at least one decimal."""
+        while True:
+            numbers = [cell for cell in cells if _FIXED_NUMBER.match(cell)]
+            if not numbers or not all(cell.endswith("0") for cell in numbers):
+                break
+            cells = [cell[:-1] if _FIXED_NUMBER.match(cell) else cell for cell in cells]
+        return [cell + "0" if _FIXED_NUMBER.match(cell) and cell.endswith(".") else cell for cell in cells]
+
+    @staticmethod
+    def _table(index: List[str], strcols: List[List[str]], n_rows: int, n_cols: int,
+               truncated_rows: Optional[int], truncated_cols: Optional[int]) -> str:
+        """
+        Join the index and the columns, given as header followed by cells, inserting the ".." row and "..." column
+        markers at the truncation points.
+        """
+        index = [""] + index
+        if truncated_cols is not None:
+            strcols = strcols[:truncated_cols] + [[" ..."] * len(index)] + strcols[truncated_cols:]
+        if truncated_rows is not None:
+            row = truncated_rows + 1
+            index_width = max(len(label) for label in index)
+            index = index[:row] + [(".." if index_width <= 3 else "...").ljust(index_width)] + index[row:]
+            strcols = [cells[:row] + [("..." if len(cells[row]) > 3 else "..").rjust(len(cells[row]))] + cells[row:] for cells in strcols]
+        columns = [index] + strcols
+        widths = [max(len(cell) for cell in cells) for cells in columns]
+        lines = [" ".join(cells[row].ljust(width) for cells, width in zip(columns, widths)) for row in range(len(index))]
+        lines.append("")
+        lines.append(f"[{n_rows} rows x {n_cols} columns]")
+        return "\n".join(lines)
+
+
+summarizer = Summarizer()
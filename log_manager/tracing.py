@@ -0,0 +1,205 @@
+import atexit
+import collections
+import contextvars
+import datetime
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from typing import Deque, Dict, List, Optional
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("trackinglog_span", default=None)
+
+
+def _current_task_id() -> Optional[int]:
+    asyncio = sys.modules.get("asyncio")
+    if asyncio is None or asyncio._get_running_loop() is None:
+        return None
+    task = asyncio.current_task()
+    return None if task is None else id(task)
+
+
+class Span:
+    """A traced call. Times are perf_counter_ns readings, the child time is the total time of the direct child spans."""
+    __slots__ = ['name', 'logger', 'path', 'trace_id', 'span_id', 'parent_id', 'parent', 'start', 'end', 'child_time', 'thread_id', 'task_id', 'error']
+
+    def __init__(self, name: str, logger: str, span_id: int, parent: Optional['Span']) -> None:
+        self.name = name
+        self.logger = logger
+        self.span_id = span_id
+        self.parent = parent
+        if parent is None:
+            self.path = name
+            self.trace_id = span_id
+            self.parent_id = None
+        else:
+            self.path = f"{parent.path};{name}"
+            self.trace_id = parent.trace_id
+            self.parent_id = parent.span_id
+        self.thread_id = threading.get_native_id()
+        self.task_id = _current_task_id()
+        self.child_time = 0
+        self.end = 0
+        self.error = False
+        self.start = time.perf_counter_ns()
+
+    @property
+    def total_time(self) -> int:
+        return self.end - self.start
+
+    @property
+    def self_time(self) -> int:
+        # Children running concurrently in other tasks can add up to more than the parent duration
+        return max(self.total_time - self.child_time, 0)
+
+
+class Tracer:
+    """
+    Span tracing of decorated calls. The current span is kept in a context variable, so each thread and asyncio task has its own span stack.
+    Finished spans go into a bounded ring buffer, exported in batches by a background thread to a trace file in the log folder.
+    """
+    def __init__(self) -> None:
+        self.folder: Optional[str] = None
+        self.fmt = "chrome"
+        self.buffer_size = 10000
+        self.flush_interval = 5.0
+        self.dropped = 0
+        self.exported = 0
+        self._spans: Deque[Span] = collections.deque(maxlen=self.buffer_size)
+        self._ids = itertools.count(1)
+        self._path: Optional[str] = None
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def configure(self, folder: str, fmt: str = "chrome", buffer_size: int = 10000, flush_interval: float = 5.0) -> None:
+        """
+        Set the export settings. Spans already exported stay in the current trace file, a change of folder or format starts a new file.
+        Parameters:
+            folder (str): Folder of the trace files.
+            fmt (str): "chrome" (trace event JSON) or "collapsed" (self time per call stack).
+            buffer_size (int): Maximum number of finished spans waiting for export.
+            flush_interval (float): Seconds between two exports.
+        """
+        with self._lock:
+            if folder != self.folder or fmt != self.fmt:
+                self._path = None
+            self.folder = folder
+            self.fmt = fmt
+            self.flush_interval = flush_interval
+            if buffer_size != self.buffer_size:
+                self.buffer_size = buffer_size
+                self._spans = collections.deque(self._spans, maxlen=buffer_size)
+
+    @property
+    def path(self) -> Optional[str]:
+        """Path of the current trace file, None until the first export."""
+        return self._path
+
+    @staticmethod
+    def current() -> Optional[Span]:
+        """The innermost active span of the current thread or task."""
+        return _current_span.get()
+
+    def begin(self, logname: str, name: str) -> Span:
+        """Start a span, child of the current span. It becomes current only once activated."""
+        return Span(name, logname, next(self._ids), _current_span.get())
+
+    @staticmethod
+    def activate(span: Span) -> contextvars.Token:
+        return _current_span.set(span)
+
+    @staticmethod
+    def deactivate(token: contextvars.Token) -> None:
+        _current_span.reset(token)
+
+    def end(self, span: Span, error: bool = False) -> None:
+        """Finish a span, add its duration to the child time of its parent and queue it for export."""
+        span.end = time.perf_counter_ns()
+        span.error = span.error or error
+        parent = span.parent
+        if parent is not None:
+            parent.child_time += span.end - span.start
+            span.parent = None
+        spans = self._spans
+        if len(spans) == spans.maxlen:
+            self.dropped += 1
+        spans.append(span)
+        if self._worker is None:
+            self._start_worker()
+
+    def flush(self) -> Optional[str]:
+        """
+        Export the finished spans now.
+        Returns:
+            Optional[str]: Path of the trace file, None if nothing was ever exported.
+        """
+        with self._lock:
+            spans = self._spans
+            batch: List[Span] = [spans.popleft() for _ in range(len(spans))]
+            if not batch or self.folder is None:
+                return self._path
+            if self._path is None:
+                time_stamp = datetime.datetime.now().strftime("%y%m%d_%H%M%S")
+                extension = "json" if self.fmt == "chrome" else "folded"
+                self._path = os.path.join(self.folder, f"trace_{time_stamp}_{os.getpid()}.{extension}")
+                os.makedirs(self.folder, exist_ok=True)
+                if self.fmt == "chrome":
+                    # The closing bracket of the JSON array format is optional, so that batches can be appended
+                    with open(self._path, "w") as f:
+                        f.write("[\n")
+            with open(self._path, "a") as f:
+                f.write(self._format_chrome(batch) if self.fmt == "chrome" else self._format_collapsed(batch))
+            self.exported += len(batch)
+            return self._path
+
+    @staticmethod
+    def _format_chrome(batch: List[Span]) -> str:
+        pid = os.getpid()
+        lines = []
+        for span in batch:
+            event = {"name": span.name, "cat": span.logger, "ph": "X", "ts": span.start / 1000, "dur": span.total_time / 1000,
+                     "pid": pid, "tid": span.task_id if span.task_id is not None else span.thread_id,
+                     "args": {"span_id": span.span_id, "parent_id": span.parent_id, "trace_id": span.trace_id, "self_us": span.self_time / 1000,
+                              "thread_id": span.thread_id, "task_id": span.task_id, "error": span.error}}
+            lines.append(json.dumps(event) + ",\n")
+        return "".join(lines)
+
+    @staticmethod
+    def _format_collapsed(batch: List[Span]) -> str:
+        self_times: Dict[str, int] = collections.Counter()
+        for span in batch:
+            self_times[span.path] += span.self_time
+        return "".join(f"{path} {self_time // 1000}\n" for path, self_time in self_times.items())
+
+    def _start_worker(self) -> None:
+        with self._lock:
+            if self._worker is not None:
+                return
+            self._worker = threading.Thread(target=self._run, name="trackinglog-tracer", daemon=True)
+            self._worker.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self._flush_safely()
+
+    def _flush_safely(self) -> None:
+        try:
+            self.flush()
+        except Exception as e:
+            sys.stderr.write(f"--- trackinglog: failed to write the trace file: {e}\n")
+
+    def _reinit_after_fork(self) -> None:
+        """Start a trace file of its own in a forked child. Spans finished in the parent are left to the parent."""
+        self._lock = threading.Lock()
+        self._spans.clear()
+        self._path = None
+        self._worker = None
+
+
+tracer = Tracer()
+atexit.register(tracer._flush_safely)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=tracer._reinit_after_fork)
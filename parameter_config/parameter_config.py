@@ -1,20 +1,40 @@
 import os
 from os.path import join as pjoin
-from typing import Optional, Union, Callable
+from typing import List, Optional, Union, Callable
 
 class EmailCredential:
-    __slots__ = ['_username', '_password', '_root_emails_folder']
+    TRANSPORTS = ("smtp", "file")
+    __slots__ = ['_username', '_password', '_root_emails_folder', '_smtp_host', '_smtp_port', '_smtp_use_tls', '_sender', '_recipients',
+                 '_transport', '_notify_window', '_notify_max_retries', '_notify_retry_backoff']
 
     def __init__(self, data: Union[dict, Callable], default_emails_folder: str = 'emails') -> None:
         self._username = None
         self._password = None
         self._root_emails_folder = None
+        self._smtp_host = None
+        self._smtp_port = None
+        self._smtp_use_tls = None
+        self._sender = None
+        self._recipients = None
+        self._transport = None
+        self._notify_window = None
+        self._notify_max_retries = None
+        self._notify_retry_backoff = None
 
         if isinstance(data, dict):
             self.setup(
                 email_root_folder=data.get('root_emails_folder', default_emails_folder),
                 username=data.get('username'),
-                password=data.get('password')
+                password=data.get('password'),
+                smtp_host=data.get('smtp_host'),
+                smtp_port=data.get('smtp_port'),
+                smtp_use_tls=data.get('smtp_use_tls'),
+                sender=data.get('sender'),
+                recipients=data.get('recipients'),
+                transport=data.get('transport'),
+                notify_window=data.get('notify_window'),
+                notify_max_retries=data.get('notify_max_retries'),
+                notify_retry_backoff=data.get('notify_retry_backoff')
             )
         else:
             # Assuming 'data' is an object with attributes 'username' and 'password'
@@ -22,20 +42,52 @@ class EmailCredential:
             self.setup(
                 email_root_folder=default_emails_folder if getattr(data, 'root_emails_folder', None) is None else data.root_emails_folder,
                 username=data.username,
-                password=data.password
+                password=data.password,
+                smtp_host=getattr(data, 'smtp_host', None),
+                smtp_port=getattr(data, 'smtp_port', None),
+                smtp_use_tls=getattr(data, 'smtp_use_tls', None),
+                sender=getattr(data, 'sender', None),
+                recipients=getattr(data, 'recipients', None),
+                transport=getattr(data, 'transport', None),
+                notify_window=getattr(data, 'notify_window', None),
+                notify_max_retries=getattr(data, 'notify_max_retries', None),
+                notify_retry_backoff=getattr(data, 'notify_retry_backoff', None)
             )
     
-    def setup(self, email_root_folder: str, username: Optional[str] = None, password: Optional[str] = None) -> None:
+    def setup(self, email_root_folder: str, username: Optional[str] = None, password: Optional[str] = None,
+              smtp_host: Optional[str] = None, smtp_port: Optional[int] = None, smtp_use_tls: Optional[bool] = None,
+              sender: Optional[str] = None, recipients: Optional[Union[str, List[str]]] = None, transport: Optional[str] = None,
+              notify_window: Optional[float] = None, notify_max_retries: Optional[int] = None, notify_retry_backoff: Optional[float] = None) -> None:
         """
         Setup the email credential.
         Parameters:
-            email_root_folder (str): The folder where emails are stored.
+            email_root_folder (str): The folder where emails are stored, and spooled by the "file" transport.
             username (str): The email username.
             password (str): The email password.
+            smtp_host (str): SMTP server host.
+            smtp_port (int): SMTP server port, 587 by default.
+            smtp_use_tls (bool): Whether the SMTP connection is upgraded with STARTTLS.
+            sender (str): From address of notifications, defaults to the username.
+            recipients (str or List[str]): Recipients of notifications.
+            transport (str): Notification transport: "smtp", or "file" to write the emails into the emails folder. Defaults to "smtp" if smtp_host is passed.
+            Settings that are not passed keep the value of a previous setup.
+            notify_window (float): Seconds during which repeated notifications with the same signature are grouped into one digest.
+            notify_max_retries (int): Maximum number of delivery retries of a notification batch.
+            notify_retry_backoff (float): Delay in seconds before the first retry, doubled at each retry.
         """
         self.root_emails_folder = email_root_folder
         self.username = username if username is not None else self._username
         self.password = password if password is not None else self._password
+        # Like the username and password, the settings not passed keep their previous value
+        self.smtp_host = smtp_host if smtp_host is not None else self._smtp_host
+        self.smtp_port = smtp_port if smtp_port is not None else (self._smtp_port or 587)
+        self.smtp_use_tls = smtp_use_tls if smtp_use_tls is not None else (self._smtp_use_tls if self._smtp_use_tls is not None else True)
+        self.sender = sender if sender is not None else self._sender
+        self.recipients = recipients if recipients is not None else (self._recipients if self._recipients is not None else [])
+        self.transport = transport if transport is not None else ("smtp" if smtp_host else (self._transport or "file"))
+        self.notify_window = notify_window if notify_window is not None else (self._notify_window if self._notify_window is not None else 300)
+        self.notify_max_retries = notify_max_retries if notify_max_retries is not None else (self._notify_max_retries if self._notify_max_retries is not None else 5)
+        self.notify_retry_backoff = notify_retry_backoff if notify_retry_backoff is not None else (self._notify_retry_backoff if self._notify_retry_backoff is not None else 1.0)
 
     @property
     def username(self) -> str:
@@ -49,6 +101,42 @@ class EmailCredential:
     def root_emails_folder(self) -> str:
         return self._root_emails_folder
 
+    @property
+    def smtp_host(self) -> Optional[str]:
+        return self._smtp_host
+
+    @property
+    def smtp_port(self) -> int:
+        return self._smtp_port
+
+    @property
+    def smtp_use_tls(self) -> bool:
+        return self._smtp_use_tls
+
+    @property
+    def sender(self) -> Optional[str]:
+        return self._sender if self._sender is not None else self._username
+
+    @property
+    def recipients(self) -> List[str]:
+        return self._recipients
+
+    @property
+    def transport(self) -> str:
+        return self._transport
+
+    @property
+    def notify_window(self) -> float:
+        return self._notify_window
+
+    @property
+    def notify_max_retries(self) -> int:
+        return self._notify_max_retries
+
+    @property
+    def notify_retry_backoff(self) -> float:
+        return self._notify_retry_backoff
+
     @username.setter
     def username(self, value: str) -> None:
         self._username = value
@@ -61,11 +149,58 @@ class EmailCredential:
     def root_emails_folder(self, value: str) -> None:
         self._root_emails_folder = value
 
+    @smtp_host.setter
+    def smtp_host(self, value: Optional[str]) -> None:
+        self._smtp_host = value
+
+    @smtp_port.setter
+    def smtp_port(self, value: int) -> None:
+        self._smtp_port = value
+
+    @smtp_use_tls.setter
+    def smtp_use_tls(self, value: bool) -> None:
+        self._smtp_use_tls = value
+
+    @sender.setter
+    def sender(self, value: Optional[str]) -> None:
+        self._sender = value
+
+    @recipients.setter
+    def recipients(self, value: Union[str, List[str]]) -> None:
+        self._recipients = [value] if isinstance(value, str) else list(value)
+
+    @transport.setter
+    def transport(self, value: str) -> None:
+        if value not in self.TRANSPORTS:
+            raise ValueError(f"Invalid email transport: {value}, expected one of {self.TRANSPORTS}")
+        self._transport = value
+
+    @notify_window.setter
+    def notify_window(self, value: float) -> None:
+        self._notify_window = value
+
+    @notify_max_retries.setter
+    def notify_max_retries(self, value: int) -> None:
+        self._notify_max_retries = value
+
+    @notify_retry_backoff.setter
+    def notify_retry_backoff(self, value: float) -> None:
+        self._notify_retry_backoff = value
+
     def __repr__(self) -> str:
-        return f"EmailCredential(username={self._username}, password=***hidden***)"
+        return f"EmailCredential(username={self._username}, password=***hidden***, transport={self._transport}, smtp_host={self._smtp_host})"
     
 class LogConfig:
-    __slots__ = ['_root_log_path', '_cache_log_path', '_cache_log_num_limit', '_cache_log_day_limit']
+    ASYNC_OVERFLOW_POLICIES = ("block", "drop_oldest", "drop_debug")
+    PROFILE_REPORT_FORMATS = ("json", "csv")
+    MULTIPROCESS_MODES = (None, "collector", "lock")
+    ROTATE_COMPRESSIONS = ("gzip", "zstd", "none")
+    LOG_FORMATS = ("text", "jsonl", "binary")
+    TRACE_FORMATS = ("chrome", "collapsed")
+    __slots__ = ['_root_log_path', '_cache_log_path', '_cache_log_num_limit', '_cache_log_day_limit',
+                 '_async_io', '_async_queue_size', '_async_flush_interval', '_async_flush_size', '_async_overflow_policy',
+                 '_profile_report_interval', '_profile_report_format', '_resource_sample_interval', '_multiprocess',
+                 '_rotate_max_bytes', '_rotate_interval', '_rotate_backup_count', '_rotate_max_age_days', '_rotate_compression', '_log_format', '_cache_log_size_limit', '_error_repeat_interval', '_trace_format', '_trace_buffer_size', '_trace_flush_interval', '_sample_profile_interval', '_sample_profile_report_interval', '_memory_sample_ratio', '_memory_top_sites', '_metrics', '_metrics_textfile', '_metrics_export_interval', '_metrics_http_port']
 
     def __init__(self, data: Union[dict, Callable], default_log_path: str = 'logs') -> None:
         # Initialize default values
@@ -73,13 +208,69 @@ class LogConfig:
         self._cache_log_path = None
         self._cache_log_num_limit = None
         self._cache_log_day_limit = None
+        self._async_io = None
+        self._async_queue_size = None
+        self._async_flush_interval = None
+        self._async_flush_size = None
+        self._async_overflow_policy = None
+        self._profile_report_interval = None
+        self._profile_report_format = None
+        self._resource_sample_interval = None
+        self._multiprocess = None
+        self._rotate_max_bytes = None
+        self._rotate_interval = None
+        self._rotate_backup_count = None
+        self._rotate_max_age_days = None
+        self._rotate_compression = None
+        self._log_format = None
+        self._cache_log_size_limit = None
+        self._error_repeat_interval = None
+        self._trace_format = None
+        self._trace_buffer_size = None
+        self._trace_flush_interval = None
+        self._sample_profile_interval = None
+        self._sample_profile_report_interval = None
+        self._memory_sample_ratio = None
+        self._memory_top_sites = None
+        self._metrics = None
+        self._metrics_textfile = None
+        self._metrics_export_interval = None
+        self._metrics_http_port = None
         
         if isinstance(data, dict):
             self.setup(
                 root_log_path=data.get('root_log_path', default_log_path),
                 cache_log_path=data.get('cache_log_path'),
                 cache_log_num_limit=data.get('cache_log_num_limit'),
-                cache_log_day_limit=data.get('cache_log_day_limit')
+                cache_log_day_limit=data.get('cache_log_day_limit'),
+                async_io=data.get('async_io'),
+                async_queue_size=data.get('async_queue_size'),
+                async_flush_interval=data.get('async_flush_interval'),
+                async_flush_size=data.get('async_flush_size'),
+                async_overflow_policy=data.get('async_overflow_policy'),
+                profile_report_interval=data.get('profile_report_interval'),
+                profile_report_format=data.get('profile_report_format'),
+                resource_sample_interval=data.get('resource_sample_interval'),
+                multiprocess=data.get('multiprocess'),
+                rotate_max_bytes=data.get('rotate_max_bytes'),
+                rotate_interval=data.get('rotate_interval'),
+                rotate_backup_count=data.get('rotate_backup_count'),
+                rotate_max_age_days=data.get('rotate_max_age_days'),
+                rotate_compression=data.get('rotate_compression'),
+                log_format=data.get('log_format'),
+                cache_log_size_limit=data.get('cache_log_size_limit'),
+                error_repeat_interval=data.get('error_repeat_interval'),
+                trace_format=data.get('trace_format'),
+                trace_buffer_size=data.get('trace_buffer_size'),
+                trace_flush_interval=data.get('trace_flush_interval'),
+                sample_profile_interval=data.get('sample_profile_interval'),
+                sample_profile_report_interval=data.get('sample_profile_report_interval'),
+                memory_sample_ratio=data.get('memory_sample_ratio'),
+                memory_top_sites=data.get('memory_top_sites'),
+                metrics=data.get('metrics'),
+                metrics_textfile=data.get('metrics_textfile'),
+                metrics_export_interval=data.get('metrics_export_interval'),
+                metrics_http_port=data.get('metrics_http_port')
             )
         else:
             # Assuming 'data' is an object with necessary attributes
@@ -88,14 +279,138 @@ class LogConfig:
                 root_log_path=data.root_log_path if data.root_log_path is not None else default_log_path,
                 cache_log_path=data.cache_log_path,
                 cache_log_num_limit=data.cache_log_num_limit,
-                cache_log_day_limit=data.cache_log_day_limit
+                cache_log_day_limit=data.cache_log_day_limit,
+                async_io=getattr(data, 'async_io', None),
+                async_queue_size=getattr(data, 'async_queue_size', None),
+                async_flush_interval=getattr(data, 'async_flush_interval', None),
+                async_flush_size=getattr(data, 'async_flush_size', None),
+                async_overflow_policy=getattr(data, 'async_overflow_policy', None),
+                profile_report_interval=getattr(data, 'profile_report_interval', None),
+                profile_report_format=getattr(data, 'profile_report_format', None),
+                resource_sample_interval=getattr(data, 'resource_sample_interval', None),
+                multiprocess=getattr(data, 'multiprocess', None),
+                rotate_max_bytes=getattr(data, 'rotate_max_bytes', None),
+                rotate_interval=getattr(data, 'rotate_interval', None),
+                rotate_backup_count=getattr(data, 'rotate_backup_count', None),
+                rotate_max_age_days=getattr(data, 'rotate_max_age_days', None),
+                rotate_compression=getattr(data, 'rotate_compression', None),
+                log_format=getattr(data, 'log_format', None),
+                cache_log_size_limit=getattr(data, 'cache_log_size_limit', None),
+                error_repeat_interval=getattr(data, 'error_repeat_interval', None),
+                trace_format=getattr(data, 'trace_format', None),
+                trace_buffer_size=getattr(data, 'trace_buffer_size', None),
+                trace_flush_interval=getattr(data, 'trace_flush_interval', None),
+                sample_profile_interval=getattr(data, 'sample_profile_interval', None),
+                sample_profile_report_interval=getattr(data, 'sample_profile_report_interval', None),
+                memory_sample_ratio=getattr(data, 'memory_sample_ratio', None),
+                memory_top_sites=getattr(data, 'memory_top_sites', None),
+                metrics=getattr(data, 'metrics', None),
+                metrics_textfile=getattr(data, 'metrics_textfile', None),
+                metrics_export_interval=getattr(data, 'metrics_export_interval', None),
+                metrics_http_port=getattr(data, 'metrics_http_port', None)
             )
 
-    def setup(self, root_log_path: str = 'logs', cache_log_path: Optional[str] = None, cache_log_num_limit: Optional[int] = None, cache_log_day_limit: Optional[int] = None) -> None:
+    def setup(self,
+              root_log_path: str = 'logs',
+              cache_log_path: Optional[str] = None,
+              cache_log_num_limit: Optional[int] = None,
+              cache_log_day_limit: Optional[int] = None,
+              async_io: Optional[bool] = None,
+              async_queue_size: Optional[int] = None,
+              async_flush_interval: Optional[float] = None,
+              async_flush_size: Optional[int] = None,
+              async_overflow_policy: Optional[str] = None,
+              profile_report_interval: Optional[float] = None,
+              profile_report_format: Optional[str] = None,
+              resource_sample_interval: Optional[float] = None,
+              multiprocess: Optional[str] = None,
+              rotate_max_bytes: Optional[int] = None,
+              rotate_interval: Optional[float] = None,
+              rotate_backup_count: Optional[int] = None,
+              rotate_max_age_days: Optional[float] = None,
+              rotate_compression: Optional[str] = None,
+              log_format: Optional[str] = None,
+              cache_log_size_limit: Optional[int] = None,
+              error_repeat_interval: Optional[float] = None,
+              trace_format: Optional[str] = None,
+              trace_buffer_size: Optional[int] = None,
+              trace_flush_interval: Optional[float] = None,
+              sample_profile_interval: Optional[float] = None,
+              sample_profile_report_interval: Optional[float] = None,
+              memory_sample_ratio: Optional[float] = None,
+              memory_top_sites: Optional[int] = None,
+              metrics: Optional[bool] = None,
+              metrics_textfile: Optional[str] = None,
+              metrics_export_interval: Optional[float] = None,
+              metrics_http_port: Optional[int] = None) -> None:
+        """
+        Setup the log configuration.
+        Parameters:
+            root_log_path (str): Folder where log files are stored.
+            cache_log_path (str): Folder where cache log files are stored.
+            cache_log_num_limit (int): Maximum number of cache log files to retain.
+            cache_log_day_limit (int): Maximum age of cache log files to retain (in days).
+            async_io (bool): Whether loggers write through a background writer thread by default.
+            async_queue_size (int): Maximum number of records waiting in the async queue.
+            async_flush_interval (float): Maximum time in seconds a record waits before being written.
+            async_flush_size (int): Number of queued records that triggers an immediate write.
+            async_overflow_policy (str): Policy when the async queue is full: "block", "drop_oldest" or "drop_debug".
+            profile_report_interval (float): Seconds between two profile report dumps, None to dump only at exit.
+            profile_report_format (str): Profile report file format: "json" or "csv".
+            resource_sample_interval (float): Seconds between two process-wide CPU/RSS samples of the background resource sampler.
+            multiprocess (str): Multiprocess mode: None, "collector" to send the records of all processes to a collector, or "lock" to share files under file locks.
+            rotate_max_bytes (int): Maximum size in bytes of a log file before it is rotated, None for no size limit.
+            rotate_interval (float): Maximum time in seconds a log file is written before it is rotated, None for no time limit.
+            rotate_backup_count (int): Maximum number of rotated segments kept per log file, None to keep all.
+            rotate_max_age_days (float): Maximum age in days of the rotated segments kept, None to keep all.
+            rotate_compression (str): Compression of rotated segments: "gzip", "zstd" (requires the zstandard package) or "none".
+            log_format (str): Log file format: "text", "jsonl" (JSON Lines) or "binary" (length-prefixed records), the structured formats can be queried with LogReader.
+            cache_log_size_limit (int): Maximum total size of the cache log files (in bytes), None for no limit.
+            error_repeat_interval (float): Minimum seconds between two reports of the repeats of an uncaught error, whose first occurrence is logged with its traceback.
+            trace_format (str): Trace file format of enable_profiling="trace": "chrome" (trace event JSON, for chrome://tracing or Perfetto) or "collapsed" (self time per call stack, for flamegraph tools).
+            trace_buffer_size (int): Maximum number of finished spans waiting for export, the oldest are dropped beyond it.
+            trace_flush_interval (float): Seconds between two exports of the finished spans to the trace file.
+            sample_profile_interval (float): Seconds between two stack samples of enable_profiling="sample", taken only while sampled calls are running.
+            sample_profile_report_interval (float): Seconds between two writes of the collapsed-stack reports of enable_profiling="sample", None to write them only at exit.
+            memory_sample_ratio (float): Fraction of the calls of enable_profiling="memory" functions traced with tracemalloc, to bound its overhead.
+            memory_top_sites (int): Number of allocation sites (file:line) reported per function by enable_profiling="memory", 0 to not collect them.
+            metrics (bool): Feed the call, error and latency metrics of the decorated functions into the metrics registry.
+            metrics_textfile (str): Path of an OpenMetrics file rewritten every metrics_export_interval seconds and at exit, None for no file.
+            metrics_export_interval (float): Seconds between two writes of the metrics textfile.
+            metrics_http_port (int): Port of a local HTTP endpoint serving the metrics in the OpenMetrics format at /metrics, None for no endpoint.
+        """
         self.root_log_path = root_log_path
         self.cache_log_path = cache_log_path if cache_log_path is not None else pjoin(root_log_path, "cache")
         self.cache_log_num_limit = cache_log_num_limit if cache_log_num_limit is not None else 100
         self.cache_log_day_limit = cache_log_day_limit if cache_log_day_limit is not None else 7
+        self.async_io = async_io if async_io is not None else False
+        self.async_queue_size = async_queue_size if async_queue_size is not None else 10000
+        self.async_flush_interval = async_flush_interval if async_flush_interval is not None else 0.5
+        self.async_flush_size = async_flush_size if async_flush_size is not None else 256
+        self.async_overflow_policy = async_overflow_policy if async_overflow_policy is not None else "block"
+        self.profile_report_interval = profile_report_interval
+        self.profile_report_format = profile_report_format if profile_report_format is not None else "json"
+        self.resource_sample_interval = resource_sample_interval if resource_sample_interval is not None else 1.0
+        self.multiprocess = multiprocess
+        self.rotate_max_bytes = rotate_max_bytes
+        self.rotate_interval = rotate_interval
+        self.rotate_backup_count = rotate_backup_count
+        self.rotate_max_age_days = rotate_max_age_days
+        self.rotate_compression = rotate_compression if rotate_compression is not None else "gzip"
+        self.log_format = log_format if log_format is not None else "text"
+        self.cache_log_size_limit = cache_log_size_limit
+        self.error_repeat_interval = error_repeat_interval if error_repeat_interval is not None else 60
+        self.trace_format = trace_format if trace_format is not None else "chrome"
+        self.trace_buffer_size = trace_buffer_size if trace_buffer_size is not None else 10000
+        self.trace_flush_interval = trace_flush_interval if trace_flush_interval is not None else 5.0
+        self.sample_profile_interval = sample_profile_interval if sample_profile_interval is not None else 0.01
+        self.sample_profile_report_interval = sample_profile_report_interval
+        self.memory_sample_ratio = memory_sample_ratio if memory_sample_ratio is not None else 1.0
+        self.memory_top_sites = memory_top_sites if memory_top_sites is not None else 10
+        self.metrics = metrics if metrics is not None else False
+        self.metrics_textfile = metrics_textfile
+        self.metrics_export_interval = metrics_export_interval if metrics_export_interval is not None else 15.0
+        self.metrics_http_port = metrics_http_port
 
     @property
     def root_log_path(self) -> str:
@@ -113,6 +428,118 @@ class LogConfig:
     def cache_log_day_limit(self) -> int:
         return self._cache_log_day_limit
 
+    @property
+    def async_io(self) -> bool:
+        return self._async_io
+
+    @property
+    def async_queue_size(self) -> int:
+        return self._async_queue_size
+
+    @property
+    def async_flush_interval(self) -> float:
+        return self._async_flush_interval
+
+    @property
+    def async_flush_size(self) -> int:
+        return self._async_flush_size
+
+    @property
+    def async_overflow_policy(self) -> str:
+        return self._async_overflow_policy
+
+    @property
+    def profile_report_interval(self) -> Optional[float]:
+        return self._profile_report_interval
+
+    @property
+    def profile_report_format(self) -> str:
+        return self._profile_report_format
+
+    @property
+    def resource_sample_interval(self) -> float:
+        return self._resource_sample_interval
+
+    @property
+    def multiprocess(self) -> Optional[str]:
+        return self._multiprocess
+
+    @property
+    def rotate_max_bytes(self) -> Optional[int]:
+        return self._rotate_max_bytes
+
+    @property
+    def rotate_interval(self) -> Optional[float]:
+        return self._rotate_interval
+
+    @property
+    def rotate_backup_count(self) -> Optional[int]:
+        return self._rotate_backup_count
+
+    @property
+    def rotate_max_age_days(self) -> Optional[float]:
+        return self._rotate_max_age_days
+
+    @property
+    def rotate_compression(self) -> str:
+        return self._rotate_compression
+
+    @property
+    def log_format(self) -> str:
+        return self._log_format
+
+    @property
+    def cache_log_size_limit(self) -> Optional[int]:
+        return self._cache_log_size_limit
+
+    @property
+    def error_repeat_interval(self) -> float:
+        return self._error_repeat_interval
+
+    @property
+    def trace_format(self) -> str:
+        return self._trace_format
+
+    @property
+    def trace_buffer_size(self) -> int:
+        return self._trace_buffer_size
+
+    @property
+    def trace_flush_interval(self) -> float:
+        return self._trace_flush_interval
+
+    @property
+    def sample_profile_interval(self) -> float:
+        return self._sample_profile_interval
+
+    @property
+    def sample_profile_report_interval(self) -> Optional[float]:
+        return self._sample_profile_report_interval
+
+    @property
+    def memory_sample_ratio(self) -> float:
+        return self._memory_sample_ratio
+
+    @property
+    def memory_top_sites(self) -> int:
+        return self._memory_top_sites
+
+    @property
+    def metrics(self) -> bool:
+        return self._metrics
+
+    @property
+    def metrics_textfile(self) -> Optional[str]:
+        return self._metrics_textfile
+
+    @property
+    def metrics_export_interval(self) -> float:
+        return self._metrics_export_interval
+
+    @property
+    def metrics_http_port(self) -> Optional[int]:
+        return self._metrics_http_port
+
     @root_log_path.setter
     def root_log_path(self, value: str) -> None:
         self._root_log_path = value
@@ -128,10 +555,137 @@ class LogConfig:
     @cache_log_day_limit.setter
     def cache_log_day_limit(self, value: int) -> None:
         self._cache_log_day_limit = value
+
+    @async_io.setter
+    def async_io(self, value: bool) -> None:
+        self._async_io = value
+
+    @async_queue_size.setter
+    def async_queue_size(self, value: int) -> None:
+        self._async_queue_size = value
+
+    @async_flush_interval.setter
+    def async_flush_interval(self, value: float) -> None:
+        self._async_flush_interval = value
+
+    @async_flush_size.setter
+    def async_flush_size(self, value: int) -> None:
+        self._async_flush_size = value
+
+    @async_overflow_policy.setter
+    def async_overflow_policy(self, value: str) -> None:
+        if value not in self.ASYNC_OVERFLOW_POLICIES:
+            raise ValueError(f"Invalid async overflow policy: {value}, expected one of {self.ASYNC_OVERFLOW_POLICIES}")
+        self._async_overflow_policy = value
+
+    @profile_report_interval.setter
+    def profile_report_interval(self, value: Optional[float]) -> None:
+        self._profile_report_interval = value
+
+    @profile_report_format.setter
+    def profile_report_format(self, value: str) -> None:
+        if value not in self.PROFILE_REPORT_FORMATS:
+            raise ValueError(f"Invalid profile report format: {value}, expected one of {self.PROFILE_REPORT_FORMATS}")
+        self._profile_report_format = value
+
+    @resource_sample_interval.setter
+    def resource_sample_interval(self, value: float) -> None:
+        self._resource_sample_interval = value
+
+    @multiprocess.setter
+    def multiprocess(self, value: Optional[str]) -> None:
+        if value not in self.MULTIPROCESS_MODES:
+            raise ValueError(f"Invalid multiprocess mode: {value}, expected one of {self.MULTIPROCESS_MODES}")
+        self._multiprocess = value
+
+    @rotate_max_bytes.setter
+    def rotate_max_bytes(self, value: Optional[int]) -> None:
+        self._rotate_max_bytes = value
+
+    @rotate_interval.setter
+    def rotate_interval(self, value: Optional[float]) -> None:
+        self._rotate_interval = value
+
+    @rotate_backup_count.setter
+    def rotate_backup_count(self, value: Optional[int]) -> None:
+        self._rotate_backup_count = value
+
+    @rotate_max_age_days.setter
+    def rotate_max_age_days(self, value: Optional[float]) -> None:
+        self._rotate_max_age_days = value
+
+    @rotate_compression.setter
+    def rotate_compression(self, value: str) -> None:
+        if value not in self.ROTATE_COMPRESSIONS:
+            raise ValueError(f"Invalid rotate compression: {value}, expected one of {self.ROTATE_COMPRESSIONS}")
+        self._rotate_compression = value
+
+    @log_format.setter
+    def log_format(self, value: str) -> None:
+        if value not in self.LOG_FORMATS:
+            raise ValueError(f"Invalid log format: {value}, expected one of {self.LOG_FORMATS}")
+        self._log_format = value
+
+    @cache_log_size_limit.setter
+    def cache_log_size_limit(self, value: Optional[int]) -> None:
+        self._cache_log_size_limit = value
+
+    @error_repeat_interval.setter
+    def error_repeat_interval(self, value: float) -> None:
+        self._error_repeat_interval = value
+
+    @trace_format.setter
+    def trace_format(self, value: str) -> None:
+        if value not in self.TRACE_FORMATS:
+            raise ValueError(f"Invalid trace format: {value}, expected one of {self.TRACE_FORMATS}")
+        self._trace_format = value
+
+    @trace_buffer_size.setter
+    def trace_buffer_size(self, value: int) -> None:
+        self._trace_buffer_size = value
+
+    @trace_flush_interval.setter
+    def trace_flush_interval(self, value: float) -> None:
+        self._trace_flush_interval = value
+
+    @sample_profile_interval.setter
+    def sample_profile_interval(self, value: float) -> None:
+        self._sample_profile_interval = value
+
+    @sample_profile_report_interval.setter
+    def sample_profile_report_interval(self, value: Optional[float]) -> None:
+        self._sample_profile_report_interval = value
+
+    @memory_sample_ratio.setter
+    def memory_sample_ratio(self, value: float) -> None:
+        if not 0 <= value <= 1:
+            raise ValueError(f"Invalid memory sample ratio: {value}, expected a fraction between 0 and 1")
+        self._memory_sample_ratio = value
+
+    @memory_top_sites.setter
+    def memory_top_sites(self, value: int) -> None:
+        self._memory_top_sites = value
+
+    @metrics.setter
+    def metrics(self, value: bool) -> None:
+        self._metrics = value
+
+    @metrics_textfile.setter
+    def metrics_textfile(self, value: Optional[str]) -> None:
+        self._metrics_textfile = value
+
+    @metrics_export_interval.setter
+    def metrics_export_interval(self, value: float) -> None:
+        self._metrics_export_interval = value
+
+    @metrics_http_port.setter
+    def metrics_http_port(self, value: Optional[int]) -> None:
+        self._metrics_http_port = value
     
     def __repr__(self) -> str:
         return (f"LogConfig(root_log_path={self._root_log_path}, cache_log_path={self._cache_log_path}, "
-                f"cache_log_num_limit={self._cache_log_num_limit}, cache_log_day_limit={self._cache_log_day_limit})")
+                f"cache_log_num_limit={self._cache_log_num_limit}, cache_log_day_limit={self._cache_log_day_limit}, "
+                f"async_io={self._async_io}, async_overflow_policy={self._async_overflow_policy}, multiprocess={self._multiprocess})")
     
 
 class LockConfig:
@@ -194,7 +748,7 @@ class ParameterConfig:
     
     @property
     def lock_config(self) -> Optional[LockConfig]:
-        return self.lock_config
+        return self._lock_config
 
     @root_task_path.setter
     def root_task_path(self, value: str) -> None:
@@ -0,0 +1,27 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+# The repository root is the trackinglog package itself, import it under its name when it is not installed
+ROOT = Path(__file__).resolve().parent.parent
+if "trackinglog" not in sys.modules:
+    spec = importlib.util.spec_from_file_location("trackinglog", ROOT / "__init__.py", submodule_search_locations=[str(ROOT)])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["trackinglog"] = module
+    spec.loader.exec_module(module)
+
+
+@pytest.fixture
+def setup_logger(tmp_path, monkeypatch):
+    """Set up the logger singleton with its logs in a temporary folder, returning a function applying extra log options."""
+    import trackinglog
+
+    monkeypatch.chdir(tmp_path)
+
+    def setup(**log_config):
+        trackinglog.logger.setup(root_task_path=str(tmp_path), log_config={"root_log_path": str(tmp_path / "logs"), **log_config})
+        return trackinglog.logger
+
+    return setup
@@ -0,0 +1,107 @@
+import logging
+import os
+import threading
+
+import pytest
+
+from trackinglog.log_manager.async_handler import AsyncFileHandler
+from trackinglog.log_manager.rotation import LogRotator, SegmentCompressor, rotated_segments
+
+
+def make_record(message, level=logging.INFO):
+    return logging.LogRecord("async", level, __file__, 1, message, None, None)
+
+
+@pytest.fixture
+def handler_factory(tmp_path):
+    handlers = []
+
+    def make(**kwargs):
+        handler = AsyncFileHandler(str(tmp_path / "async.log"), **kwargs)
+        handlers.append(handler)
+        return handler
+
+    yield make
+    for handler in handlers:
+        handler.close()
+
+
+def test_records_from_several_threads_are_all_written(handler_factory, tmp_path):
+    handler = handler_factory(flush_size=16)
+
+    def emit(name):
+        for i in range(500):
+            handler.handle(make_record(f"{name} {i}"))
+
+    threads = [threading.Thread(target=emit, args=(f"t{n}",)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    handler.flush()
+    lines = (tmp_path / "async.log").read_text().splitlines()
+    assert sorted(lines) == sorted(f"t{n} {i}" for n in range(4) for i in range(500))
+
+
+def test_close_writes_the_queued_records(handler_factory, tmp_path):
+    handler = handler_factory(flush_interval=60, flush_size=1000)
+    for i in range(10):
+        handler.handle(make_record(str(i)))
+    handler.close()
+    assert (tmp_path / "async.log").read_text().splitlines() == [str(i) for i in range(10)]
+
+
+def test_records_after_close_are_dropped_without_reopening_the_file(handler_factory, tmp_path):
+    handler = handler_factory()
+    handler.handle(make_record("before"))
+    handler.close()
+    os.remove(tmp_path / "async.log")
+    handler.handle(make_record("after", logging.WARNING))
+    assert not (tmp_path / "async.log").exists()
+    assert handler.stream is None
+    assert handler.stats["dropped"] == 1 and handler.stats["dropped_by_level"] == {"WARNING": 1}
+
+
+def test_drop_oldest_when_the_queue_is_full(handler_factory, tmp_path):
+    handler = handler_factory(queue_size=4, flush_size=4, flush_interval=60, overflow_policy="drop_oldest")
+    # Hold the writer out of the way so that the queue fills up
+    with handler._write_lock:
+        for i in range(10):
+            handler.handle(make_record(str(i)))
+        dropped = handler.stats["dropped"]
+    handler.flush()
+    lines = (tmp_path / "async.log").read_text().splitlines()
+    assert dropped == 10 - len(lines)
+    assert lines[-1] == "9"
+
+
+def test_drop_debug_keeps_the_other_levels(handler_factory, tmp_path):
+    handler = handler_factory(queue_size=2, flush_size=2, flush_interval=60, overflow_policy="drop_debug")
+    with handler._write_lock:
+        handler.handle(make_record("debug", logging.DEBUG))
+        handler.handle(make_record("info 1"))
+        handler.handle(make_record("info 2"))
+        handler.handle(make_record("debug 2", logging.DEBUG))
+        stats = handler.stats
+    handler.flush()
+    assert stats["dropped_by_level"] == {"DEBUG": 2}
+    assert (tmp_path / "async.log").read_text().splitlines() == ["info 1", "info 2"]
+
+
+def test_invalid_overflow_policy(tmp_path):
+    with pytest.raises(ValueError, match="Invalid overflow policy"):
+        AsyncFileHandler(str(tmp_path / "async.log"), overflow_policy="drop_newest")
+
+
+def test_batches_are_rotated_by_size(handler_factory, tmp_path):
+    compressor = SegmentCompressor()
+    rotator = LogRotator(str(tmp_path / "async.log"), max_bytes=100, compression="none", compressor=compressor)
+    handler = handler_factory(flush_size=50, rotator=rotator)
+    for i in range(100):
+        handler.handle(make_record(f"record {i:03d}"))
+    handler.close()
+    compressor.join()
+    paths = rotated_segments(str(tmp_path / "async.log")) + [str(tmp_path / "async.log")]
+    assert all(os.path.getsize(path) <= 100 for path in paths)
+    lines = [line for path in paths for line in open(path).read().splitlines()]
+    assert sorted(lines) == [f"record {i:03d}" for i in range(100)]
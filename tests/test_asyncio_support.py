@@ -0,0 +1,85 @@
+import asyncio
+import inspect
+
+import pytest
+
+
+def read_logs(tmp_path, logname):
+    return "".join(path.read_text() for path in (tmp_path / "logs").rglob(f"{logname}*"))
+
+
+def test_coroutine_function_stays_a_coroutine_function(setup_logger, tmp_path):
+    logger = setup_logger()
+
+    @logger.get_log("asyncio_coroutine", verbose=1)
+    async def fetch(value, log=None):
+        await asyncio.sleep(0)
+        log.info(f"fetched {value}")
+        return value * 2
+
+    assert inspect.iscoroutinefunction(fetch)
+    assert asyncio.run(fetch(21)) == 42
+    text = read_logs(tmp_path, "asyncio_coroutine")
+    assert "fetched 21" in text and "Called" in text
+
+
+def test_profiling_covers_the_awaited_work(setup_logger):
+    logger = setup_logger()
+
+    @logger.get_log("asyncio_profiled", enable_profiling="aggregate")
+    async def slow(log=None):
+        await asyncio.sleep(0.05)
+
+    asyncio.run(slow())
+    summary = logger.profile_report("asyncio_profiled")["asyncio_profiled"]["test_profiling_covers_the_awaited_work.<locals>.slow"]
+    assert summary["count"] == 1 and summary["total"] >= 0.05
+
+
+def test_errors_are_logged_and_raised(setup_logger, tmp_path):
+    logger = setup_logger()
+
+    @logger.get_log("asyncio_error")
+    async def broken(log=None):
+        await asyncio.sleep(0)
+        raise KeyError("missing")
+
+    with pytest.raises(KeyError):
+        asyncio.run(broken())
+    assert "KeyError" in read_logs(tmp_path, "asyncio_error")
+
+
+def test_prints_are_captured_per_task(setup_logger, tmp_path):
+    logger = setup_logger()
+
+    @logger.get_log("asyncio_print_a", print2log=True)
+    async def task_a(log=None):
+        for i in range(3):
+            print(f"a{i}")
+            await asyncio.sleep(0)
+
+    @logger.get_log("asyncio_print_b", print2log=True)
+    async def task_b(log=None):
+        for i in range(3):
+            print(f"b{i}")
+            await asyncio.sleep(0)
+
+    async def main():
+        await asyncio.gather(task_a(), task_b())
+
+    asyncio.run(main())
+    text_a, text_b = read_logs(tmp_path, "asyncio_print_a"), read_logs(tmp_path, "asyncio_print_b")
+    assert all(f"a{i}" in text_a and f"b{i}" in text_b for i in range(3))
+    assert "b0" not in text_a and "a0" not in text_b
+
+
+def test_async_methods_of_a_decorated_class(setup_logger, tmp_path):
+    logger = setup_logger()
+
+    @logger.get_log("asyncio_class", verbose=1)
+    class Client:
+        async def get(self, key):
+            await asyncio.sleep(0)
+            return key.upper()
+
+    assert inspect.iscoroutinefunction(Client.get)
+    assert asyncio.run(Client().get("k")) == "K"
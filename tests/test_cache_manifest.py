@@ -0,0 +1,88 @@
+import os
+import sqlite3
+import time
+
+from trackinglog.log_manager.cache_manifest import CacheLogManifest
+
+
+def write_file(folder, name, size, age_days=0.0):
+    path = folder / name
+    path.write_bytes(b"x" * size)
+    mtime = time.time() - age_days * 86400
+    os.utime(path, (mtime, mtime))
+    return str(path)
+
+
+def manifest_names(manifest):
+    with sqlite3.connect(manifest.path) as conn:
+        return {name for name, in conn.execute("SELECT name FROM files")}
+
+
+def test_count_limit_keeps_newest(tmp_path):
+    paths = [write_file(tmp_path, f"cache_{i}.log", 10, age_days=5 - i) for i in range(5)]
+    manifest = CacheLogManifest(str(tmp_path))
+    deleted = manifest.clean(limit=2)
+    assert sorted(deleted) == sorted(paths[:3])
+    assert sorted(os.listdir(tmp_path)) == sorted(["cache_3.log", "cache_4.log", CacheLogManifest.FILENAME])
+    assert manifest_names(manifest) == {"cache_3.log", "cache_4.log"}
+
+
+def test_age_and_size_limits(tmp_path):
+    old = write_file(tmp_path, "old.log", 10, age_days=3)
+    big = write_file(tmp_path, "big.log", 100, age_days=1)
+    write_file(tmp_path, "new.log", 10)
+    manifest = CacheLogManifest(str(tmp_path))
+    assert manifest.clean(days=2) == [old]
+    assert manifest.clean(size_limit=50) == [big]
+    assert manifest_names(manifest) == {"new.log"}
+
+
+def test_excluded_files_are_never_deleted(tmp_path):
+    current = write_file(tmp_path, "current.log", 10, age_days=10)
+    other = write_file(tmp_path, "other.log", 10, age_days=1)
+    manifest = CacheLogManifest(str(tmp_path))
+    assert manifest.clean(limit=0, days=2, size_limit=0, exclude=[current]) == [other]
+    assert os.path.exists(current)
+
+
+def test_added_files_are_sized_at_the_next_cleanup(tmp_path):
+    manifest = CacheLogManifest(str(tmp_path))
+    path = write_file(tmp_path, "added.log", 0)
+    manifest.add(path)
+    with open(path, "ab") as f:
+        f.write(b"x" * 40)
+    assert manifest.clean(size_limit=100) == []
+    with sqlite3.connect(manifest.path) as conn:
+        assert conn.execute("SELECT size FROM files WHERE name = 'added.log'").fetchone() == (40,)
+
+
+def test_files_removed_outside_are_forgotten(tmp_path):
+    path = write_file(tmp_path, "gone.log", 10)
+    manifest = CacheLogManifest(str(tmp_path))
+    manifest.clean()
+    os.remove(path)
+    assert manifest.clean() == []
+    assert manifest_names(manifest) == set()
+
+
+def test_clean_in_background(tmp_path):
+    write_file(tmp_path, "a.log", 10, age_days=1)
+    write_file(tmp_path, "b.log", 10)
+    manifest = CacheLogManifest(str(tmp_path))
+    manifest.clean_in_background(1).join(10)
+    assert sorted(os.listdir(tmp_path)) == sorted(["b.log", CacheLogManifest.FILENAME])
+
+
+def test_missing_folder(tmp_path):
+    assert CacheLogManifest(str(tmp_path / "missing")).clean(limit=0) == []
+
+
+def test_cache_log_cleaner_keeps_open_log_files(setup_logger, tmp_path):
+    logger = setup_logger(cache_log_path=str(tmp_path / "cache"))
+    cache = tmp_path / "cache"
+    cache.mkdir(exist_ok=True)
+    stale = write_file(cache, "stale.log", 10, age_days=30)
+    logger.create_logger("cache_cleaner_test", folderpath=str(cache))
+    current = logger.logger_dict["cache_cleaner_test"].handlers[0].baseFilename
+    assert stale in logger.cache_log_cleaner(0, None)
+    assert os.path.exists(current)
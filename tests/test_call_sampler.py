@@ -0,0 +1,45 @@
+import pytest
+
+from trackinglog.log_manager.call_sampler import CallSampler
+
+
+def read_logs(tmp_path, logname):
+    return "".join(path.read_text() for path in (tmp_path / "logs").rglob(f"{logname}*"))
+
+
+def test_sample_every_logs_the_first_and_every_nth_call():
+    sampler = CallSampler(sample_every=3)
+    assert [sampler.should_log() for _ in range(7)] == [True, False, False, True, False, False, True]
+    assert sampler.take_summary(force=True)[0] == 4
+    assert sampler.take_summary(force=True) is None
+
+
+def test_rate_limit_allows_a_burst():
+    sampler = CallSampler(rate_limit=0.001, rate_burst=5)
+    assert sum(sampler.should_log() for _ in range(100)) == 5
+
+
+def test_sample_rate_is_a_probability():
+    sampler = CallSampler(sample_rate=0.25)
+    logged = sum(sampler.should_log() for _ in range(10000))
+    assert 2000 < logged < 3000
+
+
+@pytest.mark.parametrize("options", [{"sample_rate": 0}, {"sample_rate": 1.5}, {"sample_every": 0}, {"rate_limit": -1}])
+def test_invalid_options(options):
+    with pytest.raises(ValueError):
+        CallSampler(**options)
+
+
+def test_sampled_function_logs_only_the_sampled_calls(setup_logger, tmp_path):
+    logger = setup_logger()
+
+    @logger.get_log("call_sampler", verbose=1, enable_profiling="function", sample_every=10)
+    def hot(i, log=None):
+        return i
+
+    assert [hot(i) for i in range(100)] == list(range(100))
+    text = read_logs(tmp_path, "call_sampler")
+    assert text.count("Called") == 10
+    # Unlogged calls still feed the aggregated statistics
+    assert logger.profile_report("call_sampler")["call_sampler"]["test_sampled_function_logs_only_the_sampled_calls.<locals>.hot"]["count"] == 100
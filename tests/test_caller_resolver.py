@@ -0,0 +1,62 @@
+import functools
+
+from trackinglog.log_manager.caller_resolver import CallerResolver
+
+
+def read_logs(tmp_path, logname):
+    return "".join(path.read_text() for path in (tmp_path / "logs").rglob(f"{logname}*"))
+
+
+def test_resolves_the_calling_function():
+    resolver = CallerResolver()
+
+    def log_call():
+        return resolver.resolve()
+
+    def business_logic():
+        return log_call()
+
+    assert business_logic() == "business_logic"
+
+
+def test_registered_wrappers_are_skipped():
+    resolver = CallerResolver()
+
+    def log_call():
+        return resolver.resolve()
+
+    @resolver.register_wrapper
+    def wrapper():
+        return log_call()
+
+    def business_logic():
+        return wrapper()
+
+    assert business_logic() == "business_logic"
+
+
+def test_qualified_names():
+    resolver = CallerResolver(qualified=True)
+
+    class Service:
+        def handle(self):
+            return resolver.resolve(depth=0)
+
+    assert Service().handle() == "test_qualified_names.<locals>.Service.handle"
+
+
+def test_log_records_name_the_calling_function(setup_logger, tmp_path):
+    log = setup_logger().get_logger("caller_resolver")
+
+    def load_data():
+        log.info("loading")
+
+    @functools.wraps(load_data)
+    def decorated():
+        load_data()
+
+    decorated()
+    log.warning("at top level of the test")
+    text = read_logs(tmp_path, "caller_resolver")
+    assert "-load_data  - loading" in text
+    assert "-test_log_records_name_the_calling_function - at top level of the test" in text
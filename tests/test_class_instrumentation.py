@@ -0,0 +1,125 @@
+import trackinglog
+from trackinglog.log_manager.class_instrumentation import LazyInstrumentedMethod, should_instrument
+
+
+def read_log(tmp_path, logname):
+    return "".join(path.read_text() for path in (tmp_path / "logs").rglob(f"{logname}*"))
+
+
+def test_should_instrument():
+    def method():
+        pass
+
+    assert should_instrument("handle", method, None, ())
+    assert not should_instrument("__len__", method, None, ())
+    assert not should_instrument("_parse", method, None, ("_*",))
+    assert not should_instrument("handle", method, ("load*",), ())
+    assert should_instrument("load_data", method, ("load*",), ())
+    assert should_instrument("_flush", trackinglog.profile(method), (), ("_*",))
+    assert not should_instrument("handle", trackinglog.skip(method), None, ())
+
+
+def test_markers_work_above_and_below_staticmethod():
+    class Holder:
+        @trackinglog.skip
+        @staticmethod
+        def above():
+            pass
+
+        @staticmethod
+        @trackinglog.profile
+        def below():
+            pass
+
+    assert not should_instrument("above", vars(Holder)["above"].__func__, None, ())
+    assert should_instrument("below", vars(Holder)["below"].__func__, (), ())
+
+
+def test_methods_are_wrapped_on_first_access(setup_logger, tmp_path):
+    logger = setup_logger()
+
+    @logger.get_log("class_instrumentation_test", exclude="_*")
+    class Service:
+        def __init__(self, name):
+            self.log.info(f"created {name}")
+            self.name = name
+
+        def handle(self, request):
+            return self._parse(request)
+
+        def _parse(self, request):
+            return request.upper()
+
+        @trackinglog.profile
+        def _flush(self):
+            return "flushed"
+
+        @trackinglog.skip
+        def ping(self):
+            return "pong"
+
+        @staticmethod
+        def version():
+            return 2
+
+        @classmethod
+        def create(cls, name):
+            return cls(name)
+
+    assert isinstance(vars(Service)["handle"], LazyInstrumentedMethod)
+    assert vars(Service)["_parse"].__class__ is type(lambda: None)
+    service = Service.create("svc")
+    assert service.handle("abc") == "ABC"
+    assert service._flush() == "flushed" and service.ping() == "pong"
+    assert Service.version() == service.version() == 2
+    # Resolved methods replace their placeholder and keep their descriptor type
+    assert not isinstance(vars(Service)["handle"], LazyInstrumentedMethod)
+    assert isinstance(vars(Service)["version"], staticmethod)
+    assert isinstance(vars(Service)["create"], classmethod)
+    text = read_log(tmp_path, "class_instrumentation_test")
+    assert "created svc" in text
+    assert "** handle ** took" in text
+    assert "** _flush ** took" in text
+    assert "** version ** took" in text
+    assert "** create ** took" in text
+    assert "** _parse **" not in text
+    assert "** ping **" not in text
+
+
+def test_include_only_marked_methods(setup_logger, tmp_path):
+    logger = setup_logger()
+
+    @logger.get_log("class_include_test", include=())
+    class Worker:
+        def run(self):
+            return self.step()
+
+        @trackinglog.profile
+        def step(self):
+            return 1
+
+    assert Worker().run() == 1
+    text = read_log(tmp_path, "class_include_test")
+    assert "** step ** took" in text
+    assert "** run **" not in text
+
+
+def test_slotted_class_gets_its_log(setup_logger):
+    logger = setup_logger()
+
+    @logger.get_log("class_slots_test")
+    class Slotted:
+        __slots__ = ("log", "value")
+
+        def __init__(self):
+            self.value = 1
+
+        def read(self):
+            self.log.info("reading")
+            return self.value
+
+    class Child(Slotted):
+        __slots__ = ()
+
+    assert Slotted().read() == 1
+    assert Child().log is logger.get_logger("class_slots_test")
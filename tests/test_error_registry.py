@@ -0,0 +1,107 @@
+import pytest
+
+from trackinglog.log_manager.error_registry import ErrorRegistry, error_registry, fingerprint, format_exception
+
+
+def raise_value_error(value):
+    raise ValueError(f"bad value {value}")
+
+
+def raise_key_error():
+    return {}["missing"]
+
+
+def caught(func, *args):
+    try:
+        func(*args)
+    except Exception as e:
+        return e
+
+
+def test_fingerprint_ignores_the_message():
+    assert fingerprint(caught(raise_value_error, 1)) == fingerprint(caught(raise_value_error, 2))
+    assert fingerprint(caught(raise_value_error, 1)) != fingerprint(caught(raise_key_error))
+
+
+def test_fingerprint_depends_on_the_raising_line():
+    def raise_twice(first):
+        if first:
+            raise ValueError("first")
+        raise ValueError("second")
+
+    assert fingerprint(caught(raise_twice, True)) != fingerprint(caught(raise_twice, False))
+
+
+def test_format_exception_keeps_chained_exceptions():
+    def chained():
+        try:
+            raise_key_error()
+        except KeyError as e:
+            raise RuntimeError("wrapped") from e
+
+    text = format_exception(caught(chained))
+    assert "KeyError: 'missing'" in text
+    assert "direct cause" in text
+    assert text.endswith("RuntimeError: wrapped")
+
+
+def test_repeats_are_counted_and_reported_at_intervals():
+    registry = ErrorRegistry()
+    stats, report = registry.record("app", caught(raise_value_error, 1), repeat_interval=3600)
+    assert report == "first"
+    assert [registry.record("app", caught(raise_value_error, i), repeat_interval=3600)[1] for i in range(3)] == ["", "", ""]
+    assert stats.count == 4 and stats.message == "bad value 2"
+    assert registry.record("app", caught(raise_value_error, 5), repeat_interval=0)[1] == "repeat"
+    assert registry.take_unreported(stats) == 4
+    assert registry.take_unreported(stats) == 0
+
+
+def test_signatures_are_per_logger():
+    registry = ErrorRegistry()
+    assert registry.record("a", caught(raise_value_error, 1), 60)[1] == "first"
+    assert registry.record("b", caught(raise_value_error, 1), 60)[1] == "first"
+    assert {item["logger"] for item in registry.top()} == {"a", "b"}
+    assert len(registry.top("a")) == 1
+
+
+def test_top_and_flush():
+    registry = ErrorRegistry()
+    for _ in range(3):
+        registry.record("app", caught(raise_key_error), 60)
+    registry.record("app", caught(raise_value_error, 1), 60)
+    top = registry.top()
+    assert [(item["type"], item["count"]) for item in top] == [("KeyError", 3), ("ValueError", 1)]
+    assert top[0]["location"].startswith("test_error_registry.py:") and top[0]["location"].endswith(" in raise_key_error")
+    assert registry.top(limit=1) == top[:1]
+    emitted = []
+    registry.flush(lambda stats, count: emitted.append((stats.error_type, count)))
+    assert emitted == [("KeyError", 2)]
+    registry.reset()
+    assert registry.top() == []
+
+
+@pytest.fixture
+def clean_error_registry():
+    yield
+    # The repeats left would be logged at exit
+    error_registry.reset()
+
+
+def test_decorated_function_logs_the_traceback_once(setup_logger, tmp_path, clean_error_registry):
+    logger = setup_logger(error_repeat_interval=3600)
+
+    @logger.get_log("error_registry_test")
+    def failing(value, log=None):
+        raise ValueError(f"bad value {value}")
+
+    for i in range(5):
+        with pytest.raises(ValueError):
+            failing(i)
+    text = "".join(path.read_text() for path in (tmp_path / "logs").rglob("error_registry_test*"))
+    assert text.count("Traceback") == 1
+    assert text.count("Uncatched Error: bad value 0") == 1
+    assert "bad value 3" not in text
+    report = logger.error_report("error_registry_test")
+    assert [(item["type"], item["count"]) for item in report] == [("ValueError", 5)]
+    # The wrappers of the log manager are not part of the logged traceback
+    assert "log_manager.py" not in text
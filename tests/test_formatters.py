@@ -0,0 +1,22 @@
+import pandas as pd
+
+from trackinglog.log_manager.formatters import FRAME_SEPARATOR, formatter_registry, format_frame, format_series
+
+
+def test_dataframe_and_series_use_their_formatters():
+    df = pd.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+    assert formatter_registry.lookup(pd.DataFrame) is format_frame
+    assert formatter_registry.lookup(pd.Series) is format_series
+    assert formatter_registry.format(df) == FRAME_SEPARATOR + df.to_string(show_dimensions=True) + FRAME_SEPARATOR
+    assert formatter_registry.format(df["a"]) == df["a"].to_string(name=True, dtype=True)
+
+
+def test_logged_dataframe_is_rendered_as_a_table(setup_logger, tmp_path):
+    logger = setup_logger()
+    log = logger.get_logger("formatters_dataframe")
+    df = pd.DataFrame({"price": [1.5, 2.25], "item": ["apple", "pear"]})
+    log.info(df)
+    for handler in log.handlers:
+        handler.flush()
+    text = "".join(path.read_text() for path in (tmp_path / "logs").rglob("formatters_dataframe*"))
+    assert FRAME_SEPARATOR + df.to_string(show_dimensions=True) + FRAME_SEPARATOR in text
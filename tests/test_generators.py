@@ -0,0 +1,110 @@
+import asyncio
+import inspect
+import time
+
+import pytest
+
+from trackinglog.log_manager.iteration_timer import IterationTimer
+
+
+def read_logs(tmp_path, logname):
+    return "".join(path.read_text() for path in (tmp_path / "logs").rglob(f"{logname}*"))
+
+
+def test_iteration_timer_splits_generator_and_consumer_time():
+    timer = IterationTimer()
+    for produced in (True, True, False):
+        timer.resume()
+        time.sleep(0.01)
+        timer.suspend(produced)
+        time.sleep(0.02)
+    assert timer.items == 2
+    assert 0.03 <= timer.inside < timer.total
+    assert "yielded 2 items" in timer.format("gen")
+
+
+def test_generator_is_profiled_over_its_iteration(setup_logger, tmp_path):
+    logger = setup_logger()
+
+    @logger.get_log("generators_profiled", enable_profiling="function")
+    def produce(n, log=None):
+        for i in range(n):
+            time.sleep(0.01)
+            yield i
+        return "done"
+
+    assert inspect.isgeneratorfunction(produce)
+    gen = produce(3)
+    assert list(gen) == [0, 1, 2]
+    assert "yielded 3 items" in read_logs(tmp_path, "generators_profiled")
+    summary = logger.profile_report("generators_profiled")["generators_profiled"]["test_generator_is_profiled_over_its_iteration.<locals>.produce"]
+    assert summary["total"] >= 0.03
+
+
+def test_generator_send_throw_and_return_value(setup_logger):
+    logger = setup_logger()
+
+    @logger.get_log("generators_send")
+    def accumulate(log=None):
+        total = 0
+        try:
+            while True:
+                total += yield total
+        except ValueError:
+            return total
+
+    gen = accumulate()
+    assert next(gen) == 0
+    assert gen.send(5) == 5
+    assert gen.send(2) == 7
+    with pytest.raises(StopIteration) as stop:
+        gen.throw(ValueError())
+    assert stop.value.value == 7
+
+
+def test_errors_during_iteration_are_logged(setup_logger, tmp_path):
+    logger = setup_logger()
+
+    @logger.get_log("generators_error")
+    def broken(log=None):
+        yield 1
+        raise RuntimeError("failed while iterating")
+
+    with pytest.raises(RuntimeError):
+        list(broken())
+    assert "failed while iterating" in read_logs(tmp_path, "generators_error")
+
+
+def test_closing_a_generator_early(setup_logger):
+    logger = setup_logger()
+    closed = []
+
+    @logger.get_log("generators_close", enable_profiling="function")
+    def endless(log=None):
+        try:
+            while True:
+                yield 1
+        finally:
+            closed.append(True)
+
+    gen = endless()
+    next(gen)
+    gen.close()
+    assert closed == [True]
+
+
+def test_async_generator_is_profiled_over_its_iteration(setup_logger, tmp_path):
+    logger = setup_logger()
+
+    @logger.get_log("generators_async", enable_profiling="function")
+    async def produce(n, log=None):
+        for i in range(n):
+            await asyncio.sleep(0)
+            yield i
+
+    async def consume():
+        return [item async for item in produce(4)]
+
+    assert inspect.isasyncgenfunction(produce)
+    assert asyncio.run(consume()) == [0, 1, 2, 3]
+    assert "yielded 4 items" in read_logs(tmp_path, "generators_async")
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+
+def read_logs(tmp_path, logname):
+    return "".join(path.read_text() for path in (tmp_path / "logs").rglob(f"{logname}*"))
+
+
+@pytest.fixture
+def disabled(setup_logger):
+    logger = setup_logger()
+    logger.disable_instrumentation()
+    yield logger
+    logger.enable_instrumentation()
+
+
+def echo_generator(logger, logname):
+    @logger.get_log(logname, verbose=1, enable_profiling="function")
+    async def echo(log=None):
+        received = []
+        try:
+            while True:
+                value = yield len(received)
+                received.append(value)
+        except KeyError:
+            yield "thrown"
+        log.info(f"received {received}")
+
+    return echo
+
+
+async def drive(agen):
+    values = [await agen.asend(None), await agen.asend("a"), await agen.asend("b")]
+    values.append(await agen.athrow(KeyError()))
+    with pytest.raises(StopAsyncIteration):
+        await agen.asend(None)
+    return values
+
+
+def test_disabled_function_is_called_directly(disabled, tmp_path):
+    @disabled.get_log("instrumentation_function", verbose=1, enable_profiling="function")
+    def add(a, b, log=None):
+        assert log is not None
+        return a + b
+
+    assert add(1, 2) == 3
+    assert "Called" not in read_logs(tmp_path, "instrumentation_function")
+
+
+def test_disabled_async_generator_forwards_asend_and_athrow(disabled, tmp_path):
+    echo = echo_generator(disabled, "instrumentation_agen_off")
+    assert asyncio.run(drive(echo())) == [0, 1, 2, "thrown"]
+    text = read_logs(tmp_path, "instrumentation_agen_off")
+    assert "received ['a', 'b']" in text
+    assert "Called" not in text
+
+
+def test_disabled_async_generator_can_be_closed_early(disabled):
+    @disabled.get_log("instrumentation_agen_close")
+    async def count(log=None):
+        try:
+            for i in range(10):
+                yield i
+        finally:
+            closed.append(True)
+
+    async def first():
+        agen = count()
+        value = await agen.__anext__()
+        await agen.aclose()
+        return value
+
+    closed = []
+    assert asyncio.run(first()) == 0
+    assert closed == [True]
+
+
+def test_enabled_async_generator_forwards_asend_and_athrow(setup_logger, tmp_path):
+    echo = echo_generator(setup_logger(), "instrumentation_agen_on")
+    assert asyncio.run(drive(echo())) == [0, 1, 2, "thrown"]
+    text = read_logs(tmp_path, "instrumentation_agen_on")
+    assert "received ['a', 'b']" in text
+    assert "Called" in text
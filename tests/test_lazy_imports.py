@@ -0,0 +1,51 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("pandas", "numpy", "psutil", "line_profiler", "zstandard")
+
+
+@pytest.fixture
+def run_fresh(tmp_path):
+    """Run code in a fresh interpreter importing the repository as trackinglog, returning its JSON output."""
+    os.symlink(ROOT, tmp_path / "trackinglog")
+
+    def run(code):
+        env = {**os.environ, "PYTHONPATH": str(tmp_path)}
+        result = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=env, capture_output=True, text=True, timeout=60)
+        assert result.returncode == 0, result.stderr
+        return json.loads(result.stdout.splitlines()[-1])
+
+    return run
+
+
+def test_import_does_not_load_heavy_modules(run_fresh):
+    loaded = run_fresh("import sys, json, trackinglog; "
+                       f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))")
+    assert loaded == []
+
+
+def test_logging_does_not_load_heavy_modules(run_fresh, tmp_path):
+    loaded = run_fresh("import sys, json, trackinglog; "
+                       f"trackinglog.logger.setup(root_task_path={str(tmp_path)!r}); "
+                       "trackinglog.logger.get_logger('lazy').info('started'); "
+                       f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))")
+    assert loaded == []
+
+
+def test_lazy_attributes(run_fresh):
+    loaded = run_fresh("import sys, json, trackinglog; before = 'trackinglog.log_manager' in sys.modules; "
+                       "trackinglog.LogManager; trackinglog.skip; "
+                       "print(json.dumps([before, 'trackinglog.log_manager' in sys.modules, trackinglog.logger is trackinglog.LogManager()]))")
+    assert loaded == [False, True, True]
+
+
+def test_unknown_attribute():
+    import trackinglog
+
+    with pytest.raises(AttributeError):
+        trackinglog.missing_attribute
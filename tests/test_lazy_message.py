@@ -0,0 +1,44 @@
+import logging
+
+from trackinglog.log_manager.lazy_message import LazyLogMessage
+
+
+class CountingArgument:
+    """Argument counting how many times it is rendered."""
+    def __init__(self):
+        self.renders = 0
+
+    def __str__(self):
+        self.renders += 1
+        return "rendered"
+
+
+def test_message_is_formatted_once_on_first_use():
+    calls = []
+
+    def formatter(*args, **kwargs):
+        calls.append((args, kwargs))
+        return " ".join(map(str, args))
+
+    message = LazyLogMessage(formatter, (1, "a"), {"max_rows": 3})
+    assert not message.formatted
+    assert str(message) == "1 a" and str(message) == "1 a"
+    assert message.formatted
+    assert calls == [((1, "a"), {"max_rows": 3})]
+
+
+def test_disabled_level_is_never_formatted(setup_logger):
+    log = setup_logger().get_logger("lazy_message", log_level=logging.INFO)
+    argument = CountingArgument()
+    log.debug(argument)
+    assert argument.renders == 0
+    log.info(argument)
+    assert argument.renders == 1
+
+
+def test_verbose_message_is_formatted_once_for_the_log_and_the_print(setup_logger, capsys):
+    log = setup_logger().get_logger("lazy_message_verbose")
+    argument = CountingArgument()
+    log.pinfo(argument)
+    assert capsys.readouterr().out == "rendered\n"
+    assert argument.renders == 1
@@ -0,0 +1,70 @@
+import threading
+
+from trackinglog.log_manager.line_profiling import AccumulatingLineProfiler, LineProfileRegistry
+
+
+def compute(n):
+    total = 0
+    for i in range(n):
+        total += i
+    return total
+
+
+def recurse(n):
+    return 0 if n == 0 else 1 + recurse(n - 1)
+
+
+def test_stats_accumulate_across_calls_and_threads():
+    emitted = []
+    profiler = AccumulatingLineProfiler(compute, emitted.append)
+
+    def run():
+        for _ in range(5):
+            profiler.enable()
+            try:
+                compute(100)
+            finally:
+                profiler.disable()
+
+    threads = [threading.Thread(target=run) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert profiler.calls == 15
+    profiler.emit()
+    assert emitted[0].startswith("LineProfiler Stats (15 calls):")
+    assert "total += i" in emitted[0]
+    profiler.emit()
+    assert len(emitted) == 1
+
+
+def test_nested_calls_count_once():
+    profiler = AccumulatingLineProfiler(recurse, lambda text: None)
+    profiler.enable()
+    profiler.enable()
+    profiler.disable()
+    assert profiler.calls == 0
+    profiler.disable()
+    assert profiler.calls == 1
+
+
+def test_registry_keeps_one_profiler_per_function():
+    registry = LineProfileRegistry()
+    first = registry.get_profiler("line", compute, lambda text: None)
+    assert registry.get_profiler("line", compute, lambda text: None) is first
+    assert registry.get_profiler("line", recurse, lambda text: None) is not first
+    assert set(registry.report("line")["line"]) == {"compute", "recurse"}
+
+
+def test_line_profiled_function(setup_logger):
+    logger = setup_logger()
+
+    @logger.get_log("line_profiling", enable_profiling="line")
+    def work(n, log=None):
+        return compute(n) + n
+
+    for _ in range(3):
+        work(10)
+    stats = logger.line_profile_report("line_profiling")["line_profiling"]["test_line_profiled_function.<locals>.work"]
+    assert "return compute(n) + n" in stats
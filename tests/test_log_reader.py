@@ -0,0 +1,94 @@
+import gzip
+import json
+import logging
+import random
+
+import pytest
+
+from trackinglog.log_manager.log_reader import LogReader
+
+
+def write_records(path, timestamps, mode="w"):
+    levels = ["DEBUG", "INFO", "WARNING", "ERROR"]
+    with open(path, mode) as f:
+        for i, timestamp in enumerate(timestamps):
+            f.write(json.dumps({"timestamp": timestamp, "level": levels[i % 4], "logger": "reader", "caller": f"f{i % 3}", "message": str(timestamp)}) + "\n")
+
+
+def expected(timestamps, start=None, end=None):
+    return [t for t in timestamps if (start is None or t >= start) and (end is None or t < end)]
+
+
+@pytest.mark.parametrize("ordered", [True, False], ids=["ordered", "out of order"])
+def test_time_bounded_query_matches_a_scan(tmp_path, ordered):
+    rng = random.Random(0)
+    timestamps = [1000 + i + (0 if ordered else rng.uniform(-20, 20)) for i in range(500)]
+    path = tmp_path / "reader.jsonl"
+    write_records(path, timestamps)
+    reader = LogReader(str(path))
+    for start, end in [(None, None), (1100, None), (None, 1300), (1100.5, 1300.5), (1250, 1251), (2000, None)]:
+        records = list(reader.query(start=start, end=end))
+        assert [record["timestamp"] for record in records] == expected(timestamps, start, end)
+
+
+def test_index_is_extended_with_appended_records(tmp_path):
+    path = tmp_path / "reader.jsonl"
+    write_records(path, [10.0, 20.0, 30.0])
+    reader = LogReader(str(path))
+    assert len(reader.update_index()) == 3
+    # A late record lagging behind the indexed ones must still be found
+    write_records(path, [40.0, 15.0], mode="a")
+    assert [entry[1] for entry in reader.update_index()] == [10.0, 20.0, 30.0, 40.0, 15.0]
+    assert [record["timestamp"] for record in reader.query(start=12, end=25)] == [20.0, 15.0]
+
+
+def test_level_logger_and_caller_filters(tmp_path):
+    path = tmp_path / "reader.jsonl"
+    write_records(path, [float(i) for i in range(12)])
+    reader = LogReader(str(path))
+    assert [record["level"] for record in reader.query(level="WARNING")] == ["WARNING", "ERROR"] * 3
+    assert len(list(reader.query(level=logging.ERROR, caller="f0"))) == 1
+    assert list(reader.query(logger="other")) == []
+
+
+def test_compressed_segment(tmp_path):
+    path = tmp_path / "reader.jsonl"
+    timestamps = [5.0, 3.0, 7.0, 6.0]
+    write_records(path, timestamps)
+    with open(path, "rb") as f, gzip.open(str(path) + ".gz", "wb") as out:
+        out.write(f.read())
+    reader = LogReader(str(path) + ".gz")
+    assert [record["timestamp"] for record in reader.query(start=4, end=7)] == [5.0, 6.0]
+
+
+def test_async_io_structured_log(setup_logger, tmp_path):
+    logger = setup_logger(log_format="jsonl", async_io=True)
+    log = logger.get_logger("reader_async")
+    for i in range(200):
+        log.info(f"record {i}")
+    for handler in log.handlers:
+        handler.flush()
+    records = logger.query_logs("reader_async")
+    all_records = list(records)
+    assert len(all_records) == 200
+    middle = sorted(record["timestamp"] for record in all_records)[100]
+    assert len(list(logger.query_logs("reader_async", start=middle))) == sum(record["timestamp"] >= middle for record in all_records)
+
+
+@pytest.mark.parametrize("log_format", ["jsonl", "binary"])
+def test_structured_log_fields(setup_logger, log_format):
+    logger = setup_logger(log_format=log_format)
+    log = logger.get_logger(f"reader_{log_format}")
+
+    def caller_function():
+        log.warning("something happened")
+
+    caller_function()
+    log.info("plain")
+    for handler in log.handlers:
+        handler.flush()
+    records = list(logger.query_logs(f"reader_{log_format}", level="WARNING"))
+    assert len(records) == 1
+    record = records[0]
+    assert (record["level"], record["logger"], record["caller"], record["message"]) == ("WARNING", f"reader_{log_format}", "caller_function", "something happened")
+    assert isinstance(record["timestamp"], float) and record["time"]
@@ -0,0 +1,108 @@
+import tracemalloc
+
+import pytest
+
+from trackinglog.log_manager.memory_profiling import MemoryTracker
+
+
+def allocate(size):
+    return bytearray(size)
+
+
+def site_sizes(stats, lineno):
+    return sum(size for (filename, line), (size, count) in stats.sites.items() if filename == __file__ and line == lineno)
+
+
+ALLOCATE_LINE = allocate.__code__.co_firstlineno + 1
+
+
+@pytest.fixture
+def tracker():
+    assert not tracemalloc.is_tracing()
+    yield MemoryTracker()
+    assert not tracemalloc.is_tracing()
+
+
+def test_peak_and_net_of_a_call(tracker):
+    call = tracker.start()
+    kept = allocate(1 << 20)
+    allocate(4 << 20)
+    peak, net = tracker.stop(call, "memory", "f")
+    assert 5 << 20 <= peak < 6 << 20
+    assert 1 << 20 <= net < 2 << 20
+    del kept
+
+
+def test_nested_calls_are_credited_their_own_sites(tracker):
+    outer = tracker.start()
+    outer_data = allocate(1 << 20)
+    inner = tracker.start()
+    inner_data = allocate(2 << 20)
+    tracker.stop(inner, "memory", "inner")
+    tracker.stop(outer, "memory", "outer")
+    inner_stats, outer_stats = tracker.get_stats("memory", "inner"), tracker.get_stats("memory", "outer")
+    # The inner call only gets the bytes allocated while it ran, the outer call everything allocated during its window
+    assert 2 << 20 <= site_sizes(inner_stats, ALLOCATE_LINE) < (2 << 20) + 4096
+    assert 3 << 20 <= site_sizes(outer_stats, ALLOCATE_LINE) < (3 << 20) + 4096
+    del outer_data, inner_data
+
+
+def test_overlapping_calls_are_credited_their_own_sites(tracker):
+    first = tracker.start()
+    first_data = allocate(1 << 20)
+    second = tracker.start()
+    second_data = allocate(2 << 20)
+    tracker.stop(first, "memory", "first")
+    third_data = allocate(3 << 20)
+    tracker.stop(second, "memory", "second")
+    assert site_sizes(tracker.get_stats("memory", "first"), ALLOCATE_LINE) >= 3 << 20
+    assert 5 << 20 <= site_sizes(tracker.get_stats("memory", "second"), ALLOCATE_LINE) < 6 << 20
+    del first_data, second_data, third_data
+
+
+def test_freed_allocations_are_not_sites(tracker):
+    call = tracker.start()
+    allocate(1 << 20)
+    tracker.stop(call, "memory", "f")
+    assert site_sizes(tracker.get_stats("memory", "f"), ALLOCATE_LINE) == 0
+
+
+def test_foreign_tracing_is_left_running_and_its_peak_untouched():
+    tracemalloc.start()
+    try:
+        allocate(8 << 20)
+        foreign_peak = tracemalloc.get_traced_memory()[1]
+        tracker = MemoryTracker()
+        call = tracker.start()
+        data = allocate(1 << 20)
+        peak, net = tracker.stop(call, "memory", "f")
+        assert tracemalloc.is_tracing()
+        assert tracemalloc.get_traced_memory()[1] >= foreign_peak
+        # The peak predating the call is not attributed to it
+        assert 1 << 20 <= peak < 2 << 20
+        assert site_sizes(tracker.get_stats("memory", "f"), ALLOCATE_LINE) >= 1 << 20
+        del data
+    finally:
+        tracemalloc.stop()
+
+
+def test_report_separates_modules(tracker):
+    for module in ("pkg.a", "pkg.b"):
+        tracker.stop(tracker.start(), "memory", "f", module=module)
+    assert set(tracker.report("memory")["memory"]) == {"pkg.a.f", "pkg.b.f"}
+
+
+def test_memory_profiled_function(setup_logger):
+    logger = setup_logger()
+
+    @logger.get_log("memory_profiled", enable_profiling="memory")
+    def build(size, log=None):
+        return allocate(size)
+
+    data = [build(1 << 20) for _ in range(3)]
+    summary = logger.memory_report("memory_profiled")["memory_profiled"]["test_memory_profiled_function.<locals>.build"]
+    assert summary["calls"] == 3
+    assert summary["net_mean"] >= 1 << 20
+    assert summary["top_sites"][0]["site"] == f"{__file__}:{ALLOCATE_LINE}"
+    assert summary["top_sites"][0]["size"] >= 3 << 20
+    del data
@@ -0,0 +1,121 @@
+import threading
+import urllib.request
+
+import pytest
+
+from trackinglog.log_manager.metrics import CONTENT_TYPE, MetricsRegistry
+
+
+@pytest.fixture
+def registry():
+    registry = MetricsRegistry()
+    yield registry
+    if registry._http_server is not None:
+        registry._http_server.shutdown()
+        registry._http_server.server_close()
+
+
+def test_counter_and_gauge(registry):
+    counter = registry.counter("jobs", "Jobs run.", {"queue": "a"})
+    counter.inc()
+    counter.inc(2)
+    registry.counter("jobs", "Jobs run.", {"queue": "b"}).inc()
+    gauge = registry.gauge("workers", "Busy workers.")
+    gauge.inc(3)
+    gauge.dec()
+    registry.gauge_function("queue_size", "Queued jobs.", lambda: 7)
+    metrics = registry.collect()
+    assert metrics["jobs"]["type"] == "counter"
+    assert metrics["jobs"]["samples"] == {(("queue", "a"),): 3.0, (("queue", "b"),): 1.0}
+    assert metrics["workers"]["samples"] == {(): 2.0}
+    assert metrics["queue_size"]["samples"] == {(): 7.0}
+
+
+def test_histogram_buckets_are_cumulative(registry):
+    histogram = registry.histogram("duration", "Call duration.", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 5.0):
+        histogram.observe(value)
+    sample = registry.collect()["duration"]["samples"][()]
+    assert sample["buckets"] == [(0.1, 2.0), (1.0, 3.0), (float("inf"), 4.0)]
+    assert sample["count"] == 4.0 and sample["sum"] == pytest.approx(5.65)
+
+
+def test_kind_conflict(registry):
+    registry.counter("conflict", "A counter.")
+    with pytest.raises(ValueError):
+        registry.gauge("conflict", "A gauge.")
+
+
+def test_threads_are_summed(registry):
+    counter = registry.counter("threaded", "Increments from threads.")
+    histogram = registry.histogram("threaded_values", "Values from threads.", buckets=(1.0,))
+
+    def work():
+        for _ in range(1000):
+            counter.inc()
+            histogram.observe(0.5)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    counter.inc()
+    metrics = registry.collect()
+    assert metrics["threaded"]["samples"][()] == 4001.0
+    assert metrics["threaded_values"]["samples"][()]["count"] == 4000.0
+    # The shards of the finished threads are folded, and still counted afterwards
+    assert len(registry._shards) == 1
+    assert registry.collect()["threaded"]["samples"][()] == 4001.0
+
+
+def test_exposition(registry):
+    registry.counter("requests", 'Requests "served".', {"path": "/a\nb"}).inc()
+    registry.histogram("latency", "Latency.", {"path": "/a"}, buckets=(1,)).observe(2)
+    assert registry.exposition() == (
+        "# TYPE latency histogram\n"
+        "# HELP latency Latency.\n"
+        'latency_bucket{path="/a",le="1.0"} 0.0\n'
+        'latency_bucket{path="/a",le="+Inf"} 1.0\n'
+        'latency_sum{path="/a"} 2.0\n'
+        'latency_count{path="/a"} 1.0\n'
+        "# TYPE requests counter\n"
+        '# HELP requests Requests \\"served\\".\n'
+        'requests_total{path="/a\\nb"} 1.0\n'
+        "# EOF\n"
+    )
+
+
+def test_textfile_and_http_exports(registry, tmp_path):
+    registry.counter("exported", "Exported counter.").inc(5)
+    path = registry.write_textfile(str(tmp_path / "metrics" / "app.prom"))
+    with open(path) as f:
+        assert "exported_total 5.0\n" in f.read()
+    server = registry.start_http_server(0)
+    assert registry.start_http_server(0) is server
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    with urllib.request.urlopen(f"{url}/metrics", timeout=10) as response:
+        assert response.headers["Content-Type"] == CONTENT_TYPE
+        assert response.read().decode() == registry.exposition()
+    with pytest.raises(urllib.error.HTTPError):
+        urllib.request.urlopen(f"{url}/other", timeout=10)
+
+
+def test_decorated_functions_are_metered(setup_logger):
+    logger = setup_logger(metrics=True)
+
+    @logger.get_log("metrics_test")
+    def handle(fail, log=None):
+        if fail:
+            raise ValueError("failed")
+
+    handle(False)
+    handle(False)
+    with pytest.raises(ValueError):
+        handle(True)
+    metrics = logger.collect_metrics()
+    labels = (("function", handle.__qualname__), ("logger", "metrics_test"))
+    assert metrics["trackinglog_calls"]["samples"][labels] == 3.0
+    assert metrics["trackinglog_errors"]["samples"][labels] == 1.0
+    assert metrics["trackinglog_call_duration_seconds"]["samples"][labels]["count"] == 3.0
+    assert 'trackinglog_calls_total{function="' in logger.metrics_text()
@@ -0,0 +1,100 @@
+import logging
+import multiprocessing
+import os
+
+import pytest
+
+from trackinglog.log_manager.multiprocess import (COLLECTOR_ENV, RUN_STAMP_ENV, CollectorClientHandler, CollectorFileHandler,
+                                                  LockedFileHandler, LogCollector, run_stamp)
+from trackinglog.log_manager.rotation import LogRotator, SegmentCompressor, rotated_segments
+
+fork = pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+
+
+def make_record(message):
+    return logging.LogRecord("multiprocess", logging.INFO, __file__, 1, message, None, None)
+
+
+def send_records(address, path, name, count):
+    handler = CollectorClientHandler(path, address)
+    for i in range(count):
+        handler.handle(make_record(f"{name} {i}"))
+    handler.close()
+
+
+def write_locked(path, lock_folder, name, count, max_bytes):
+    rotator = None if max_bytes is None else LogRotator(path, max_bytes=max_bytes, compression="none", compressor=SegmentCompressor(), shared=True)
+    handler = LockedFileHandler(path, lock_folder, rotator=rotator)
+    for i in range(count):
+        handler.handle(make_record(f"{name} {i}"))
+    handler.close()
+
+
+def run_processes(target, args_list):
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=target, args=args) for args in args_list]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(30)
+        assert process.exitcode == 0
+
+
+@pytest.fixture
+def collector(tmp_path, monkeypatch):
+    monkeypatch.delenv(COLLECTOR_ENV, raising=False)
+    monkeypatch.delenv(RUN_STAMP_ENV, raising=False)
+    collector = LogCollector(flush_interval=0.05)
+    collector.start(str(tmp_path))
+    yield collector
+    collector.close()
+
+
+@fork
+def test_collector_writes_the_records_of_every_process(collector, tmp_path):
+    path = str(tmp_path / "collected.log")
+    assert os.environ[COLLECTOR_ENV] == collector.address
+    own = CollectorFileHandler(path, collector)
+    own.handle(make_record("owner"))
+    run_processes(send_records, [(collector.address, path, f"worker{n}", 200) for n in range(3)])
+    collector.close()
+    lines = open(path).read().splitlines()
+    assert sorted(lines) == sorted(["owner"] + [f"worker{n} {i}" for n in range(3) for i in range(200)])
+    assert COLLECTOR_ENV not in os.environ
+
+
+def test_client_falls_back_to_the_file_without_collector(tmp_path):
+    path = str(tmp_path / "fallback.log")
+    send_records(str(tmp_path / "missing.sock"), path, "alone", 3)
+    assert open(path).read().splitlines() == ["alone 0", "alone 1", "alone 2"]
+
+
+@fork
+def test_collector_rotates_the_collected_files(collector, tmp_path):
+    path = str(tmp_path / "collected.log")
+    compressor = SegmentCompressor()
+    CollectorFileHandler(path, collector, rotator=LogRotator(path, max_bytes=200, compression="none", compressor=compressor))
+    run_processes(send_records, [(collector.address, path, f"worker{n}", 50) for n in range(2)])
+    collector.close()
+    compressor.join()
+    paths = rotated_segments(path) + [path]
+    assert len(paths) > 1 and all(os.path.getsize(segment) <= 200 for segment in paths)
+    assert sum(len(open(segment).read().splitlines()) for segment in paths) == 100
+
+
+@fork
+@pytest.mark.parametrize("max_bytes", [None, 500], ids=["unbounded", "rotated"])
+def test_locked_files_are_shared_without_interleaving(tmp_path, max_bytes):
+    path = str(tmp_path / "shared.log")
+    run_processes(write_locked, [(path, str(tmp_path / "locks"), f"worker{n}", 100, max_bytes) for n in range(3)])
+    paths = rotated_segments(path) + [path]
+    lines = [line for segment in paths for line in open(segment).read().splitlines()]
+    assert sorted(lines) == sorted(f"worker{n} {i}" for n in range(3) for i in range(100))
+    if max_bytes is not None:
+        assert all(os.path.getsize(segment) <= max_bytes for segment in paths)
+
+
+def test_run_stamp_is_inherited_only_when_asked(monkeypatch):
+    monkeypatch.setenv(RUN_STAMP_ENV, "240101_120000")
+    assert run_stamp() == "240101_120000"
+    assert run_stamp(inherit=False) != "240101_120000"
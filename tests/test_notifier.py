@@ -0,0 +1,136 @@
+import email
+import logging
+import threading
+
+import pytest
+
+from trackinglog.log_manager.notifier import NotificationDispatcher
+from trackinglog.parameter_config.parameter_config import EmailCredential
+
+
+class RecordingTransport:
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.messages = []
+        self.closed = False
+
+    def send(self, message):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("server unavailable")
+        self.messages.append(message)
+
+    def close(self):
+        self.closed = True
+
+
+def make_dispatcher(tmp_path, custom_transport=None, **options):
+    credential = EmailCredential({"root_emails_folder": str(tmp_path / "emails"), "username": "alerts@example.com",
+                                  "recipients": ["oncall@example.com"], "notify_retry_backoff": 0.01, **options})
+    dispatcher = NotificationDispatcher()
+    dispatcher.configure(credential, transport=custom_transport)
+    return dispatcher
+
+
+def body(message):
+    return message.get_content()
+
+
+def test_first_alert_is_sent_and_repeats_are_digested(tmp_path):
+    transport = RecordingTransport()
+    dispatcher = make_dispatcher(tmp_path, transport, notify_window=60)
+    dispatcher.notify("jobs", logging.ERROR, "run", "job 1 failed")
+    for i in range(2, 6):
+        dispatcher.notify("jobs", logging.ERROR, "run", f"job {i} failed")
+    assert dispatcher.flush()
+    dispatcher.close()
+    text = "".join(body(message) for message in transport.messages)
+    assert "ERROR jobs.run: job 1 failed" in text
+    assert "Repeated 4 more time(s) within 60s" in text
+    assert "job 5 failed" in text
+    assert transport.messages[0]["To"] == "oncall@example.com"
+    assert transport.closed
+
+
+def test_distinct_signatures_are_batched(tmp_path):
+    transport = RecordingTransport()
+    dispatcher = make_dispatcher(tmp_path, transport)
+    started = threading.Event()
+    release = threading.Event()
+    send = transport.send
+
+    def blocking_send(message):
+        started.set()
+        release.wait(10)
+        send(message)
+
+    transport.send = blocking_send
+    dispatcher.notify("jobs", logging.ERROR, "run", "first")
+    assert started.wait(10)
+    # Queued while the worker is delivering the first alert, then sent together
+    dispatcher.notify("jobs", logging.ERROR, "load", "second")
+    dispatcher.notify("jobs", logging.CRITICAL, "save", "third", signature="custom")
+    release.set()
+    assert dispatcher.flush()
+    dispatcher.close()
+    assert len(transport.messages) == 2
+    assert "2 alert(s)" in transport.messages[1]["Subject"]
+    assert "second" in body(transport.messages[1]) and "third" in body(transport.messages[1])
+
+
+def test_failed_deliveries_are_retried(tmp_path):
+    transport = RecordingTransport(failures=2)
+    dispatcher = make_dispatcher(tmp_path, transport, notify_max_retries=3)
+    dispatcher.notify("jobs", logging.ERROR, "run", "retried")
+    assert dispatcher.flush()
+    dispatcher.close()
+    assert len(transport.messages) == 1
+    assert dispatcher.delivered == 1
+
+
+def test_delivery_given_up_after_the_retries(tmp_path, capsys):
+    transport = RecordingTransport(failures=10)
+    dispatcher = make_dispatcher(tmp_path, transport, notify_max_retries=1)
+    dispatcher.notify("jobs", logging.ERROR, "run", "lost")
+    assert dispatcher.flush()
+    dispatcher.close()
+    assert transport.messages == []
+    assert "failed after 2 attempts" in capsys.readouterr().err
+
+
+def test_full_queue_drops_alerts(tmp_path):
+    dispatcher = NotificationDispatcher(queue_size=0)
+    dispatcher.notify("jobs", logging.ERROR, "run", "dropped")
+    assert dispatcher.dropped == 1
+    assert dispatcher.flush()
+
+
+def test_file_transport_spools_emails(tmp_path):
+    dispatcher = make_dispatcher(tmp_path, transport="file")
+    dispatcher.notify("jobs", logging.WARNING, "run", "spooled")
+    assert dispatcher.flush()
+    dispatcher.close()
+    files = list((tmp_path / "emails").iterdir())
+    assert [path.suffix for path in files] == [".eml"]
+    message = email.message_from_bytes(files[0].read_bytes())
+    assert "WARNING jobs.run: spooled" in message.get_payload()
+
+
+def test_log_call_notifies(setup_logger, tmp_path):
+    import trackinglog
+
+    logger = setup_logger()
+    trackinglog.logger.setup(root_task_path=str(tmp_path), log_config={"root_log_path": str(tmp_path / "logs")},
+                             email_credential={"root_emails_folder": str(tmp_path / "emails"), "username": "alerts@example.com"})
+    transport = RecordingTransport()
+    logger.set_notification_transport(transport)
+    log = logger.get_logger("notifier_test")
+
+    def failing_job():
+        log.error("job failed", _log_notify=True)
+
+    failing_job()
+    log.error("not notified")
+    assert logger.flush_notifications()
+    assert len(transport.messages) == 1
+    assert "ERROR notifier_test.failing_job: job failed" in body(transport.messages[0])
@@ -0,0 +1,52 @@
+import pytest
+
+from trackinglog.parameter_config.parameter_config import EmailCredential, LogConfig
+
+
+def test_defaults(tmp_path):
+    config = LogConfig({"root_log_path": str(tmp_path)})
+    assert (config.log_format, config.multiprocess, config.rotate_compression) == ("text", None, "gzip")
+    assert (config.async_overflow_policy, config.profile_report_format, config.trace_format) == ("block", "json", "chrome")
+
+
+@pytest.mark.parametrize("option, value", [
+    ("log_format", "yaml"),
+    ("multiprocess", "fork"),
+    ("rotate_compression", "bz2"),
+    ("async_overflow_policy", "drop_newest"),
+    ("profile_report_format", "xml"),
+    ("trace_format", "perfetto"),
+    ("memory_sample_ratio", 1.5),
+])
+def test_invalid_option_is_rejected_at_setup(tmp_path, option, value):
+    with pytest.raises(ValueError, match="Invalid"):
+        LogConfig({"root_log_path": str(tmp_path), option: value})
+
+
+@pytest.mark.parametrize("option, value", [
+    ("log_format", "jsonl"),
+    ("multiprocess", "lock"),
+    ("rotate_compression", "none"),
+    ("async_overflow_policy", "drop_debug"),
+    ("profile_report_format", "csv"),
+    ("trace_format", "collapsed"),
+])
+def test_valid_option_is_set(tmp_path, option, value):
+    assert getattr(LogConfig({"root_log_path": str(tmp_path), option: value}), option) == value
+
+
+def test_invalid_option_is_rejected_by_the_setter(tmp_path):
+    config = LogConfig({"root_log_path": str(tmp_path)})
+    with pytest.raises(ValueError, match="Invalid log format"):
+        config.log_format = "csv"
+    assert config.log_format == "text"
+
+
+def test_invalid_email_transport(tmp_path):
+    with pytest.raises(ValueError, match="Invalid email transport"):
+        EmailCredential({"root_emails_folder": str(tmp_path), "transport": "pigeon"})
+
+
+def test_bad_log_format_fails_at_logger_setup(setup_logger):
+    with pytest.raises(ValueError, match="Invalid log format"):
+        setup_logger(log_format="yaml")
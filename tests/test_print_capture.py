@@ -0,0 +1,60 @@
+import sys
+import threading
+
+from trackinglog.log_manager.print_capture import PrintCapture
+
+
+def test_lines_are_emitted_as_they_complete():
+    lines = []
+    with PrintCapture(lines.append):
+        print("first")
+        print("sec", end="")
+        assert lines == ["first"]
+        print("ond")
+    assert lines == ["first", "second"]
+
+
+def test_unfinished_line_is_emitted_at_the_buffer_size():
+    lines = []
+    with PrintCapture(lines.append, buffer_size=10):
+        print("x" * 25, end="")
+        assert sum(map(len, lines)) >= 20
+    assert "".join(lines) == "x" * 25
+
+
+def test_captures_are_per_thread():
+    captured = {}
+
+    def run(name):
+        lines = captured[name] = []
+        with PrintCapture(lines.append):
+            for i in range(100):
+                print(f"{name} {i}")
+
+    threads = [threading.Thread(target=run, args=(f"t{n}",)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for name, lines in captured.items():
+        assert lines == [f"{name} {i}" for i in range(100)]
+
+
+def test_prints_outside_a_capture_reach_stdout(capsys):
+    with PrintCapture(lambda line: None):
+        pass
+    print("visible")
+    assert capsys.readouterr().out == "visible\n"
+
+
+def test_print2log(setup_logger, tmp_path):
+    logger = setup_logger()
+
+    @logger.get_log("print_capture", print2log=True)
+    def chatty(log=None):
+        print("hello from the function")
+        return sys.stdout
+
+    chatty()
+    text = "".join(path.read_text() for path in (tmp_path / "logs").rglob("print_capture*"))
+    assert "hello from the function" in text
@@ -0,0 +1,71 @@
+import csv
+import json
+
+import pytest
+
+from trackinglog.log_manager.profile_stats import LatencyHistogram, ProfileRegistry, ProfileStats
+
+
+def test_percentiles_are_within_the_precision():
+    histogram = LatencyHistogram(precision=0.01)
+    values = [i / 1000 for i in range(1, 1001)]
+    for value in values:
+        histogram.record(value)
+    for q in (50, 95, 99):
+        exact = values[int(q / 100 * len(values)) - 1]
+        assert histogram.percentile(q) == pytest.approx(exact, rel=0.01)
+
+
+def test_percentiles_are_clamped_to_the_recorded_range():
+    histogram = LatencyHistogram()
+    histogram.record(0.5)
+    assert histogram.percentile(0) == histogram.percentile(50) == histogram.percentile(100) == 0.5
+    stats = ProfileStats()
+    for elapsed in (1e-9, 2e-9):
+        stats.record(elapsed)
+    summary = stats.summary()
+    assert summary["min"] <= summary["p50"] <= summary["p99"] <= summary["max"]
+
+
+def test_empty_statistics():
+    assert LatencyHistogram().percentile(50) is None
+    assert ProfileStats().summary() == {"count": 0}
+
+
+def test_functions_with_the_same_name_in_different_modules():
+    registry = ProfileRegistry()
+    registry.record("api", "handler", 1.0, module="pkg.a")
+    registry.record("api", "handler", 2.0, module="pkg.b")
+    registry.record("api", "other", 3.0, module="pkg.a")
+    registry.record("jobs", "handler", 4.0, module="pkg.a")
+    report = registry.report()
+    assert set(report["api"]) == {"pkg.a.handler", "pkg.b.handler", "other"}
+    assert set(report["jobs"]) == {"handler"}
+    assert report["api"]["pkg.b.handler"]["total"] == 2.0
+
+
+@pytest.mark.parametrize("fmt", ["json", "csv"])
+def test_dump(tmp_path, fmt):
+    registry = ProfileRegistry()
+    registry.record("api", "handler", 0.25)
+    path = registry.dump(str(tmp_path / f"report.{fmt}"), fmt)
+    with open(path, newline="") as f:
+        if fmt == "json":
+            assert json.load(f)["api"]["handler"]["count"] == 1
+        else:
+            rows = list(csv.DictReader(f))
+            assert rows[0]["function"] == "handler" and float(rows[0]["max"]) == 0.25
+
+
+def test_aggregate_profiling(setup_logger):
+    logger = setup_logger()
+
+    @logger.get_log("profile_stats_aggregate", enable_profiling="aggregate")
+    def work(n, log=None):
+        return sum(range(n))
+
+    for _ in range(20):
+        work(1000)
+    summary = logger.profile_report("profile_stats_aggregate")["profile_stats_aggregate"]["test_aggregate_profiling.<locals>.work"]
+    assert summary["count"] == 20
+    assert summary["min"] <= summary["p50"] <= summary["p99"] <= summary["max"]
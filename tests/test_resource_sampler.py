@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+from trackinglog.log_manager.resource_sampler import CallMeter, ResourceSampler
+
+
+def read_logs(tmp_path, logname):
+    return "".join(path.read_text() for path in (tmp_path / "logs").rglob(f"{logname}*"))
+
+
+def test_process_handle_is_cached():
+    sampler = ResourceSampler()
+    assert sampler.process is sampler.process
+    assert sampler.process.pid == os.getpid()
+
+
+def test_sample_records_cpu_and_rss():
+    sampler = ResourceSampler(max_samples=2)
+    for _ in range(3):
+        sample = sampler.sample()
+    assert sample["rss"] > 0 and sample is sampler.latest
+    assert len(sampler.samples) == 2
+
+
+def test_meter_measures_the_selected_metrics():
+    meter = CallMeter(("cpu", "rss"), sampler=ResourceSampler())
+    start = meter.start()
+    sum(range(100000))
+    measures = meter.stop(start)
+    assert set(measures) == {"wall", "cpu", "rss"}
+    assert measures["wall"] > 0 and measures["cpu"] >= 0
+    assert CallMeter.format_usage(measures).startswith("Resource usage: CPU")
+
+
+def test_wall_only_meter_has_no_usage_line():
+    meter = CallMeter(("wall",), sampler=ResourceSampler())
+    assert CallMeter.format_usage(meter.stop(meter.start())) is None
+
+
+def test_unknown_metric():
+    with pytest.raises(ValueError, match="Unknown profiling metrics"):
+        CallMeter(("gpu",))
+
+
+def test_function_profiling_logs_the_resource_usage(setup_logger, tmp_path):
+    logger = setup_logger()
+
+    @logger.get_log("resource_sampler", enable_profiling="function", profiling_metrics=("wall", "cpu", "maxrss"))
+    def work(log=None):
+        return sum(range(10000))
+
+    work()
+    text = read_logs(tmp_path, "resource_sampler")
+    assert "Resource usage: CPU" in text and "Peak memory" in text
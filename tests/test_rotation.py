@@ -0,0 +1,112 @@
+import gzip
+import logging
+import os
+import time
+
+import pytest
+
+from trackinglog.log_manager.rotation import (LogRotator, RotatingFileHandler, SegmentCompressor, encoded_size, rotated_segments,
+                                              write_rotating)
+
+
+def make_record(message):
+    return logging.LogRecord("rotation", logging.INFO, __file__, 1, message, None, None)
+
+
+def read_segment(path):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return f.read().splitlines()
+
+
+@pytest.fixture
+def compressor():
+    compressor = SegmentCompressor()
+    yield compressor
+    compressor.join()
+
+
+def test_encoded_size():
+    assert encoded_size("abc") == 3
+    assert encoded_size("é€") == 5
+    assert encoded_size("é", "latin-1") == 1
+
+
+def test_size_rotation_with_compression(tmp_path, compressor):
+    path = str(tmp_path / "size.log")
+    handler = RotatingFileHandler(path, LogRotator(path, max_bytes=100, compression="gzip", compressor=compressor))
+    for i in range(50):
+        handler.handle(make_record(f"record {i:02d} é"))
+    handler.close()
+    compressor.join()
+    segments = rotated_segments(path)
+    assert segments and all(segment.endswith(".gz") for segment in segments)
+    assert all(len("\n".join(read_segment(segment)).encode()) < 100 for segment in segments)
+    lines = [line for segment in sorted(segments) for line in read_segment(segment)] + read_segment(path)
+    assert lines == [f"record {i:02d} é" for i in range(50)]
+
+
+def test_time_rotation(tmp_path, compressor):
+    path = str(tmp_path / "time.log")
+    handler = RotatingFileHandler(path, LogRotator(path, interval=0.05, compression="none", compressor=compressor))
+    handler.handle(make_record("first"))
+    time.sleep(0.06)
+    handler.handle(make_record("second"))
+    handler.close()
+    segments = rotated_segments(path)
+    assert [read_segment(segment) for segment in segments] == [["first"]]
+    assert read_segment(path) == ["second"]
+
+
+def test_backup_count_keeps_the_newest_segments(tmp_path, compressor):
+    path = str(tmp_path / "backups.log")
+    rotator = LogRotator(path, max_bytes=10, backup_count=2, compression="none", compressor=compressor)
+    handler = RotatingFileHandler(path, rotator)
+    for i in range(6):
+        handler.handle(make_record(f"record {i}"))
+    handler.close()
+    compressor.join()
+    segments = sorted(rotated_segments(path))
+    assert [read_segment(segment) for segment in segments] == [["record 3"], ["record 4"]]
+
+
+def test_retention_applies_to_segments_found_at_start(tmp_path, compressor):
+    path = str(tmp_path / "existing.log")
+    for i in range(3):
+        with open(f"{tmp_path}/existing.24010{i}_000000_000000.log", "w") as f:
+            f.write("old\n")
+    handler = RotatingFileHandler(path, LogRotator(path, max_bytes=5, backup_count=1, compression="none", compressor=compressor))
+    handler.handle(make_record("new 1"))
+    handler.handle(make_record("new 2"))
+    handler.close()
+    compressor.join()
+    assert [read_segment(segment) for segment in rotated_segments(path)] == [["new 1"]]
+
+
+def test_large_batch_is_split_at_the_rotation_points(tmp_path, compressor):
+    path = str(tmp_path / "batch.log")
+    rotator = LogRotator(path, max_bytes=30, compression="none", compressor=compressor)
+    def write(data):
+        with open(path, "a") as f:
+            f.write(data)
+
+    write_rotating([f"line {i}\n" for i in range(20)], rotator, write, rotator.rotate)
+    compressor.join()
+    paths = rotated_segments(path) + [path]
+    assert all(os.path.getsize(segment) <= 30 for segment in paths)
+    assert sorted(line for segment in paths for line in read_segment(segment)) == sorted(f"line {i}" for i in range(20))
+
+
+def test_invalid_compression(tmp_path):
+    with pytest.raises(ValueError, match="Invalid compression"):
+        LogRotator(str(tmp_path / "bad.log"), compression="bz2")
+
+
+def test_rotated_logger(setup_logger, tmp_path):
+    logger = setup_logger(rotate_max_bytes=200, rotate_compression="none")
+    log = logger.get_logger("rotation_logger")
+    for i in range(30):
+        log.info(f"message {i}")
+    handler = next(handler for handler in log.handlers if hasattr(handler, "baseFilename"))
+    paths = rotated_segments(handler.baseFilename) + [handler.baseFilename]
+    assert len(paths) > 1 and all(os.path.getsize(segment) <= 200 for segment in paths)
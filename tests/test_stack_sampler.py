@@ -0,0 +1,89 @@
+import threading
+import time
+
+from trackinglog.log_manager.stack_sampler import StackSampler, frame_label
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def sampled_outer():
+    sampled_inner()
+
+
+def sampled_inner():
+    busy(0.2)
+
+
+def unsampled():
+    busy(0.05)
+
+
+def test_frame_label():
+    label = frame_label(sampled_inner.__code__)
+    assert label == f"sampled_inner (test_stack_sampler.py:{sampled_inner.__code__.co_firstlineno})"
+
+
+def test_stacks_are_counted_from_the_outermost_sampled_frame():
+    sampler = StackSampler(interval=0.002)
+    sampler.register("sampler", sampled_outer)
+    sampler.enter()
+    try:
+        sampled_outer()
+    finally:
+        sampler.exit()
+    report = sampler.report()
+    assert list(report) == ["sampler"]
+    lines = report["sampler"].splitlines()
+    assert sampler.samples >= 10
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in lines) == sampler.samples
+    top_stack = lines[0].rsplit(" ", 1)[0].split(";")
+    # The frames of the test runner calling the sampled function are not part of the stacks
+    assert top_stack[:3] == [frame_label(code) for code in (sampled_outer.__code__, sampled_inner.__code__, busy.__code__)]
+
+
+def test_no_samples_outside_sampled_calls():
+    sampler = StackSampler(interval=0.002)
+    sampler.register("sampler", sampled_outer)
+    sampler.enter()
+    try:
+        unsampled()
+    finally:
+        sampler.exit()
+    samples = sampler.samples
+    assert sampler.report() == {}
+    time.sleep(0.05)
+    assert sampler.samples == samples
+
+
+def test_other_threads_are_sampled():
+    sampler = StackSampler(interval=0.002)
+    sampler.register("sampler", sampled_outer)
+    thread = threading.Thread(target=sampled_outer)
+    sampler.enter()
+    try:
+        thread.start()
+        thread.join()
+    finally:
+        sampler.exit()
+    assert "sampled_inner" in sampler.report("sampler")["sampler"]
+    assert sampler.report("other") == {}
+
+
+def test_decorated_function_sample_report(setup_logger, tmp_path):
+    logger = setup_logger(sample_profile_interval=0.002)
+
+    @logger.get_log("stack_sampler_test", enable_profiling="sample")
+    def work(log=None):
+        busy(0.2)
+
+    work()
+    stacks = logger.sample_profile_report("stack_sampler_test")["stack_sampler_test"]
+    assert "work (test_stack_sampler.py" in stacks and "busy (test_stack_sampler.py" in stacks
+    assert "log_manager.py" not in stacks
+    paths = logger.dump_sample_profile()
+    with open(paths["stack_sampler_test"]) as f:
+        assert f.read() == stacks
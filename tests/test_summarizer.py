@@ -0,0 +1,75 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from trackinglog.log_manager.summarizer import summarizer
+
+OPTIONS = {"max_rows": 10, "max_cols": 10, "max_colwidth": 35, "show_dimensions": True}
+
+
+def pandas_dict(mapping):
+    return pd.DataFrame([{"key": key, "value": value} for key, value in mapping.items()]).to_string(**OPTIONS)
+
+
+DICTS = {
+    "numbers": {"a": 1, "b": 2.5, "c": -3},
+    "large floats": {"a": 1.5e9, "b": 2.0, "c": 1e-9},
+    "strings": {"a": "x", "b": "a longer value", "c": "tab\there"},
+    "strings and none": {"a": "x", "b": None},
+    "dicts and none": {"a": {"x": 1}, "b": None},
+    "tuples": {"a": (1, "a"), "b": 2},
+    "lists": {"a": [1, "x"], "b": "s"},
+    "timestamps": {"a": pd.Timestamp("2024-01-01"), "b": pd.Timestamp("2024-01-02 03:04")},
+    "dates": {"a": datetime.date(2024, 1, 1), "b": "s"},
+    "all none": {"a": None, "b": None},
+    "nan and none": {"a": float("nan"), "b": None},
+    "missing markers": {"a": "x", "b": pd.NA, "c": pd.NaT, "d": None},
+    "numpy scalars": {"a": np.int64(5), "b": np.float32(1.5), "c": np.bool_(True)},
+    "bools and none": {"a": True, "b": None},
+    "tuple keys": {(1, "a"): 1, (2, "b"): 2},
+    "truncated": {f"k{i}": "v" * i for i in range(40)},
+    "truncated objects": {f"k{i}": (i, "v") if i % 2 else None for i in range(25)},
+    "truncated strings and none": {f"k{i}": "v" if i % 3 else None for i in range(25)},
+}
+
+
+@pytest.mark.parametrize("mapping", DICTS.values(), ids=DICTS.keys())
+def test_dict_is_rendered_like_pandas(mapping):
+    assert summarizer.render_dict(mapping) == pandas_dict(mapping)
+
+
+FRAMES = {
+    "numbers": lambda: pd.DataFrame({"a": [1, 2, 3], "b": [1.5, np.nan, 2.25], "c": [True, False, True]}),
+    "strings": lambda: pd.DataFrame({"a": ["x", None, "zz"]}),
+    "objects and none": lambda: pd.DataFrame({"a": ["x", None], "b": [{"k": 1}, None]}, dtype=object),
+    "tuples": lambda: pd.DataFrame({"a": pd.Series([(1, "a"), (2, "b")], dtype=object)}),
+    "all none": lambda: pd.DataFrame({"a": pd.Series([None, None], dtype=object), "b": [1, 2]}),
+    "all nan objects": lambda: pd.DataFrame({"a": pd.Series([np.nan, None], dtype=object)}),
+    "timestamps": lambda: pd.DataFrame({"a": pd.Series([pd.Timestamp("2024-01-01"), "x"], dtype=object)}),
+    "mixed objects": lambda: pd.DataFrame({"a": pd.Series([1, "x", 2.5, None], dtype=object)}),
+    "truncated": lambda: pd.DataFrame(np.arange(400).reshape(20, 20) / 7),
+    "truncated tuples": lambda: pd.DataFrame({"a": pd.Series([(i, "a") for i in range(30)], dtype=object), "b": range(30)}),
+}
+
+
+@pytest.mark.parametrize("make_frame", FRAMES.values(), ids=FRAMES.keys())
+def test_frame_is_rendered_like_pandas(make_frame):
+    df = make_frame()
+    assert summarizer.render_frame(df, 10, 10, 35) == df.to_string(**OPTIONS)
+
+
+def test_rendered_frame_is_cached_until_its_cells_change():
+    df = pd.DataFrame({"a": [1, 2, 3]})
+    first = summarizer.render_frame(df, 10, 10, 35)
+    assert summarizer.render_frame(df, 10, 10, 35) is first
+    df.loc[0, "a"] = 10
+    assert summarizer.render_frame(df, 10, 10, 35) == df.to_string(**OPTIONS)
+
+
+def test_long_sequences_are_summarized():
+    assert summarizer.render_sequence([1, "a"]) == str([1, "a"])
+    assert summarizer.render_sequence((1,)) == "(1,)"
+    text = summarizer.render_sequence(list(range(1000)))
+    assert text.startswith("[0, 1, 2") and text.endswith(", 999] (1000 items)")
@@ -0,0 +1,128 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from trackinglog.log_manager.tracing import Tracer
+
+
+def read_chrome(path):
+    with open(path) as f:
+        return json.loads(f.read().rstrip(",\n") + "]")
+
+
+def run_span(tracer, name, body=None, logname="tracing"):
+    span = tracer.begin(logname, name)
+    token = tracer.activate(span)
+    try:
+        if body is not None:
+            body()
+    finally:
+        tracer.deactivate(token)
+        tracer.end(span)
+    return span
+
+
+@pytest.fixture
+def tracer(tmp_path):
+    tracer = Tracer()
+    tracer.configure(str(tmp_path), flush_interval=3600)
+    return tracer
+
+
+def test_nested_spans(tracer):
+    children = []
+
+    def outer():
+        time.sleep(0.01)
+        children.append(run_span(tracer, "inner", lambda: time.sleep(0.02)))
+        assert tracer.current().name == "outer"
+
+    root = run_span(tracer, "outer", outer)
+    inner = children[0]
+    assert tracer.current() is None
+    assert inner.parent_id == root.span_id and inner.trace_id == root.trace_id == root.span_id
+    assert inner.path == "outer;inner"
+    assert root.child_time == inner.total_time
+    assert root.self_time == root.total_time - inner.total_time
+    assert root.self_time >= 10_000_000 and inner.self_time >= 20_000_000
+
+
+def test_chrome_export_is_appended_in_batches(tracer, tmp_path):
+    run_span(tracer, "first", lambda: run_span(tracer, "child"))
+    path = tracer.flush()
+    assert path.startswith(str(tmp_path / "trace_")) and path.endswith(".json")
+    run_span(tracer, "second")
+    assert tracer.flush() == path
+    events = read_chrome(path)
+    assert [event["name"] for event in events] == ["child", "first", "second"]
+    child, first, _ = events
+    assert child["ph"] == "X" and child["cat"] == "tracing"
+    assert child["args"]["parent_id"] == first["args"]["span_id"]
+    assert first["dur"] >= child["dur"]
+    assert tracer.exported == 3
+
+
+def test_collapsed_export(tmp_path):
+    tracer = Tracer()
+    tracer.configure(str(tmp_path), fmt="collapsed", flush_interval=3600)
+    for _ in range(2):
+        run_span(tracer, "outer", lambda: run_span(tracer, "inner"))
+    path = tracer.flush()
+    assert path.endswith(".folded")
+    with open(path) as f:
+        stacks = [line.rsplit(" ", 1)[0] for line in f.read().splitlines()]
+    assert sorted(stacks) == ["outer", "outer;inner"]
+
+
+def test_full_buffer_drops_the_oldest_spans(tmp_path):
+    tracer = Tracer()
+    tracer.configure(str(tmp_path), buffer_size=2, flush_interval=3600)
+    for name in ("a", "b", "c"):
+        run_span(tracer, name)
+    assert tracer.dropped == 1
+    assert [event["name"] for event in read_chrome(tracer.flush())] == ["b", "c"]
+
+
+def test_asyncio_tasks_have_their_own_span_stack(tracer):
+    async def task(name):
+        span = tracer.begin("tracing", name)
+        token = tracer.activate(span)
+        await asyncio.sleep(0.01)
+        current = tracer.current()
+        tracer.deactivate(token)
+        tracer.end(span)
+        return span, current
+
+    async def main():
+        return await asyncio.gather(task("a"), task("b"))
+
+    root = tracer.begin("tracing", "root")
+    token = tracer.activate(root)
+    results = asyncio.run(main())
+    tracer.deactivate(token)
+    tracer.end(root)
+    for span, current in results:
+        assert current is span
+        assert span.parent_id == root.span_id
+        assert span.task_id is not None
+    assert results[0][0].task_id != results[1][0].task_id
+
+
+def test_decorated_calls_are_traced(setup_logger, tmp_path):
+    logger = setup_logger(trace_flush_interval=3600)
+
+    @logger.get_log("tracing_test", enable_profiling="trace")
+    def load(log=None):
+        return 1
+
+    @logger.get_log("tracing_test", enable_profiling="trace")
+    def handle(log=None):
+        return load() + 1
+
+    assert handle() == 2
+    events = [event for event in read_chrome(logger.flush_traces()) if event["cat"] == "tracing_test"]
+    names = {event["name"].rsplit(".", 1)[-1]: event for event in events}
+    assert set(names) == {"load", "handle"}
+    assert names["load"]["args"]["parent_id"] == names["handle"]["args"]["span_id"]